@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+class MatchActor:
+    """Acteur propriétaire d'un match en cours.
+
+    Chaque match possède sa propre boîte aux lettres: les messages qui le
+    concernent (coups, tentatives, déconnexions) y sont déposés puis traités
+    un à un par un thread du pool. Deux messages d'un même match ne sont
+    jamais traités en parallèle, mais deux matchs différents peuvent l'être.
+
+    Les messages envoyés aux joueurs pendant le match sont numérotés et
+    gardés dans un tampon circulaire: un joueur qui reprend le match après
+    une coupure reçoit ceux qu'il a manqués.
+    """
+    __slots__ = ("match", "game", "state", "pool", "mailbox", "scheduled", "lock", "outbox", "sent")
+    # Nombre maximal de messages traités avant de rendre la main au pool
+    BATCH_SIZE = 32
+    # Nombre de messages envoyés gardés pour la reprise
+    OUTBOX_SIZE = 64
+
+    def __init__(self, match, game, pool):
+        self.match = match
+        self.game = game
+        self.state = {}  # données propres au jeu, qui vivent aussi longtemps que le match
+        self.pool = pool
+        self.mailbox = []  # une liste vide coûte bien moins qu'une deque (bloc préalloué)
+        self.scheduled = False
+        self.lock = threading.Lock()
+        self.outbox = []  # (numéro, joueur, message), rempli jusqu'à OUTBOX_SIZE puis réécrit en boucle
+        self.sent = 0     # numéro du dernier message envoyé
+
+    def record(self, player_id, message) -> dict:
+        """Numérote un message envoyé à un joueur et le garde dans le tampon (appelé par l'acteur)."""
+        self.sent += 1
+        message = {**message, "seq": self.sent}
+        entry = (self.sent, player_id, message)
+        if len(self.outbox) < self.OUTBOX_SIZE:
+            self.outbox.append(entry)
+        else:
+            self.outbox[(self.sent - 1) % self.OUTBOX_SIZE] = entry
+        return message
+
+    def missed(self, player_id, last_seq: int):
+        """Messages envoyés à un joueur après last_seq, ou None s'ils ne sont plus tous dans le tampon.
+
+        Un numéro plus grand que le dernier envoyé vient d'avant un redémarrage
+        du serveur: le match a été reconstruit depuis le journal, tampon vide.
+        """
+        if not self.sent - len(self.outbox) <= last_seq <= self.sent:
+            return None
+        return [message for seq, recipient, message in sorted(self.outbox, key=lambda entry: entry[0])
+                if seq > last_seq and recipient == player_id]
+
+    def post(self, handler, *args):
+        """Dépose un message dans la boîte aux lettres du match."""
+        with self.lock:
+            self.mailbox.append((handler, args))
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.pool.submit(self.process)
+
+    def process(self):
+        """Traite les messages en attente, en série, par lots de BATCH_SIZE."""
+        with self.lock:
+            batch = self.mailbox[:self.BATCH_SIZE]
+            del self.mailbox[:self.BATCH_SIZE]
+        for handler, args in batch:
+            try:
+                handler(self, *args)
+            except Exception as e:
+                print(f"Erreur dans le match {self.match.id}: {e}")
+        with self.lock:
+            if not self.mailbox:
+                self.scheduled = False
+                return
+        # Il reste des messages: se replanifier pour laisser passer les autres matchs
+        self.pool.submit(self.process)
+
+class ActorPool(ThreadPoolExecutor):
+    """Pool de threads qui exécute les acteurs de match."""
+    def __init__(self, workers=None):
+        super().__init__(max_workers=workers or os.cpu_count() or 4, thread_name_prefix="match")
@@ -8,6 +8,7 @@ from ui.login_ui import setup_login_ui
 from ui.game_selection_ui import setup_game_selection_ui
 from mastermind.client import MastermindClient
 from morpion.client import MorpionClient
+from puissance4.client import Puissance4Client
 from config import Config
 
 class AppClient:
@@ -22,11 +23,12 @@ class AppClient:
             return
             
         self.pseudo = None
+        self.resume_token = None  # jeton de reprise reçu au CONNECT
         
         # Interface graphique
         self.root = tk.Tk()
         self.root.title("Jeux en réseau - Connexion")
-        self.root.geometry("800x600")
+        self.root.geometry("900x600")
         self.root.resizable(False, False)
         
         # Définir les couleurs et styles
@@ -66,10 +68,20 @@ class AppClient:
             if response_data.get("status") == "ERROR":
                 messagebox.showerror("Erreur", response_data.get("message", "Pseudo déjà pris."))
                 return
+            self.resume_token = response_data.get("resume_token")
         except Exception as e:
             messagebox.showerror("Erreur", f"Connexion au serveur échouée: {e}")
             return
         self.setup_game_selection_ui()
+        self.root.after(Config.HEARTBEAT_INTERVAL, self.keep_alive)
+
+    def keep_alive(self):
+        """Signe de vie périodique (PONG spontané), car hors d'un jeu personne ne répond aux PING du serveur."""
+        try:
+            self.client.send(json.dumps({"action": "PONG"}).encode())
+        except OSError:
+            return
+        self.root.after(Config.HEARTBEAT_INTERVAL, self.keep_alive)
 
     def setup_game_selection_ui(self):
         """Configure l'interface de sélection de jeu."""
@@ -78,15 +90,21 @@ class AppClient:
     def launch_mastermind(self):
         """Lance le jeu Mastermind."""
         self.root.withdraw()  
-        mastermind_client = MastermindClient(self.pseudo, self.client, self.root)
+        mastermind_client = MastermindClient(self.pseudo, self.client, self.root, resume_token=self.resume_token)
         mastermind_client.run()
 
     def launch_morpion(self):
         """Lance le jeu Morpion."""
         self.root.withdraw() 
-        morpion_client = MorpionClient(self.pseudo, self.client, self.root)
+        morpion_client = MorpionClient(self.pseudo, self.client, self.root, resume_token=self.resume_token)
         morpion_client.run()
 
+    def launch_puissance4(self):
+        """Lance le jeu Puissance 4."""
+        self.root.withdraw() 
+        puissance4_client = Puissance4Client(self.pseudo, self.client, self.root, resume_token=self.resume_token)
+        puissance4_client.run()
+
     def quit_app(self):
         """Quitte l'application."""
         if messagebox.askyesno("Quitter", "Êtes-vous sûr de vouloir quitter?"):
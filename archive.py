@@ -0,0 +1,252 @@
+"""Archive binaire des matchs terminés.
+
+Les matchs terminés sont copiés de matches, turns et mastermind_matches
+dans un fichier à ajout seul, en enregistrements de taille fixe: un
+en-tête par match suivi de ses coups. Un index trié (identifiant du match,
+position dans le fichier) permet de retrouver un match par recherche
+dichotomique dans le fichier projeté en mémoire, sans rien charger.
+
+Usage hors ligne: python archive.py [matchmaking.db] [--prune]
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from bisect import bisect_left
+
+MAGIC = b"MMAR"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHH")  # signature, version, réservé
+# Identifiant, jeu, résultat, joueurs 1 et 2, nombre de coups, variante (2 octets), codes secrets du Mastermind
+MATCH_RECORD = struct.Struct("<IBBIIHBBQQ")
+# Identifiant du coup, joueur (1 ou 2), coup, pions noirs, pions blancs, note
+TURN_RECORD = struct.Struct("<IBIBBB")
+INDEX_ENTRY = struct.Struct("<IQ")  # identifiant du match, position de son en-tête
+
+GAME_TYPES = ("morpion", "puissance4", "mastermind")
+RESULT_PLAYER1, RESULT_PLAYER2, RESULT_DRAW, RESULT_INTERRUPTED = range(1, 5)
+GRADES = (None, "best", "inaccuracy", "blunder")
+NO_FEEDBACK = 255  # pions noirs des coups sans feedback (Morpion, Puissance 4)
+
+PATH = "matches.archive"  # à côté de matchmaking.db
+
+class NotArchivable(ValueError):
+    """Match dans un ancien format (coups ou codes non compacts), laissé en base."""
+
+def encode_match(match, turns) -> bytes:
+    """En-tête et coups d'un match: turns est une liste de (id, joueur, coup, feedback, note) lus en base."""
+    codes = (0, 0)
+    if match.game_type == "morpion":
+        variant = (3, 3)
+        header = match.board.partition(":")[0] if isinstance(match.board, str) else ""
+        if "x" in header:
+            variant = tuple(int(value) for value in header.split("x"))
+    elif match.game_type == "mastermind":
+        variant = (match.code_length, match.colors)
+        codes = (match.player1_code, match.player2_code)
+        if not all(type(code) is int for code in codes):
+            raise NotArchivable(match.id)
+    else:
+        variant = (0, 0)
+
+    if match.result == match.player1.id:
+        result = RESULT_PLAYER1
+    elif match.result == match.player2.id:
+        result = RESULT_PLAYER2
+    elif match.result == "draw":
+        result = RESULT_DRAW
+    else:
+        result = RESULT_INTERRUPTED
+
+    records = [MATCH_RECORD.pack(
+        match.id, GAME_TYPES.index(match.game_type), result,
+        match.player1.id, match.player2.id, len(turns), *variant, *codes
+    )]
+    for turn_id, player_id, move, feedback, grade in turns:
+        if not move.isdigit():
+            raise NotArchivable(match.id)  # anciens coups en listes JSON
+        black, white = (NO_FEEDBACK, 0)
+        if feedback:
+            black, white = (int(value) for value in feedback.strip("[]").split(","))
+        side = 1 if player_id == match.player1.id else 2
+        records.append(TURN_RECORD.pack(turn_id, side, int(move), black, white, GRADES.index(grade)))
+    return b"".join(records)
+
+class ArchiveReader:
+    """Lecture de l'archive par projection en mémoire (accès direct à un match par son identifiant)."""
+
+    def __init__(self, path=PATH):
+        self.path = path
+        self.maps = (None, None)  # (données, index), remplacés ensemble par reload
+        self.reload()
+
+    def reload(self):
+        """Projette à nouveau les fichiers après un ajout.
+
+        Les anciennes projections ne sont pas fermées: une lecture en cours
+        dans un autre thread les garde valides jusqu'à ce qu'elle se termine.
+        """
+        self.maps = (self._map(self.path), self._map(f"{self.path}.idx"))
+
+    @staticmethod
+    def _map(path):
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        with open(path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        index = self.maps[1]
+        return len(index) // INDEX_ENTRY.size if index is not None else 0
+
+    def offset(self, match_id: int):
+        """Position de l'en-tête d'un match dans le fichier, ou None s'il n'est pas archivé."""
+        data, index = self.maps
+        if index is None:
+            return None
+        entries = range(len(index) // INDEX_ENTRY.size)
+        position = bisect_left(entries, match_id, key=lambda i: INDEX_ENTRY.unpack_from(index, i * INDEX_ENTRY.size)[0])
+        if position < len(entries):
+            found, offset = INDEX_ENTRY.unpack_from(index, position * INDEX_ENTRY.size)
+            if found == match_id:
+                return offset
+        return None
+
+    def __contains__(self, match_id):
+        return self.offset(match_id) is not None
+
+    def header(self, match_id: int):
+        """En-tête d'un match: (id, jeu, résultat, joueur 1, joueur 2, coups, variante, codes) ou None."""
+        offset = self.offset(match_id)
+        if offset is None:
+            return None
+        return self._header(self.maps[0], offset)
+
+    @staticmethod
+    def _header(data, offset):
+        (match_id, game, result, player1, player2, count,
+         param1, param2, code1, code2) = MATCH_RECORD.unpack_from(data, offset)
+        return match_id, GAME_TYPES[game], result, player1, player2, count, (param1, param2), (code1, code2)
+
+    def turns(self, match_id: int):
+        """Coups d'un match dans l'ordre: (id, joueur 1 ou 2, coup, feedback, note)."""
+        offset = self.offset(match_id)
+        if offset is None:
+            return
+        data = self.maps[0]
+        count = MATCH_RECORD.unpack_from(data, offset)[5]
+        offset += MATCH_RECORD.size
+        records = memoryview(data)[offset:offset + count * TURN_RECORD.size]
+        for turn_id, side, move, black, white, grade in TURN_RECORD.iter_unpack(records):
+            feedback = None if black == NO_FEEDBACK else [black, white]
+            yield turn_id, side, move, feedback, GRADES[grade]
+
+    def matches(self):
+        """Parcourt les en-têtes de tous les matchs par identifiant croissant (analyses en masse)."""
+        data, index = self.maps
+        if index is None:
+            return
+        # Par l'index et non par le fichier: un lot réécrit après un arrêt brutal n'y figure qu'une fois
+        for _, offset in INDEX_ENTRY.iter_unpack(index):
+            yield self._header(data, offset)
+
+def write_index(path, entries):
+    """Ajoute des entrées (identifiant, position) à l'index, en le réécrivant s'il faut les trier."""
+    index_path = f"{path}.idx"
+    entries.sort()
+    last = None
+    if os.path.exists(index_path) and os.path.getsize(index_path) >= INDEX_ENTRY.size:
+        with open(index_path, "rb") as f:
+            f.seek(-INDEX_ENTRY.size, os.SEEK_END)
+            last = INDEX_ENTRY.unpack(f.read())[0]
+    if last is None or entries[0][0] > last:
+        # Cas courant: identifiants croissants, simple ajout en fin d'index
+        with open(index_path, "ab") as f:
+            f.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in entries))
+            f.flush()
+            os.fsync(f.fileno())
+        return
+    # Match terminé après un match plus récent: fusion, la dernière position d'un match l'emporte
+    with open(index_path, "rb") as f:
+        merged = dict(INDEX_ENTRY.iter_unpack(f.read()))
+    merged.update(entries)
+    temporary = f"{index_path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(b"".join(INDEX_ENTRY.pack(*entry) for entry in sorted(merged.items())))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, index_path)
+
+def archive_matches(db, path=PATH, prune=False, batch_size=500) -> int:
+    """Archive les matchs terminés qui ne le sont pas encore et retourne leur nombre.
+
+    Les coups sont ajoutés au fichier et l'index mis à jour avant que les
+    matchs soient marqués archivés en base: après un arrêt brutal, un lot
+    est au pire archivé une seconde fois. Avec prune, les coups archivés
+    sont supprimés de la table turns (les matchs restent en base pour
+    l'historique et les classements).
+    """
+    archived = 0
+    while True:
+        match_ids = db.get_unarchived_match_ids(batch_size)
+        if not match_ids:
+            return archived
+        turns = {}
+        for match_id, *turn in db.get_turn_rows(match_ids):
+            turns.setdefault(match_id, []).append(turn)
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        done, skipped, entries = [], [], []
+        with open(path, "ab") as f:
+            offset = f.tell()
+            if new_file:
+                offset += f.write(FILE_HEADER.pack(MAGIC, VERSION, 0))
+            for match in db.get_matches(match_ids):
+                try:
+                    record = encode_match(match, turns.get(match.id, []))
+                except NotArchivable:
+                    skipped.append(match.id)
+                    continue
+                f.write(record)
+                entries.append((match.id, offset))
+                done.append(match.id)
+                offset += len(record)
+            f.flush()
+            os.fsync(f.fileno())
+        if entries:
+            write_index(path, entries)
+        db.mark_archived(done, prune=prune)
+        db.mark_archived(skipped, state=-1)
+        archived += len(done)
+
+class ArchiveJob:
+    """Archivage périodique en tâche de fond."""
+
+    def __init__(self, db, reader, interval=300, prune=False):
+        self.db = db
+        self.reader = reader
+        self.interval = interval
+        self.prune = prune
+        self.stopped = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                if archive_matches(self.db, self.reader.path, self.prune):
+                    self.reader.reload()
+            except Exception as e:
+                print(f"Erreur lors de l'archivage: {e}")
+
+    def stop(self):
+        self.stopped.set()
+
+if __name__ == "__main__":
+    from database import Database
+    args = [arg for arg in sys.argv[1:] if arg != "--prune"]
+    db = Database(args[0] if args else "matchmaking.db")
+    print(f"{archive_matches(db, prune='--prune' in sys.argv)} matchs archivés dans {PATH}")
+    db.close()
@@ -0,0 +1,487 @@
+"""Mesures de performance du serveur de matchmaking.
+
+Usage: python benchmarks.py
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from functools import partial
+from types import SimpleNamespace
+
+from models import Player, Match, Turn, ConnectFourMatch, MastermindMatch, TicTacToe, ConnectFour, Mastermind
+from actors import MatchActor
+from matchmaking import RatedQueue
+from hints import CandidateTracker
+from database import Database
+from leaderboard import Leaderboard
+from archive import ArchiveReader, archive_matches
+from timer_wheel import TimerWheel
+from spectators import SpectatorHub
+from lobby import Lobby
+from session import Session
+from tournament import Tournament
+from journal import MatchJournal, recover_matches
+from ratings import EloRatings
+from games import GAMES
+
+class FrozenClock:
+    """Horloge manipulable pour les mesures de matchmaking."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_player(player_id):
+    return Player(player_id, f"p{player_id}", "127.0.0.1", 0, int(time.time()))
+
+def bench_matchmaking(waiting=20000, arrivals=2000):
+    """Temps d'appariement d'une arrivée avec des dizaines de milliers de joueurs en attente."""
+    rng = random.Random(0)
+    clock = FrozenClock()
+    ratings = {}
+    queue = RatedQueue(ratings.__getitem__, clock)
+
+    # Joueurs en attente espacés au-delà de la fenêtre initiale: aucun ne s'apparie
+    for i in range(waiting):
+        ratings[i] = i * (queue.BASE_WINDOW + 10)
+        queue.put(make_player(i), None)
+    queue.drain_pairs()
+    assert len(queue) == waiting
+
+    elapsed = 0.0
+    paired = 0
+    for i in range(arrivals):
+        player_id = waiting + i
+        ratings[player_id] = rng.randrange(waiting) * (queue.BASE_WINDOW + 10) + rng.randint(-40, 40)
+        player = make_player(player_id)
+        start = time.perf_counter()
+        queue.put(player, None)
+        paired += len(queue.drain_pairs())
+        elapsed += time.perf_counter() - start
+
+    print(f"Matchmaking: {waiting} joueurs en attente, {paired} paires sur {arrivals} arrivées, "
+          f"{elapsed / arrivals * 1e6:.1f} µs par arrivée")
+
+def random_games(engine, symbols, columns, count, rng):
+    """Génère des parties aléatoires valides (suites de coups) pour un moteur."""
+    games = []
+    for _ in range(count):
+        game = engine()
+        moves = []
+        while not game.check_winner():
+            move = rng.randrange(columns)
+            symbol = symbols[len(moves) % 2]
+            played = game.play_move(move, symbol)
+            if played is None or played is False:
+                continue
+            moves.append((move, symbol))
+        games.append(moves)
+    return games
+
+def time_games(engine, games, repeat=3):
+    """Temps par coup (jeu + détection de victoire) sur des parties pré-générées, meilleur de plusieurs essais."""
+    moves = sum(len(sequence) for sequence in games)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sequence in games:
+            game = engine()
+            for move, symbol in sequence:
+                game.play_move(move, symbol)
+                game.check_winner()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / moves
+
+def bench_win_check(count=20000):
+    """Coût par coup du Puissance 4 (7x6) et du Gomoku (15x15) comparé au Morpion, côté serveur."""
+    rng = random.Random(0)
+    morpion = time_games(TicTacToe, random_games(TicTacToe, "XO", 9, count, rng))
+    puissance4 = time_games(ConnectFour, random_games(ConnectFour, ConnectFour.SYMBOLS, ConnectFour.COLUMNS, count, rng))
+    gomoku = partial(TicTacToe, 15, 5)
+    gomoku = time_games(gomoku, random_games(gomoku, "XO", 15 * 15, count // 10, rng))
+    print(f"Coût par coup: Morpion {morpion * 1e6:.2f} µs, Puissance 4 {puissance4 * 1e6:.2f} µs, Gomoku 15×15 {gomoku * 1e6:.2f} µs")
+
+def bench_mastermind(count=20000):
+    """Coût du score d'une tentative, à l'unité et par lot (une tentative contre tous les codes)."""
+    rng = random.Random(0)
+    for code_length, colors in ((4, 6), (6, 10), (30, 20)):
+        game = Mastermind(code_length, colors)
+        space = colors ** code_length
+        pairs = [(rng.randrange(space), rng.randrange(space)) for _ in range(count)]
+        start = time.perf_counter()
+        for code, guess in pairs:
+            game.check_guess(code, guess)
+        single = (time.perf_counter() - start) / count
+        print(f"Mastermind {code_length} pions/{colors} couleurs: {single * 1e6:.2f} µs par tentative")
+
+    game = Mastermind()
+    codes = range(game.colors ** game.code_length)
+    start = time.perf_counter()
+    game.score_many(0, codes)
+    batch = time.perf_counter() - start
+    print(f"Mastermind 4/6: une tentative contre les {len(codes)} codes en {batch * 1e3:.2f} ms")
+
+def bench_hints(count=200):
+    """Surcoût du suivi des codes possibles (MASTERMIND_HINT) par tentative, variante par défaut."""
+    rng = random.Random(0)
+    game = Mastermind()
+    space = game.colors ** game.code_length
+    CandidateTracker(game)  # tables précalculées hors mesure
+    updates = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        secret = rng.randrange(space)
+        tracker = CandidateTracker(game)
+        while tracker.remaining > 1:
+            guess = rng.randrange(space)
+            tracker.update(guess, game.check_guess(secret, guess))
+            updates += 1
+    elapsed = time.perf_counter() - start
+    print(f"Aide Mastermind: {elapsed / updates * 1e6:.0f} µs par feedback ({updates} feedbacks)")
+
+# Mémoire résidente visée pour un match en cours (joueurs et leurs identifiants, match, jeu, acteur)
+MATCH_MEMORY_BUDGET = 1300
+
+def live_match(index, game_type):
+    """Construit un match en cours tel que le serveur le garde en mémoire."""
+    player1, player2 = make_player(2 * index), make_player(2 * index + 1)
+    if game_type == "morpion":
+        game = TicTacToe()
+        match = Match(index, player1, player2, game, False, None)
+        for position in (0, 4, 8):
+            game.play_move(position, "X")
+    elif game_type == "puissance4":
+        game = ConnectFour()
+        match = ConnectFourMatch(index, player1, player2, game, False, None)
+    else:
+        game = Mastermind()
+        match = MastermindMatch(index, player1, player2, [], False, None, player1_code=1, player2_code=2)
+    return MatchActor(match, game, None)
+
+def bench_memory(count=10000):
+    """Mémoire par match en cours, comparée au budget MATCH_MEMORY_BUDGET."""
+    for game_type in ("morpion", "puissance4", "mastermind"):
+        live_match(0, game_type)  # tables partagées (rayons du Morpion...) hors mesure
+        tracemalloc.start()
+        matches = [live_match(index, game_type) for index in range(count)]
+        per_match = tracemalloc.get_traced_memory()[0] / len(matches)
+        tracemalloc.stop()
+        verdict = "OK" if per_match <= MATCH_MEMORY_BUDGET else "DÉPASSÉ"
+        print(f"Mémoire {game_type}: {per_match:.0f} octets par match (budget {MATCH_MEMORY_BUDGET}: {verdict})")
+
+def bench_match_loading(count=2000, players=200):
+    """Temps de chargement des matchs enregistrés, un par un puis par lots."""
+    db = Database(":memory:")
+    rng = random.Random(0)
+    for player_id in range(1, players + 1):
+        db.add_player(make_player(player_id))
+    stored = []
+    for index in range(count):
+        player1, player2 = rng.sample(range(1, players + 1), 2)
+        if index % 2:
+            match = MastermindMatch(0, db.get_player(player1), db.get_player(player2), [], True, "draw",
+                                    player1_code=1, player2_code=2)
+        else:
+            match = Match(0, db.get_player(player1), db.get_player(player2), TicTacToe(), True, "draw")
+        stored.append(match)
+    match_ids = db.add_matches(stored)
+
+    start = time.perf_counter()
+    for match_id in match_ids:
+        db.get_match(match_id)
+    single = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded = db.get_matches(match_ids)
+    bulk = time.perf_counter() - start
+    assert len(loaded) == count
+    db.close()
+    print(f"Chargement de {count} matchs: {single / count * 1e6:.0f} µs par get_match, "
+          f"{bulk / count * 1e6:.0f} µs par match avec get_matches")
+
+def bench_leaderboard(players=100000, updates=10000, requests=100000):
+    """Coût d'une fin de match et d'une demande de page du classement."""
+    rng = random.Random(0)
+    leaderboard = Leaderboard()
+    for player_id in range(players):
+        leaderboard.update(player_id, f"p{player_id}", rng.gauss(1500, 200), rng.randrange(100))
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        player_id = rng.randrange(players)
+        leaderboard.update(player_id, f"p{player_id}", rng.gauss(1500, 200), rng.randrange(100))
+    update_cost = (time.perf_counter() - start) / updates
+
+    start = time.perf_counter()
+    for index in range(requests):
+        leaderboard.page("rating", index % 5)
+        leaderboard.lookup(index % players)
+    request_cost = (time.perf_counter() - start) / requests
+    print(f"Classement de {players} joueurs: {update_cost * 1e6:.1f} µs par mise à jour, "
+          f"{request_cost * 1e6:.1f} µs par demande (page en cache et rang)")
+
+def bench_archive(count=2000, players=200, lookups=20000):
+    """Archivage des matchs terminés, puis lecture d'un match au hasard dans l'archive."""
+    db = Database(":memory:")
+    rng = random.Random(0)
+    for player_id in range(1, players + 1):
+        db.add_player(make_player(player_id))
+    stored = []
+    for _ in range(count):
+        player1, player2 = rng.sample(range(1, players + 1), 2)
+        stored.append(Match(0, db.get_player(player1), db.get_player(player2), TicTacToe(), True, "draw"))
+    match_ids = db.add_matches(stored)
+    for match_id, match in zip(match_ids, stored):
+        for move in rng.sample(range(9), 9):
+            db.add_turn(Turn(match_id, match.player1 if move % 2 else match.player2, move))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "matches.archive")
+        start = time.perf_counter()
+        assert archive_matches(db, path) == count
+        archive_cost = (time.perf_counter() - start) / count
+        reader = ArchiveReader(path)
+        start = time.perf_counter()
+        for _ in range(lookups):
+            assert len(list(reader.turns(rng.choice(match_ids)))) == 9
+        lookup_cost = (time.perf_counter() - start) / lookups
+        size = os.path.getsize(path) / count
+    db.close()
+    print(f"Archive de {count} matchs: {archive_cost * 1e6:.0f} µs par match archivé, "
+          f"{lookup_cost * 1e6:.1f} µs par relecture, {size:.0f} octets par match")
+
+def bench_journal_recovery(count=10000, players=200, moves=6):
+    """Temps de reconstruction des matchs ouverts à partir du journal, au démarrage du serveur."""
+    db = Database(":memory:")
+    rng = random.Random(0)
+    for player_id in range(1, players + 1):
+        db.add_player(make_player(player_id))
+    games = {name: plugin_class(None, EloRatings()) for name, plugin_class in GAMES.items()}
+    started = []
+    for index in range(count):
+        player1, player2 = (db.get_player(player_id) for player_id in rng.sample(range(1, players + 1), 2))
+        if index % 2:
+            variant, data = (4, 6, False), (rng.randrange(6 ** 4), rng.randrange(6 ** 4))
+            match, game = games["mastermind"].create_match(variant, player1, player2, *data)
+        else:
+            variant, data = (3, 3, False), (None, None)
+            match, game = games["morpion"].create_match(variant, player1, player2, *data)
+        started.append((match, game, variant, data))
+    match_ids = db.add_matches([match for match, _, _, _ in started])
+
+    with tempfile.TemporaryDirectory() as directory:
+        journal = MatchJournal(os.path.join(directory, "matches.journal"))
+        journal.open()
+        for (match, game, variant, data), match_id in zip(started, match_ids):
+            match.id = match_id
+            journal.start(match, variant, *data)
+            for move, position in enumerate(rng.sample(range(9), moves)):
+                player = match.player1 if move % 2 == 0 else match.player2
+                if match.game_type == "mastermind":
+                    guess = rng.randrange(6 ** 4)
+                    code = match.player2_code if player is match.player1 else match.player1_code
+                    journal.append("GUESS", match_id, player=player.id, move=guess, feedback=game.check_guess(code, guess))
+                else:
+                    journal.append("MOVE", match_id, player=player.id, move=position, feedback=None)
+        journal.close()
+
+        start = time.perf_counter()
+        reopened = MatchJournal(journal.path)
+        recovered = recover_matches(reopened, db, games, None)
+        elapsed = time.perf_counter() - start
+        reopened.close()
+        assert len(recovered) == count
+    db.close()
+    print(f"Reprise de {count} matchs ouverts ({moves} coups chacun): {elapsed * 1000:.0f} ms, "
+          f"{elapsed / count * 1e6:.0f} µs par match")
+
+def bench_journal_compaction(count=100000, concurrent=1000, moves=6):
+    """Taille du journal d'un serveur qui tourne longtemps: matchs terminés retirés par compactage."""
+    with tempfile.TemporaryDirectory() as directory:
+        journal = MatchJournal(os.path.join(directory, "matches.journal"))
+        journal.open()
+        start = time.perf_counter()
+        events = 0
+        for match_id in range(1, count + 1):
+            journal.append("START", match_id, game_type="morpion", variant=[3, 3, False], players=[1, 2], data=[None, None])
+            for move in range(moves):
+                journal.append("MOVE", match_id, player=1 + move % 2, move=move, feedback=None)
+            if match_id > concurrent:
+                journal.append("END", match_id - concurrent)
+            events += moves + 2
+            if match_id % 500 == 0:
+                journal.flush()  # au rythme du thread d'écriture
+        journal.flush()
+        elapsed = time.perf_counter() - start
+        with open(journal.path, encoding="utf-8") as f:
+            lines = sum(1 for _ in f)
+        journal.close()
+    print(f"Journal, {count} matchs dont {concurrent} ouverts: {lines} lignes à la fin "
+          f"(au lieu de {events}), {elapsed / events * 1e6:.1f} µs par événement compactage compris")
+
+def bench_timer_wheel(connections=50000, interval=15, duration=60):
+    """Surveillance des connexions par la roue de minuteurs: une vérification par connexion et par intervalle."""
+    rng = random.Random(0)
+    now = [0.0]  # horloge simulée, avancée d'un tick à la fois
+    wheel = TimerWheel(clock=lambda: now[0])
+
+    def check(connection):
+        wheel.schedule(interval, check, connection)
+
+    start = time.perf_counter()
+    for connection in range(connections):
+        wheel.schedule(rng.uniform(0, interval), check, connection)
+    schedule_cost = (time.perf_counter() - start) / connections
+    ticks = int(duration / wheel.tick)
+    start = time.perf_counter()
+    fired = 0
+    for step in range(1, ticks + 1):
+        now[0] = (step + 0.5) * wheel.tick
+        fired += wheel.advance()
+    elapsed = time.perf_counter() - start
+
+    # Tick à vide: des minuteurs en attente qui n'expirent pas ne coûtent rien
+    idle = TimerWheel(clock=lambda: 0)
+    for connection in range(connections):
+        idle.schedule(3600, check, connection)
+    start = time.perf_counter()
+    idle.advance(duration)
+    idle_cost = (time.perf_counter() - start) / ticks
+    print(f"Roue de minuteurs, {connections} connexions: {schedule_cost * 1e6:.2f} µs par minuteur programmé, "
+          f"{elapsed / ticks * 1e3:.2f} ms par tick ({fired / ticks:.0f} vérifications), "
+          f"{idle_cost * 1e6:.1f} µs par tick sans échéance")
+
+class ViewerSocket:
+    """Socket de spectateur simulé: compte les octets reçus, ou bloque pour un spectateur bloqué."""
+    def __init__(self, stalled=False):
+        self.received = 0
+        self.stalled = threading.Event() if stalled else None
+
+    def send(self, data, flags=0):
+        if self.stalled is not None and not self.stalled.is_set():
+            raise BlockingIOError  # tampon d'envoi plein
+        self.received += len(data)
+        return len(data)
+
+    def sendall(self, data):
+        if self.stalled is not None:
+            self.stalled.wait()
+        self.received += len(data)
+
+class ViewerSession(Session):
+    def __init__(self, index, stalled=False):
+        super().__init__(ViewerSocket(stalled), ("spectateur", index))
+        self.player_id = index
+
+def bench_spectators(viewers=500, events=2000):
+    """Diffusion des coups d'un match à ses spectateurs, dont un bloqué: coût pour le thread du match et pour le diffuseur."""
+    hub = SpectatorHub()
+    hub.start()
+    sessions = [ViewerSession(index, stalled=index == 0) for index in range(viewers)]
+    for session in sessions:
+        hub.subscribe(session, 1, {"action": "SPECTATE", "status": "OK", "match_id": 1})
+    delivered = threading.Event()
+    hub.post(delivered.set)
+    delivered.wait()
+    start = time.perf_counter()
+    for index in range(events):
+        hub.publish(1, {"action": "MOVE", "position": index % 225, "symbol": "XO"[index & 1]})
+    published = time.perf_counter() - start
+    delivered.clear()
+    hub.post(delivered.set)
+    delivered.wait()
+    elapsed = time.perf_counter() - start
+    dropped = viewers - len(hub.watchers.get(1, ()))
+    hub.close_match(1)
+    hub.stop()
+    print(f"Diffusion à {viewers} spectateurs: {published / events * 1e6:.1f} µs par coup pour le match, "
+          f"{elapsed / events / viewers * 1e9:.0f} ns par spectateur pour le diffuseur, {dropped} spectateur(s) lent(s) retiré(s)")
+
+def bench_lobby(subscribers=10000, waiting=2000, rounds=5):
+    """Envoi périodique du salon à ses abonnés: état complet, puis deltas (meilleur de plusieurs périodes)."""
+    games = {name: plugin_class(None, EloRatings()) for name, plugin_class in GAMES.items()}
+    queue = games["morpion"].queues[(3, 3, False)]
+    for player_id in range(waiting):
+        queue.put(make_player(player_id), None)
+    sessions = [ViewerSession(index) for index in range(subscribers)]
+    server = SimpleNamespace(clients_lock=threading.Lock(), clients=dict.fromkeys(range(subscribers)), games=games)
+    lobby = Lobby(server)
+
+    def timed_push():
+        before = sum(session.socket.received for session in sessions)
+        start = time.perf_counter()
+        lobby.push()
+        return time.perf_counter() - start, sum(session.socket.received for session in sessions) - before
+
+    full, delta, idle = [], [], []
+    for _ in range(rounds):
+        # Abonnés tous nouveaux: chacun reçoit l'état complet
+        for session in sessions:
+            lobby.subscribe(session)
+        full.append(timed_push())
+        # Dix paires formées en tête de file: les positions de tous les joueurs en attente changent
+        for player_id in queue.order(queue.snapshot())[:20]:
+            queue.remove(player_id)
+        lobby.record_matched("morpion", (3, 3, False), 20)
+        delta.append(timed_push())
+        idle.append(timed_push())
+    (full, full_bytes), (delta, delta_bytes), (idle, idle_bytes) = min(full), min(delta), min(idle)
+    # Seule la copie de la file est faite sous le verrou du jeu
+    start = time.perf_counter()
+    for _ in range(100):
+        queue.snapshot()
+    locked = (time.perf_counter() - start) / 100
+    print(f"Salon, {subscribers} abonnés dont {waiting} en attente: état complet {full * 1e3:.0f} ms ({full_bytes // 1024} Ko), "
+          f"deltas {delta * 1e3:.0f} ms ({delta_bytes // 1024} Ko), période suivante {idle * 1e3:.1f} ms ({idle_bytes // 1024} Ko), "
+          f"verrou de la file tenu {locked * 1e6:.0f} µs")
+
+def bench_tournament(players=1024):
+    """Appariement des rondes et tenue du classement d'un tournoi de 1024 joueurs."""
+    rng = random.Random(0)
+    for format in Tournament.FORMATS:
+        tournament = Tournament(1, "morpion", (3, 3, False), format, players, None, 0)
+        for player_id in range(players):
+            tournament.add(make_player(player_id))
+        ratings = {player_id: rng.gauss(1200, 200) for player_id in range(players)}
+        tournament.begin(ratings.get)
+        pairing, recording, results = [], 0.0, 0
+        while not tournament.is_over():
+            start = time.perf_counter()
+            pairings = tournament.next_round()
+            pairing.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for player1, player2 in pairings:
+                outcome = rng.random()
+                tournament.record(player1, player2, player1 if outcome < 0.45 else player2 if outcome < 0.9 else None)
+            while tournament.pending:
+                # Nuls rejoués (élimination directe): le joueur 1 finit par gagner
+                for player1, player2 in list(tournament.pending):
+                    tournament.record(player1, player2, player1)
+            recording += time.perf_counter() - start
+            results += len(pairings)
+            tournament.close_round()
+        print(f"Tournoi {format}, {players} joueurs, {tournament.round} rondes: appariement {max(pairing) * 1e3:.2f} ms "
+              f"au pire, {recording / results * 1e6:.1f} µs par résultat (classement compris)")
+
+def main():
+    bench_matchmaking()
+    bench_win_check()
+    bench_mastermind()
+    bench_hints()
+    bench_memory()
+    bench_match_loading()
+    bench_leaderboard()
+    bench_archive()
+    bench_journal_recovery()
+    bench_journal_compaction()
+    bench_timer_wheel()
+    bench_spectators()
+    bench_lobby()
+    bench_tournament()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Pendules des matchs: temps par coup et temps total de chaque joueur.
+
+La pendule ne fait que compter le temps (time.monotonic); les dépassements
+sont détectés par un minuteur de la roue du serveur, programmé à chaque
+mise en route d'une pendule. Les pendules ne tournent pas tant qu'un joueur
+du match est suspendu (connexion perdue, en attente de reprise).
+"""
+
+class MatchClock:
+    """Pendules des deux joueurs d'un match."""
+    __slots__ = ("turn_time", "remaining", "started", "timers", "paused")
+
+    def __init__(self, turn_time, game_time, player_ids):
+        self.turn_time = turn_time  # secondes par coup (None: illimité)
+        self.remaining = dict.fromkeys(player_ids, game_time)  # temps total restant (None: illimité)
+        self.started = {}  # identifiant du joueur -> début de son coup en cours
+        self.timers = {}   # identifiant du joueur -> minuteur de dépassement
+        self.paused = set()  # joueurs suspendus: aucune pendule ne tourne
+
+    def start(self, player_id, now):
+        """Met en route la pendule d'un joueur qui doit jouer."""
+        self.started[player_id] = now
+
+    def stop(self, player_id, now):
+        """Arrête la pendule d'un joueur qui vient de jouer et décompte le temps utilisé."""
+        started = self.started.pop(player_id, None)
+        if started is not None and self.remaining[player_id] is not None:
+            self.remaining[player_id] = max(0.0, self.remaining[player_id] - (now - started))
+
+    def time_left(self, player_id, now):
+        """Temps restant pour jouer le coup en cours (ou le prochain), None sans limite."""
+        limits = [limit for limit in (self.turn_time, self.remaining[player_id]) if limit is not None]
+        if not limits:
+            return None
+        elapsed = now - self.started[player_id] if player_id in self.started else 0.0
+        return max(0.0, min(limits) - elapsed)
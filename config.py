@@ -11,3 +11,6 @@ class Config:
     
     DEFAULT_HOST = "localhost"
     DEFAULT_PORT = 12345
+
+    # Intervalle des signes de vie envoyés au serveur (ms), sous son délai de PING
+    HEARTBEAT_INTERVAL = 10000
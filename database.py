@@ -1,99 +1,135 @@
 import sqlite3
 import json
-from models import Player, Match, Turn, MastermindMatch
+import threading
+from collections import OrderedDict
+from models import Player, Match, Turn, MastermindMatch, ConnectFourMatch
 from datetime import datetime
+from migrations import migrate
 
 class Database:
+    PLAYER_CACHE_SIZE = 4096
+    FLUSH_INTERVAL = 0.05  # secondes entre deux écritures groupées des coups
+
     def __init__(self, db_name="matchmaking.db"):
         self.conn = sqlite3.connect(db_name, check_same_thread=False)
         self.cursor = self.conn.cursor()
+        # La connexion est partagée entre les threads des matchs
+        self.lock = threading.RLock()
+        # Cache LRU des joueurs lus en base (identifiant -> Player), vidé par update_player
+        self.players = OrderedDict()
+        # Écritures des matchs en cours (coups, plateaux), déposées par les acteurs sans
+        # attendre la base puis écrites par lots dans une seule transaction
+        self.pending_lock = threading.Lock()
+        self.pending_turns = []    # lignes de la table turns
+        self.pending_matches = {}  # match_id -> (ligne de matches, ligne de mastermind_matches ou None)
+        self.stopped = threading.Event()
         self.create_tables()
+        threading.Thread(target=self.run_writer, daemon=True).start()
+
+    def run_writer(self):
+        while not self.stopped.wait(self.FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Erreur lors de l'écriture des coups: {e}")
+
+    def flush(self):
+        """Écrit en une transaction les coups et plateaux déposés depuis la dernière écriture."""
+        with self.lock:
+            with self.pending_lock:
+                turns, self.pending_turns = self.pending_turns, []
+                matches, self.pending_matches = self.pending_matches, {}
+            if not turns and not matches:
+                return
+            self.cursor.executemany('''
+                INSERT INTO turns (match_id, player_id, move, feedback, grade)
+                VALUES (?, ?, ?, ?, ?)
+            ''', turns)
+            self.cursor.executemany("UPDATE matches SET board = ?, is_finished = ?, result = ? WHERE id = ?",
+                                    [row for row, _ in matches.values()])
+            self.cursor.executemany('''
+                UPDATE mastermind_matches SET
+                    player1_guesses = ?, player2_guesses = ?,
+                    player1_feedback = ?, player2_feedback = ?
+                WHERE match_id = ?
+            ''', [mastermind for _, mastermind in matches.values() if mastermind is not None])
+            self.conn.commit()
 
     def create_tables(self):
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS players (
-                pseudo TEXT PRIMARY KEY,
-                ip TEXT,
-                port INTEGER,
-                join_date TEXT
-            )
-        ''')
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS matches (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                player1 TEXT,
-                player2 TEXT,
-                board TEXT,
-                is_finished INTEGER,
-                result TEXT,
-                game_type TEXT DEFAULT 'morpion'
-            )
-        ''')
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS turns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                match_id INTEGER,
-                player TEXT,
-                move TEXT,
-                feedback TEXT,
-                FOREIGN KEY (match_id) REFERENCES matches(id)
-            )
-        ''')
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS mastermind_matches (
-                match_id INTEGER PRIMARY KEY,
-                player1_code TEXT,
-                player2_code TEXT,
-                player1_guesses TEXT,
-                player2_guesses TEXT,
-                player1_feedback TEXT,
-                player2_feedback TEXT,
-                max_attempts INTEGER DEFAULT 10,
-                FOREIGN KEY (match_id) REFERENCES matches(id)
-            )
-        ''')
-        self.conn.commit()
+        """Crée les tables ou met à jour le schéma d'une base existante."""
+        with self.lock:
+            migrate(self.conn)
 
-    def add_player(self, player: Player):
-        try:
-            self.cursor.execute('''
-                INSERT INTO players (pseudo, ip, port, join_date)
-                VALUES (?, ?, ?, ?)
-            ''', (player.pseudo, player.ip, player.port, player.join_date.isoformat()))
+    def get_player_id(self, pseudo: str) -> int:
+        """Retourne l'identifiant d'un pseudo, en créant le joueur s'il est nouveau."""
+        with self.lock:
+            self.cursor.execute("SELECT id FROM players WHERE pseudo = ?", (pseudo,))
+            row = self.cursor.fetchone()
+            if row:
+                return row[0]
+            self.cursor.execute("INSERT INTO players (pseudo) VALUES (?)", (pseudo,))
             self.conn.commit()
-        except sqlite3.IntegrityError:
+            return self.cursor.lastrowid
+
+    def add_player(self, player: Player) -> int:
+        """Enregistre un joueur (ou met à jour sa connexion) et retourne son identifiant."""
+        with self.lock:
+            player.id = self.get_player_id(player.pseudo)
             self.update_player(player)
+            return player.id
 
     def update_player(self, player: Player):
-        self.cursor.execute('''
-            UPDATE players SET ip = ?, port = ?, join_date = ?
-            WHERE pseudo = ?
-        ''', (player.ip, player.port, player.join_date.isoformat(), player.pseudo))
-        self.conn.commit()
+        with self.lock:
+            self.players.pop(player.id, None)
+            self.cursor.execute('''
+                UPDATE players SET ip = ?, port = ?, join_date = ?
+                WHERE id = ?
+            ''', (player.ip, player.port, datetime.fromtimestamp(player.join_date).isoformat(), player.id))
+            self.conn.commit()
 
     def add_match(self, match: Match) -> int:
-        self.cursor.execute('''
-            INSERT INTO matches (player1, player2, board, is_finished, result, game_type)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (match.player1.pseudo, match.player2.pseudo, str(match.board), int(match.is_finished), match.result, match.game_type))
-        self.conn.commit()
-        match_id = self.cursor.lastrowid
+        with self.lock:
+            self.cursor.execute('''
+                INSERT INTO matches (player1_id, player2_id, board, is_finished, result, game_type)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (match.player1.id, match.player2.id, str(match.board), int(match.is_finished), match.result, match.game_type))
+            self.conn.commit()
+            match_id = self.cursor.lastrowid
         
-        # Si c'est un match de Mastermind, ajouter les données spécifiques
-        if match.game_type == "mastermind" and isinstance(match, MastermindMatch):
-            self.add_mastermind_match(match, match_id)
+            # Si c'est un match de Mastermind, ajouter les données spécifiques
+            if match.game_type == "mastermind" and isinstance(match, MastermindMatch):
+                self.add_mastermind_match(match, match_id)
             
-        return match_id
+            return match_id
 
-    def add_mastermind_match(self, match: MastermindMatch, match_id: int):
-        self.cursor.execute('''
-            INSERT INTO mastermind_matches (
-                match_id, player1_code, player2_code, 
-                player1_guesses, player2_guesses, 
-                player1_feedback, player2_feedback, max_attempts
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    def add_matches(self, matches: list) -> list:
+        """Insère plusieurs matchs dans une seule transaction et retourne leurs IDs."""
+        with self.lock:
+            match_ids = []
+            mastermind_rows = []
+            for match in matches:
+                self.cursor.execute('''
+                    INSERT INTO matches (player1_id, player2_id, board, is_finished, result, game_type)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (match.player1.id, match.player2.id, str(match.board), int(match.is_finished), match.result, match.game_type))
+                match_ids.append(self.cursor.lastrowid)
+                if match.game_type == "mastermind" and isinstance(match, MastermindMatch):
+                    mastermind_rows.append(self._mastermind_row(match, self.cursor.lastrowid))
+            if mastermind_rows:
+                self.cursor.executemany('''
+                    INSERT INTO mastermind_matches (
+                        match_id, player1_code, player2_code,
+                        player1_guesses, player2_guesses,
+                        player1_feedback, player2_feedback, max_attempts,
+                        code_length, colors
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', mastermind_rows)
+            self.conn.commit()
+            return match_ids
+
+    def _mastermind_row(self, match: MastermindMatch, match_id: int) -> tuple:
+        return (
             match_id,
             json.dumps(match.player1_code),
             json.dumps(match.player2_code),
@@ -101,113 +137,296 @@ class Database:
             json.dumps(match.player2_guesses),
             json.dumps(match.player1_feedback),
             json.dumps(match.player2_feedback),
-            match.max_attempts
-        ))
-        self.conn.commit()
+            match.max_attempts,
+            match.code_length,
+            match.colors
+        )
+
+    def add_mastermind_match(self, match: MastermindMatch, match_id: int):
+        with self.lock:
+            self.cursor.execute('''
+                INSERT INTO mastermind_matches (
+                    match_id, player1_code, player2_code, 
+                    player1_guesses, player2_guesses, 
+                    player1_feedback, player2_feedback, max_attempts,
+                    code_length, colors
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', self._mastermind_row(match, match_id))
+            self.conn.commit()
 
     def update_match(self, match: Match):
-        self.cursor.execute('''
-            UPDATE matches SET board = ?, is_finished = ?, result = ? WHERE id = ?
-        ''', (str(match.board), int(match.is_finished), match.result, match.id))
-        self.conn.commit()
-        
-        # Si c'est un match de Mastermind, mettre à jour les données spécifiques
+        """Met à jour un match: écrit au prochain lot s'il est en cours, tout de suite s'il est terminé."""
+        # Les lignes sont construites ici, dans le thread de l'acteur qui possède le match
+        row = (str(match.board), int(match.is_finished), match.result, match.id)
+        mastermind = None
         if match.game_type == "mastermind" and isinstance(match, MastermindMatch):
-            self.update_mastermind_match(match)
+            mastermind = self._mastermind_update_row(match)
+        if not match.is_finished:
+            with self.pending_lock:
+                self.pending_matches[match.id] = (row, mastermind)
+            return
+        with self.lock:
+            self.flush()  # coups du match d'abord
+            self.cursor.execute("UPDATE matches SET board = ?, is_finished = ?, result = ? WHERE id = ?", row)
+            if mastermind is not None:
+                self.cursor.execute('''
+                    UPDATE mastermind_matches SET
+                        player1_guesses = ?, player2_guesses = ?,
+                        player1_feedback = ?, player2_feedback = ?
+                    WHERE match_id = ?
+                ''', mastermind)
+            self.conn.commit()
 
-    def update_mastermind_match(self, match: MastermindMatch):
-        self.cursor.execute('''
-            UPDATE mastermind_matches SET 
-                player1_guesses = ?, player2_guesses = ?,
-                player1_feedback = ?, player2_feedback = ?
-            WHERE match_id = ?
-        ''', (
+    @staticmethod
+    def read_result(stored):
+        """Résultat lu en base (colonne texte): identifiant du gagnant en entier, ou "draw", "interrupted", None."""
+        return int(stored) if isinstance(stored, str) and stored.isdigit() else stored
+
+    def _mastermind_update_row(self, match: MastermindMatch) -> tuple:
+        return (
             json.dumps(match.player1_guesses),
             json.dumps(match.player2_guesses),
             json.dumps(match.player1_feedback),
             json.dumps(match.player2_feedback),
             match.id
-        ))
-        self.conn.commit()
+        )
+
+    def update_mastermind_match(self, match: MastermindMatch):
+        """Met à jour les tentatives d'un match de Mastermind en cours (écrites au prochain lot)."""
+        self.update_match(match)
 
     def add_turn(self, turn: Turn):
+        """Enregistre un coup; il est écrit au prochain lot (voir flush)."""
         move_data = json.dumps(turn.move) if isinstance(turn.move, list) else str(turn.move)
         feedback_data = json.dumps(turn.feedback) if turn.feedback else None
-        
-        self.cursor.execute('''
-            INSERT INTO turns (match_id, player, move, feedback)
-            VALUES (?, ?, ?, ?)
-        ''', (turn.match_id, turn.player.pseudo, move_data, feedback_data))
-        self.conn.commit()
+        with self.pending_lock:
+            self.pending_turns.append((turn.match_id, turn.player.id, move_data, feedback_data, turn.grade))
+
+    # Une seule requête par match: joueurs et données de Mastermind par jointure
+    MATCH_QUERY = '''
+        SELECT matches.id, matches.board, matches.is_finished, matches.result, matches.game_type,
+               p1.id, p1.pseudo, p1.ip, p1.port, p1.join_date,
+               p2.id, p2.pseudo, p2.ip, p2.port, p2.join_date,
+               mm.player1_code, mm.player2_code, mm.player1_guesses, mm.player2_guesses,
+               mm.player1_feedback, mm.player2_feedback, mm.max_attempts,
+               mm.code_length, mm.colors
+        FROM matches
+        LEFT JOIN players p1 ON p1.id = matches.player1_id
+        LEFT JOIN players p2 ON p2.id = matches.player2_id
+        LEFT JOIN mastermind_matches mm ON mm.match_id = matches.id
+    '''
+    # Nombre maximal de paramètres par requête IN (limite de SQLite)
+    BATCH_SIZE = 500
 
     def get_match(self, match_id: int) -> Match:
         """Récupère un match par son ID."""
-        self.cursor.execute('''
-            SELECT id, player1, player2, board, is_finished, result, game_type
-            FROM matches WHERE id = ?
-        ''', (match_id,))
-        match_data = self.cursor.fetchone()
-        
-        if not match_data:
-            return None
-            
-        player1 = self.get_player(match_data[1])
-        player2 = self.get_player(match_data[2])
-        
-        if match_data[6] == "mastermind":
-            self.cursor.execute('''
-                SELECT player1_code, player2_code, player1_guesses, player2_guesses,
-                       player1_feedback, player2_feedback, max_attempts
-                FROM mastermind_matches WHERE match_id = ?
-            ''', (match_id,))
-            mm_data = self.cursor.fetchone()
-            
-            if mm_data:
-                return MastermindMatch(
-                    id=match_data[0],
-                    player1=player1,
-                    player2=player2,
-                    board=[],
-                    is_finished=bool(match_data[4]),
-                    result=match_data[5],
-                    game_type="mastermind",
-                    player1_code=json.loads(mm_data[0]),
-                    player2_code=json.loads(mm_data[1]),
-                    player1_guesses=json.loads(mm_data[2]),
-                    player2_guesses=json.loads(mm_data[3]),
-                    player1_feedback=json.loads(mm_data[4]),
-                    player2_feedback=json.loads(mm_data[5]),
-                    max_attempts=mm_data[6]
-                )
-        
+        with self.lock:
+            row = self.conn.execute(f"{self.MATCH_QUERY} WHERE matches.id = ?", (match_id,)).fetchone()
+            return self._match_from_row(row) if row else None
+
+    def get_matches(self, match_ids) -> list:
+        """Récupère plusieurs matchs en quelques requêtes, dans l'ordre des IDs demandés (IDs inconnus ignorés)."""
+        match_ids = list(match_ids)
+        found = {}
+        with self.lock:
+            for start in range(0, len(match_ids), self.BATCH_SIZE):
+                batch = match_ids[start:start + self.BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                for row in self.conn.execute(f"{self.MATCH_QUERY} WHERE matches.id IN ({placeholders})", batch):
+                    found[row[0]] = self._match_from_row(row)
+        return [found[match_id] for match_id in match_ids if match_id in found]
+
+    def _match_from_row(self, row) -> Match:
+        """Construit le match (et ses joueurs, via le cache) à partir d'une ligne de MATCH_QUERY."""
+        match_id, board, is_finished, result, game_type = row[:5]
+        player1 = self._player_from_row(row[5:10])
+        player2 = self._player_from_row(row[10:15])
+        result = self.read_result(result)
+        mm_data = row[15:]
+
+        if game_type == "mastermind" and mm_data[0] is not None:
+            return MastermindMatch(
+                id=match_id,
+                player1=player1,
+                player2=player2,
+                board=[],
+                is_finished=bool(is_finished),
+                result=result,
+                game_type="mastermind",
+                player1_code=json.loads(mm_data[0]),
+                player2_code=json.loads(mm_data[1]),
+                player1_guesses=json.loads(mm_data[2]),
+                player2_guesses=json.loads(mm_data[3]),
+                player1_feedback=json.loads(mm_data[4]),
+                player2_feedback=json.loads(mm_data[5]),
+                max_attempts=mm_data[6],
+                code_length=mm_data[7],
+                colors=mm_data[8]
+            )
+
+        if game_type == "puissance4":
+            # Plateau stocké sous forme de bitboards compacts
+            return ConnectFourMatch(
+                id=match_id,
+                player1=player1,
+                player2=player2,
+                board=board,
+                is_finished=bool(is_finished),
+                result=result
+            )
+
+        if board.startswith("["):
+            # Ancien format: liste complète des cases
+            board = eval(board)
         return Match(
-            id=match_data[0],
+            id=match_id,
             player1=player1,
             player2=player2,
-            board=eval(match_data[3]),
-            is_finished=bool(match_data[4]),
-            result=match_data[5],
-            game_type=match_data[6]
+            board=board,
+            is_finished=bool(is_finished),
+            result=result,
+            game_type=game_type
         )
 
-    def get_player(self, pseudo: str) -> Player:
-        """Récupère un joueur par son pseudo."""
-        self.cursor.execute('''
-            SELECT pseudo, ip, port, join_date FROM players WHERE pseudo = ?
-        ''', (pseudo,))
-        player_data = self.cursor.fetchone()
-        
-        if not player_data:
+    def iter_turns(self, match_id: int, after: int = 0, page_size: int = 256):
+        """Parcourt les coups d'un match dans l'ordre: (id, joueur, coup, feedback).
+
+        Les coups sont lus par pages (pagination par id, sur l'index
+        turns(match_id, id)); le verrou est relâché entre deux pages.
+        """
+        self.flush()
+        while True:
+            with self.lock:
+                rows = self.conn.execute('''
+                    SELECT id, player_id, move, feedback FROM turns
+                    WHERE match_id = ? AND id > ? ORDER BY id LIMIT ?
+                ''', (match_id, after, page_size)).fetchall()
+            yield from rows
+            if len(rows) < page_size:
+                return
+            after = rows[-1][0]
+
+    def get_unarchived_match_ids(self, limit: int) -> list:
+        """Identifiants des plus anciens matchs terminés pas encore archivés."""
+        with self.lock:
+            rows = self.conn.execute('''
+                SELECT id FROM matches WHERE is_finished = 1 AND archived = 0 ORDER BY id LIMIT ?
+            ''', (limit,)).fetchall()
+            return [row[0] for row in rows]
+
+    def get_turn_rows(self, match_ids) -> list:
+        """Coups de plusieurs matchs, par match puis dans l'ordre: (match, id, joueur, coup, feedback, note)."""
+        match_ids = list(match_ids)
+        rows = []
+        self.flush()
+        with self.lock:
+            for start in range(0, len(match_ids), self.BATCH_SIZE):
+                batch = match_ids[start:start + self.BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                rows.extend(self.conn.execute(f'''
+                    SELECT match_id, id, player_id, move, feedback, grade FROM turns
+                    WHERE match_id IN ({placeholders}) ORDER BY match_id, id
+                ''', batch))
+        return rows
+
+    def mark_archived(self, match_ids, state: int = 1, prune: bool = False):
+        """Note l'état d'archivage de matchs et, avec prune, supprime leurs coups de la table turns."""
+        match_ids = list(match_ids)
+        if not match_ids:
+            return
+        with self.lock:
+            for start in range(0, len(match_ids), self.BATCH_SIZE):
+                batch = match_ids[start:start + self.BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                self.cursor.execute(f"UPDATE matches SET archived = ? WHERE id IN ({placeholders})", (state, *batch))
+                if prune:
+                    self.cursor.execute(f"DELETE FROM turns WHERE match_id IN ({placeholders})", batch)
+            self.conn.commit()
+
+    def get_finished_matches(self) -> list:
+        """Récupère (jeu, joueur 1, joueur 2, résultat) des matchs terminés, dans l'ordre.
+
+        Les joueurs sont des identifiants; le résultat est l'identifiant du
+        gagnant, "draw" ou "interrupted".
+        """
+        with self.lock:
+            rows = self.conn.execute('''
+                SELECT game_type, player1_id, player2_id, result FROM matches
+                WHERE is_finished = 1 ORDER BY id
+            ''').fetchall()
+        return [(game_type, player1, player2, self.read_result(result)) for game_type, player1, player2, result in rows]
+
+    def get_player(self, player_id: int) -> Player:
+        """Récupère un joueur par son identifiant."""
+        with self.lock:
+            player = self.players.get(player_id)
+            if player is not None:
+                self.players.move_to_end(player_id)
+                return player
+            self.cursor.execute('''
+                SELECT id, pseudo, ip, port, join_date FROM players WHERE id = ?
+            ''', (player_id,))
+            player_data = self.cursor.fetchone()
+            return self._player_from_row(player_data) if player_data else None
+
+    def _player_from_row(self, player_data) -> Player:
+        """Retourne le joueur du cache ou le construit à partir de (id, pseudo, ip, port, join_date)."""
+        player_id = player_data[0]
+        if player_id is None:
             return None
-            
-        return Player(
-            pseudo=player_data[0],
-            ip=player_data[1],
-            port=player_data[2],
-            join_date=datetime.fromisoformat(player_data[3])
+        player = self.players.get(player_id)
+        if player is not None:
+            self.players.move_to_end(player_id)
+            return player
+        player = Player(
+            id=player_id,
+            pseudo=player_data[1],
+            ip=player_data[2],
+            port=player_data[3],
+            join_date=int(datetime.fromisoformat(player_data[4]).timestamp()) if player_data[4] else 0
         )
+        self.players[player_id] = player
+        if len(self.players) > self.PLAYER_CACHE_SIZE:
+            self.players.popitem(last=False)
+        return player
+
+    def get_player_stats(self, player_id: int) -> dict:
+        """Statistiques cumulées d'un joueur: game_type -> (parties, victoires, défaites, nuls, tentatives)."""
+        with self.lock:
+            rows = self.conn.execute('''
+                SELECT game_type, games, wins, losses, draws, attempts
+                FROM player_stats WHERE player_id = ?
+            ''', (player_id,)).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def get_ranked_players(self) -> list:
+        """(joueur, pseudo, jeu, victoires) de chaque joueur ayant terminé un match."""
+        with self.lock:
+            return self.conn.execute('''
+                SELECT player_stats.player_id, players.pseudo, player_stats.game_type, player_stats.wins
+                FROM player_stats JOIN players ON players.id = player_stats.player_id
+            ''').fetchall()
+
+    def add_player_stats(self, rows):
+        """Ajoute les résultats d'un match aux statistiques: (joueur, jeu, victoire, défaite, nul, tentatives)."""
+        with self.lock:
+            self.cursor.executemany('''
+                INSERT INTO player_stats (player_id, game_type, games, wins, losses, draws, attempts)
+                VALUES (?, ?, 1, ?, ?, ?, ?)
+                ON CONFLICT (player_id, game_type) DO UPDATE SET
+                    games = games + 1,
+                    wins = wins + excluded.wins,
+                    losses = losses + excluded.losses,
+                    draws = draws + excluded.draws,
+                    attempts = attempts + excluded.attempts
+            ''', rows)
+            self.conn.commit()
 
     def close(self):
-        self.conn.close()
+        self.stopped.set()
+        with self.lock:
+            self.flush()
+            self.conn.close()
 
 print("Database mis à jour avec succès!")
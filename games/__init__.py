@@ -0,0 +1,4 @@
+from games.base import GAMES, GamePlugin, register_game
+
+# L'import des modules de jeu les enregistre dans GAMES
+from games import morpion, mastermind, puissance4
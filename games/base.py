@@ -0,0 +1,233 @@
+import threading
+import time
+from matchmaking import RatedQueue, Matchmaker
+from clocks import MatchClock
+
+# Registre des jeux: game_type -> classe du plugin
+GAMES = {}
+
+def register_game(plugin_class):
+    """Enregistre un plugin de jeu auprès du serveur."""
+    GAMES[plugin_class.name] = plugin_class
+    return plugin_class
+
+class GamePlugin:
+    """Description d'un jeu pris en charge par le serveur.
+
+    Un plugin déclare la logique de jeu, le modèle de match, la file
+    d'attente et les actions du protocole qu'il traite. Le serveur crée une
+    instance par jeu enregistré, avec son propre ordonnanceur de matchmaking
+    et une file d'attente par variante du jeu.
+    """
+    name = None            # game_type stocké dans les matchs
+    label = None           # nom affiché dans le monitoring
+    engine = None          # classe de la logique de jeu
+    match_model = None     # classe du match (models.Match ou sous-classe)
+    queue_class = RatedQueue
+    join_action = None     # action pour rejoindre la file d'attente
+    leave_action = None    # action pour quitter la file d'attente
+    match_actions = {}     # action -> nom de la méthode exécutée par l'acteur du match
+    variants = (None,)     # variantes jouables, chacune avec sa file d'attente
+    turn_event = "MOVE"    # nom des coups dans le journal des matchs
+    turn_time = None       # secondes pour jouer un coup (None: pas de limite)
+    game_time = None       # secondes de jeu de chaque joueur pour tout le match (None: pas de limite)
+
+    def __init__(self, server, ratings):
+        self.server = server
+        self.ratings = ratings
+        self.queues = {variant: self.queue_class(ratings.get) for variant in self.variants}
+        self.join_data = {}  # identifiant du joueur -> données fournies au JOIN
+        self.lock = threading.Lock()  # protège les files et join_data
+        self.matchmaker = Matchmaker(lambda: server.matchmaking_tick(self))
+
+    def read_variant(self, message):
+        """Extrait d'un JOIN la variante demandée (variante unique par défaut); ValueError si elle n'est pas jouable."""
+        return self.variants[0]
+
+    def read_join_data(self, message):
+        """Extrait d'un JOIN les données propres au jeu (aucune par défaut)."""
+        return None
+
+    def waiting_count(self) -> int:
+        """Nombre de joueurs en attente, toutes variantes confondues."""
+        return sum(len(queue) for queue in self.queues.values())
+
+    def remove_waiting(self, player_id):
+        """Retire un joueur de la file où il attend et retourne son entrée, ou None."""
+        self.join_data.pop(player_id, None)
+        for queue in self.queues.values():
+            entry = queue.remove(player_id)
+            if entry is not None:
+                return entry
+        return None
+
+    def tournament_join_data(self, variant):
+        """Données de JOIN d'un joueur de tournoi, fournies par le serveur à chaque match (aucune par défaut)."""
+        return None
+
+    def create_match(self, variant, player1, player2, data1, data2):
+        """Crée le match et la logique de jeu pour deux joueurs appariés."""
+        raise NotImplementedError
+
+    def start_messages(self, match):
+        """Construit les messages de début de partie des deux joueurs."""
+        raise NotImplementedError
+
+    def describe(self, match, game) -> str:
+        """Texte affiché pour un match en cours dans le monitoring."""
+        return f"Match {match.id}: {match.player1.pseudo} vs {match.player2.pseudo}"
+
+    def attempts(self, match):
+        """Nombre de tentatives de chaque joueur, pour les statistiques (aucune par défaut)."""
+        return (0, 0)
+
+    def replay_info(self, match) -> dict:
+        """Données d'une relecture utiles à l'affichage (variante...), aucune par défaut."""
+        return {}
+
+    def replay_game(self, match):
+        """Plateau vide sur lequel rejouer les coups d'un match."""
+        return None
+
+    def replay_turn(self, game, match, turn):
+        """Applique un coup enregistré au plateau de relecture."""
+
+    def end_message(self, match, result) -> dict:
+        """Message de fin de match envoyé aux deux joueurs."""
+        raise NotImplementedError
+
+    @staticmethod
+    def result_label(match, result):
+        """Résultat annoncé aux clients: pseudo du gagnant (identifiant en mémoire), "draw" ou "interrupted"."""
+        for player in (match.player1, match.player2):
+            if result == player.id:
+                return player.pseudo
+        return result
+
+    def players_to_move(self, actor):
+        """Identifiants des joueurs qui doivent jouer, dont la pendule tourne (aucun par défaut)."""
+        return ()
+
+    def spectate_info(self, actor) -> dict:
+        """État du match envoyé à un nouveau spectateur (variante, coups déjà joués...)."""
+        return {}
+
+    def resync_info(self, actor, player_id) -> dict:
+        """État du match renvoyé à un joueur qui reprend le match (celui des spectateurs par défaut)."""
+        return self.spectate_info(actor)
+
+    def resync_message(self, actor, player_id) -> dict:
+        """Début de partie complété de l'état du match, pour un joueur dont les messages manqués sont perdus."""
+        match = actor.match
+        start = self.start_messages(match)[0 if player_id == match.player1.id else 1]
+        your_turn = player_id in self.players_to_move(actor)
+        clock = self.clock_info(actor, player_id) if your_turn else {}
+        return {**start, **self.resync_info(actor, player_id), **self.clock_settings(actor), **clock,
+                "resync": True, "your_turn": your_turn}
+
+    def clocked(self, variant) -> bool:
+        """Vrai si les matchs de la variante se jouent à la pendule (jamais par défaut)."""
+        return False
+
+    def clock_settings(self, actor) -> dict:
+        """Limites de temps annoncées au début du match (rien sans pendule)."""
+        if actor.state.get("clock") is None:
+            return {}
+        return {"turn_time": self.turn_time, "game_time": self.game_time}
+
+    def start_clocks(self, actor, variant):
+        """Met en route les pendules d'un match qui commence (ou reconstruit: elles repartent de zéro)."""
+        if not self.clocked(variant) or (self.turn_time is None and self.game_time is None):
+            return
+        match = actor.match
+        actor.state["clock"] = MatchClock(self.turn_time, self.game_time, (match.player1.id, match.player2.id))
+        self.update_clocks(actor)
+
+    def update_clocks(self, actor, player_id=None):
+        """Arrête la pendule du joueur qui vient de jouer et met en route celles des joueurs qui doivent jouer."""
+        clock = actor.state.get("clock")
+        if clock is None:
+            return
+        now = time.monotonic()
+        timers = self.server.timers
+        if player_id is not None:
+            clock.stop(player_id, now)
+            timers.cancel(clock.timers.pop(player_id, None))
+        if clock.paused:
+            return
+        for waiting_id in self.players_to_move(actor):
+            if waiting_id not in clock.started:
+                clock.start(waiting_id, now)
+                clock.timers[waiting_id] = timers.schedule(
+                    clock.time_left(waiting_id, now), actor.post, self.clock_expired, waiting_id)
+
+    def pause_clocks(self, actor, player_id):
+        """Arrête les pendules d'un match dont un joueur est suspendu: la coupure n'est décomptée à personne."""
+        clock = actor.state.get("clock")
+        if clock is None:
+            return
+        clock.paused.add(player_id)
+        now = time.monotonic()
+        for running_id in list(clock.started):
+            clock.stop(running_id, now)
+            self.server.timers.cancel(clock.timers.pop(running_id, None))
+
+    def resume_clocks(self, actor, player_id):
+        """Remet en route les pendules quand plus aucun joueur du match n'est suspendu."""
+        clock = actor.state.get("clock")
+        if clock is None:
+            return
+        clock.paused.discard(player_id)
+        self.update_clocks(actor)
+
+    def stop_clocks(self, actor):
+        """Annule les minuteurs des pendules d'un match terminé."""
+        clock = actor.state.get("clock")
+        if clock is None:
+            return
+        for timer in clock.timers.values():
+            self.server.timers.cancel(timer)
+        clock.timers.clear()
+
+    def clock_info(self, actor, player_id) -> dict:
+        """Temps restant d'un joueur pour son coup, ajouté aux messages de coup (rien sans pendule)."""
+        clock = actor.state.get("clock")
+        if clock is None:
+            return {}
+        return {"time_left": clock.time_left(player_id, time.monotonic())}
+
+    def clock_expired(self, actor, player_id):
+        """Fait perdre par forfait le joueur dont la pendule est tombée."""
+        clock = actor.state.get("clock")
+        match = actor.match
+        if match.is_finished or clock is None or player_id not in clock.started:
+            return
+        if clock.time_left(player_id, time.monotonic()) > 0:
+            return  # coup joué entre-temps: minuteur d'un coup précédent
+        winner = match.player2 if player_id == match.player1.id else match.player1
+        print(f"Temps écoulé pour le joueur {player_id} dans le match {match.id}")
+        self.end_match(actor, winner.id, {**self.end_message(match, winner.id), "reason": "timeout"})
+
+    def save_turn(self, match, turn):
+        """Enregistre un coup en base et dans le journal des matchs en cours."""
+        self.server.db.add_turn(turn)
+        self.server.journal.append(self.turn_event, match.id, player=turn.player.id, move=turn.move, feedback=turn.feedback)
+
+    def restore_turn(self, actor, player_id, move, feedback):
+        """Rejoue un coup du journal sur un match reconstruit au démarrage."""
+        raise NotImplementedError
+
+    def end_match(self, actor, result, end_message):
+        """Termine le match d'un acteur et envoie le message de fin aux deux joueurs."""
+        match = actor.match
+        match.is_finished = True
+        match.result = result
+        self.stop_clocks(actor)
+        self.server.db.update_match(match)
+        # Classements et statistiques à jour avant le END: le client peut les redemander aussitôt
+        self.server.record_result(match)
+        self.server.send_to(match.player1.id, end_message, actor)
+        self.server.send_to(match.player2.id, end_message, actor)
+        self.server.spectators.publish(match.id, end_message)
+        print(f"Sent end message to {match.player1.pseudo} and {match.player2.pseudo}")
+        self.server.finish_match(match)
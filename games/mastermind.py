@@ -0,0 +1,247 @@
+import secrets
+from models import MastermindMatch, Mastermind, Turn
+from hints import CandidateTracker
+from games.base import GamePlugin, register_game
+
+@register_game
+class MastermindPlugin(GamePlugin):
+    """Mastermind en 1v1: chaque joueur devine le code secret de l'autre."""
+    name = "mastermind"
+    label = "Mastermind"
+    engine = Mastermind
+    match_model = MastermindMatch
+    join_action = "JOIN_MASTERMIND"
+    leave_action = "LEAVE_MASTERMIND"
+    match_actions = {"MASTERMIND_GUESS": "play_guess", "MASTERMIND_HINT": "give_hint"}
+    turn_event = "GUESS"
+    # (nombre de pions, nombre de couleurs, pendule): sans pendule par défaut, sur option au JOIN
+    variants = tuple((code_length, colors, clock) for code_length, colors in ((4, 6), (5, 8), (6, 10)) for clock in (False, True))
+    turn_time = 120  # secondes par tentative
+    game_time = 900  # secondes de jeu par joueur
+
+    def read_variant(self, message):
+        """Le nombre de pions et de couleurs et la pendule (option clock) sont demandés avec JOIN_MASTERMIND."""
+        code_length, colors = message.get("code_length", 4), message.get("colors", 6)
+        variant = (code_length, colors, bool(message.get("clock", False)))
+        if type(code_length) is not int or type(colors) is not int or variant not in self.variants:
+            raise ValueError("Variante inconnue.")
+        return variant
+
+    def clocked(self, variant):
+        # Variante d'un journal antérieur aux pendules sur option: sans pendule
+        return len(variant) == 3 and variant[2]
+
+    def read_join_data(self, message):
+        """Le code secret du joueur (entier compact) est envoyé avec JOIN_MASTERMIND."""
+        code = message.get("code")
+        if not self.engine(*self.read_variant(message)[:2]).is_valid(code):
+            raise ValueError("Code secret invalide pour cette variante.")
+        return code
+
+    def tournament_join_data(self, variant):
+        """Au tournoi, le code secret de chaque joueur est tiré au hasard pour chaque match."""
+        code_length, colors = variant[:2]
+        return secrets.randbelow(colors ** code_length)
+
+    def create_match(self, variant, player1, player2, data1, data2):
+        game = self.engine(*variant[:2])
+        match = self.match_model(
+            id=0,
+            player1=player1,
+            player2=player2,
+            board=[],
+            is_finished=False,
+            result=None,
+            player1_code=data1,
+            player2_code=data2,
+            max_attempts=game.max_attempts,
+            code_length=game.code_length,
+            colors=game.colors
+        )
+        return match, game
+
+    def start_messages(self, match):
+        variant = {"code_length": match.code_length, "colors": match.colors, "max_attempts": match.max_attempts}
+        return (
+            {"action": "MASTERMIND_START", "opponent": match.player2.pseudo, "match_id": match.id, **variant},
+            {"action": "MASTERMIND_START", "opponent": match.player1.pseudo, "match_id": match.id, **variant},
+        )
+
+    def end_message(self, match, result):
+        return {
+            "action": "MASTERMIND_END",
+            "result": self.result_label(match, result),
+            "player1_code": match.player1_code,
+            "player2_code": match.player2_code
+        }
+
+    def players_to_move(self, actor):
+        # Les deux joueurs devinent en même temps, jusqu'à épuiser leurs tentatives
+        match = actor.match
+        attempts = ((match.player1, match.player1_guesses), (match.player2, match.player2_guesses))
+        return tuple(player.id for player, guesses in attempts if len(guesses) < match.max_attempts)
+
+    def spectate_info(self, actor):
+        # Les codes secrets ne sont révélés qu'à la fin (MASTERMIND_END)
+        match = actor.match
+        return {
+            "code_length": match.code_length,
+            "colors": match.colors,
+            "max_attempts": match.max_attempts,
+            "player1_guesses": list(zip(match.player1_guesses, match.player1_feedback)),
+            "player2_guesses": list(zip(match.player2_guesses, match.player2_feedback))
+        }
+
+    def resync_info(self, actor, player_id):
+        # Tentatives du joueur et de son adversaire, avec leurs indications
+        match = actor.match
+        attempts = [list(zip(match.player1_guesses, match.player1_feedback)),
+                    list(zip(match.player2_guesses, match.player2_feedback))]
+        if player_id == match.player2.id:
+            attempts.reverse()
+        return {"guesses": attempts[0], "opponent_guesses": attempts[1]}
+
+    def describe(self, match, game):
+        p1_guesses = len(match.player1_guesses)
+        p2_guesses = len(match.player2_guesses)
+        label_text = f"{super().describe(match, game)}\n"
+        label_text += f"Variante: {match.code_length} pions, {match.colors} couleurs\n"
+        label_text += f"Tentatives: {match.player1.pseudo}: {p1_guesses}, {match.player2.pseudo}: {p2_guesses}\n"
+        label_text += f"Statut: {'Terminé' if match.is_finished else 'En cours'}"
+        return label_text
+
+    def attempts(self, match):
+        return (len(match.player1_guesses), len(match.player2_guesses))
+
+    def replay_info(self, match):
+        return {
+            "code_length": match.code_length,
+            "colors": match.colors,
+            "player1_code": match.player1_code,
+            "player2_code": match.player2_code
+        }
+
+    def replay_game(self, match):
+        # Tentatives et feedbacks de chaque joueur, dans l'ordre
+        return {match.player1.id: [], match.player2.id: []}
+
+    def replay_turn(self, game, match, turn):
+        game[turn.player.id].append((turn.move, tuple(turn.feedback or ())))
+
+    def candidates(self, actor, player_id: int):
+        """Ensemble des codes encore possibles pour un joueur, ou None si la variante est trop grande."""
+        trackers = actor.state.setdefault("candidates", {})
+        if player_id not in trackers:
+            tracker = CandidateTracker(actor.game) if CandidateTracker.supports(actor.game) else None
+            if tracker is not None:
+                # Tentatives déjà jouées (match reconstruit à partir du journal)
+                match = actor.match
+                is_player1 = (player_id == match.player1.id)
+                guesses = match.player1_guesses if is_player1 else match.player2_guesses
+                feedbacks = match.player1_feedback if is_player1 else match.player2_feedback
+                for guess, feedback in zip(guesses, feedbacks):
+                    tracker.update(guess, tuple(feedback))
+            trackers[player_id] = tracker
+        return trackers[player_id]
+
+    def restore_turn(self, actor, player_id, move, feedback):
+        match = actor.match
+        if player_id == match.player1.id:
+            match.player1_guesses.append(move)
+            match.player1_feedback.append(tuple(feedback))
+        else:
+            match.player2_guesses.append(move)
+            match.player2_feedback.append(tuple(feedback))
+
+    def play_guess(self, actor, player_id: int, message: dict):
+        """Gère une tentative de devinette au Mastermind."""
+        match, game = actor.match, actor.game
+        guess = message["guess"]
+        # Déterminer si c'est le joueur 1 ou 2
+        is_player1 = (player_id == match.player1.id)
+        player = match.player1 if is_player1 else match.player2
+        opponent = match.player2 if is_player1 else match.player1
+
+        if not game.is_valid(guess):
+            print(f"Invalid guess by {player.pseudo}: {guess}")
+            return
+        if player_id not in self.players_to_move(actor):
+            print(f"No attempts left for {player.pseudo}")
+            return
+
+        # Récupérer le code à deviner (code de l'adversaire)
+        code_to_guess = match.player2_code if is_player1 else match.player1_code
+
+        # Vérifier la tentative
+        black_pins, white_pins = game.check_guess(code_to_guess, guess)
+        feedback = (black_pins, white_pins)
+
+        # Filtrer les codes encore possibles pour l'aide (MASTERMIND_HINT)
+        tracker = self.candidates(actor, player_id)
+        if tracker is not None:
+            tracker.update(guess, feedback)
+
+        # Enregistrer la tentative et le feedback
+        if is_player1:
+            match.player1_guesses.append(guess)
+            match.player1_feedback.append(feedback)
+        else:
+            match.player2_guesses.append(guess)
+            match.player2_feedback.append(feedback)
+
+        # Enregistrer le tour dans la base de données
+        turn = Turn(match.id, player, guess, feedback)
+        self.save_turn(match, turn)
+        self.server.db.update_mastermind_match(match)
+        self.update_clocks(actor, player_id)
+
+        # Envoyer le feedback au joueur
+        self.server.send_to(player_id, {
+            "action": "MASTERMIND_FEEDBACK",
+            "black_pins": black_pins,
+            "white_pins": white_pins,
+            "guess_number": len(match.player1_guesses) if is_player1 else len(match.player2_guesses),
+            **self.clock_info(actor, player_id)
+        }, actor)
+
+        # Informer l'adversaire et les spectateurs de la tentative
+        opponent_guess = {
+            "action": "MASTERMIND_OPPONENT_GUESS",
+            "guess": guess,
+            "black_pins": black_pins,
+            "white_pins": white_pins,
+            "guess_number": len(match.player1_guesses) if is_player1 else len(match.player2_guesses)
+        }
+        self.server.send_to(opponent.id, opponent_guess, actor)
+        self.server.spectators.publish(match.id, {**opponent_guess, "player": player.pseudo})
+
+        # Vérifier si le joueur a trouvé le code
+        has_won = (black_pins == game.code_length)
+
+        # Vérifier si le match est terminé
+        match_ended = False
+        result = None
+
+        if has_won:
+            # Le joueur a trouvé le code
+            match_ended = True
+            result = player.id
+        elif len(match.player1_guesses) >= match.max_attempts and len(match.player2_guesses) >= match.max_attempts:
+            # Les deux joueurs ont atteint le max de tentatives
+            match_ended = True
+            result = "draw"
+
+        if match_ended:
+            self.end_match(actor, result, self.end_message(match, result))
+
+    def give_hint(self, actor, player_id: int, message: dict):
+        """Indique au joueur combien de codes restent possibles et, sur demande, lequel tenter."""
+        tracker = self.candidates(actor, player_id)
+        if tracker is None:
+            self.server.send_to(player_id, {"action": "MASTERMIND_HINT", "remaining": None, "suggestion": None}, actor)
+            return
+        self.server.send_to(player_id, {
+            "action": "MASTERMIND_HINT",
+            "remaining": tracker.remaining,
+            "suggestion": tracker.suggest() if message.get("suggest") else None
+        }, actor)
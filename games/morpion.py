@@ -0,0 +1,124 @@
+from models import Match, Turn, TicTacToe
+from tablebase import TABLEBASE
+from games.base import GamePlugin, register_game
+
+@register_game
+class MorpionPlugin(GamePlugin):
+    """Morpion (Tic-Tac-Toe) en 1v1, en 3×3 classique ou en variantes Gomoku."""
+    name = "morpion"
+    label = "Morpion"
+    engine = TicTacToe
+    match_model = Match
+    join_action = "JOIN"
+    leave_action = "LEAVE"
+    match_actions = {"MOVE": "play_move", "HINT": "give_hint"}
+    # (taille du plateau, pions à aligner, pendule): sans pendule par défaut, sur option au JOIN
+    variants = tuple((size, win_length, clock) for size, win_length in ((3, 3), (15, 5), (19, 5)) for clock in (False, True))
+    turn_time = 60   # secondes par coup
+    game_time = 600  # secondes de jeu par joueur
+
+    def read_variant(self, message):
+        """La taille du plateau, le nombre de pions à aligner et la pendule (option clock) sont demandés au JOIN."""
+        size, win_length = message.get("size", 3), message.get("win_length", 3)
+        variant = (size, win_length, bool(message.get("clock", False)))
+        if type(size) is not int or type(win_length) is not int or variant not in self.variants:
+            raise ValueError("Variante inconnue.")
+        return variant
+
+    def clocked(self, variant):
+        # Variante d'un journal antérieur aux pendules sur option: sans pendule
+        return len(variant) == 3 and variant[2]
+
+    def create_match(self, variant, player1, player2, data1, data2):
+        game = self.engine(*variant[:2])
+        match = self.match_model(id=0, player1=player1, player2=player2, board=game, is_finished=False, result=None, game_type=self.name)
+        return match, game
+
+    def start_messages(self, match):
+        size = {"size": match.board.size, "win_length": match.board.win_length}
+        return (
+            {"action": "START", "opponent": match.player2.pseudo, "match_id": match.id, "symbol": "X", **size},
+            {"action": "START", "opponent": match.player1.pseudo, "match_id": match.id, "symbol": "O", **size},
+        )
+
+    def end_message(self, match, result):
+        return {"action": "END", "result": self.result_label(match, result)}
+
+    def players_to_move(self, actor):
+        # X commence: c'est à lui de jouer quand les deux joueurs ont posé autant de pions
+        match = actor.match
+        return (match.player1.id if len(actor.game.cells) % 2 == 0 else match.player2.id,)
+
+    def spectate_info(self, actor):
+        game = actor.game
+        return {"size": game.size, "win_length": game.win_length, "moves": list(game.cells.items())}
+
+    def describe(self, match, game):
+        board_str = "\n".join("|" + "".join(line) + "|" for line in game.grid())
+        return f"{super().describe(match, game)}\nPlateau:\n{board_str}\nStatut: {'Terminé' if match.is_finished else 'En cours'}"
+
+    def replay_info(self, match):
+        game = self.replay_game(match)
+        return {"size": game.size, "win_length": game.win_length}
+
+    def replay_game(self, match):
+        # Ancien format (liste de cases): Morpion 3×3
+        if isinstance(match.board, str) and "x" in match.board.partition(":")[0]:
+            size, win_length = (int(value) for value in match.board.partition(":")[0].split("x"))
+            return self.engine(size, win_length)
+        return self.engine()
+
+    def replay_turn(self, game, match, turn):
+        game.play_move(turn.move, "X" if turn.player is match.player1 else "O")
+
+    def restore_turn(self, actor, player_id, move, feedback):
+        actor.game.play_move(move, "X" if player_id == actor.match.player1.id else "O")
+
+    def play_move(self, actor, player_id: int, message: dict):
+        """Gère un coup joué par un joueur au Morpion."""
+        match, game = actor.match, actor.game
+        position = message["position"]
+
+        player = match.player1 if player_id == match.player1.id else match.player2
+        opponent = match.player2 if player_id == match.player1.id else match.player1
+        symbol = "X" if player_id == match.player1.id else "O"
+
+        print(f"Processing move: {player.pseudo} plays {symbol} at position {position}")
+        if player_id not in self.players_to_move(actor):
+            print(f"Not {player.pseudo}'s turn")
+            return
+        # Noter le coup avec la table de finales (3×3 classique uniquement)
+        classic = (game.size, game.win_length) == (3, 3)
+        grade = TABLEBASE.grade(game.cells, position, symbol) if classic and position in range(9) else None
+        if not game.play_move(position, symbol):
+            print(f"Invalid move by {player.pseudo} at position {position}")
+            return
+
+        turn = Turn(match.id, player, position, grade=grade)
+        self.save_turn(match, turn)
+        self.server.db.update_match(match)
+        self.update_clocks(actor, player_id)
+
+        self.server.send_to(opponent.id, {
+            "action": "MOVE",
+            "position": position,
+            "symbol": symbol,
+            **self.clock_info(actor, opponent.id)
+        }, actor)
+        self.server.spectators.publish(match.id, {"action": "MOVE", "position": position, "symbol": symbol})
+
+        result = game.check_winner()
+        if result:
+            if result == "X":
+                result = match.player1.id
+            elif result == "O":
+                result = match.player2.id
+            self.end_match(actor, result, self.end_message(match, result))
+
+    def give_hint(self, actor, player_id: int, message: dict):
+        """Donne le meilleur coup et l'issue attendue, lus dans la table de finales (3×3 uniquement)."""
+        game = actor.game
+        position, outcome = None, None
+        if (game.size, game.win_length) == (3, 3):
+            position, outcome = TABLEBASE.best_move(game.cells)
+        self.server.send_to(player_id, {"action": "HINT", "position": position, "outcome": outcome}, actor)
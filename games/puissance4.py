@@ -0,0 +1,82 @@
+from models import ConnectFourMatch, ConnectFour, Turn
+from games.base import GamePlugin, register_game
+
+@register_game
+class Puissance4Plugin(GamePlugin):
+    """Puissance 4 en 1v1 sur un plateau de 7 colonnes et 6 lignes."""
+    name = "puissance4"
+    label = "Puissance 4"
+    engine = ConnectFour
+    match_model = ConnectFourMatch
+    join_action = "JOIN_PUISSANCE4"
+    leave_action = "LEAVE_PUISSANCE4"
+    match_actions = {"PUISSANCE4_MOVE": "play_move"}
+
+    def create_match(self, variant, player1, player2, data1, data2):
+        game = self.engine()
+        match = self.match_model(id=0, player1=player1, player2=player2, board=game, is_finished=False, result=None)
+        return match, game
+
+    def start_messages(self, match):
+        return (
+            {"action": "PUISSANCE4_START", "opponent": match.player2.pseudo, "match_id": match.id, "symbol": "X"},
+            {"action": "PUISSANCE4_START", "opponent": match.player1.pseudo, "match_id": match.id, "symbol": "O"},
+        )
+
+    def end_message(self, match, result):
+        return {"action": "PUISSANCE4_END", "result": self.result_label(match, result)}
+
+    def players_to_move(self, actor):
+        # X commence: c'est à lui de jouer quand les deux joueurs ont posé autant de pions
+        match = actor.match
+        return (match.player1.id if actor.game.moves % 2 == 0 else match.player2.id,)
+
+    def spectate_info(self, actor):
+        return {"board": actor.game.grid()}
+
+    def describe(self, match, game):
+        board_str = "\n".join("|" + "".join(line) + "|" for line in game.grid())
+        return f"{super().describe(match, game)}\nPlateau:\n{board_str}\nStatut: {'Terminé' if match.is_finished else 'En cours'}"
+
+    def replay_game(self, match):
+        return self.engine()
+
+    def replay_turn(self, game, match, turn):
+        game.play_move(turn.move, "X" if turn.player is match.player1 else "O")
+
+    def restore_turn(self, actor, player_id, move, feedback):
+        actor.game.play_move(move, "X" if player_id == actor.match.player1.id else "O")
+
+    def play_move(self, actor, player_id: int, message: dict):
+        """Gère un pion joué par un joueur au Puissance 4."""
+        match, game = actor.match, actor.game
+        column = message["column"]
+
+        player = match.player1 if player_id == match.player1.id else match.player2
+        opponent = match.player2 if player_id == match.player1.id else match.player1
+        symbol = "X" if player_id == match.player1.id else "O"
+
+        row = game.play_move(column, symbol)
+        if row is None:
+            print(f"Invalid move by {player.pseudo} in column {column}")
+            return
+
+        turn = Turn(match.id, player, column)
+        self.save_turn(match, turn)
+        self.server.db.update_match(match)
+
+        self.server.send_to(opponent.id, {
+            "action": "PUISSANCE4_MOVE",
+            "column": column,
+            "row": row,
+            "symbol": symbol
+        }, actor)
+        self.server.spectators.publish(match.id, {"action": "PUISSANCE4_MOVE", "column": column, "row": row, "symbol": symbol})
+
+        result = game.check_winner()
+        if result:
+            if result == "X":
+                result = match.player1.id
+            elif result == "O":
+                result = match.player2.id
+            self.end_match(actor, result, self.end_message(match, result))
@@ -0,0 +1,91 @@
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: le filtrage se fait alors en Python pur
+    np = None
+
+class CandidateTracker:
+    """Codes secrets encore compatibles avec les tentatives d'un joueur au Mastermind.
+
+    L'ensemble est un masque d'un octet par code possible (un tableau NumPy
+    de booléens, ou un bytearray sans NumPy). Chaque feedback le filtre en
+    une seule passe vectorisée qui ne re-score que les codes encore en jeu.
+    """
+    # Au-delà, le masque et la première passe coûtent trop cher (6 pions / 10 couleurs)
+    MAX_CODES = 40000
+    # Au-delà, la suggestion est le premier code restant plutôt qu'un minimax
+    MINIMAX_LIMIT = 256 if np is not None else 32
+    _tables = {}  # (pions, couleurs) -> (pions de chaque code, histogramme de ses couleurs)
+
+    def __init__(self, game):
+        self.game = game
+        size = game.colors ** game.code_length
+        if np is not None:
+            self.mask = np.ones(size, dtype=bool)
+            self.digits, self.counts = self._tables.get((game.code_length, game.colors)) or self._build_tables(game)
+        else:
+            self.mask = bytearray(b"\x01") * size
+        self.remaining = size
+
+    @classmethod
+    def _build_tables(cls, game):
+        """Décompacte une fois pour toutes les codes d'une variante (partagé entre les matchs)."""
+        digits = game.unpack_many(np.arange(game.colors ** game.code_length))
+        counts = (digits[:, :, None] == np.arange(game.colors)).sum(axis=1)
+        cls._tables[(game.code_length, game.colors)] = (digits, counts)
+        return digits, counts
+
+    @classmethod
+    def supports(cls, game) -> bool:
+        """Vrai si la variante est assez petite pour suivre ses candidats."""
+        return game.colors ** game.code_length <= cls.MAX_CODES
+
+    def candidates(self):
+        """Codes encore possibles, dans l'ordre croissant."""
+        if np is not None:
+            return np.flatnonzero(self.mask)
+        return [code for code, alive in enumerate(self.mask) if alive]
+
+    def score(self, guess: int, codes):
+        """Score une tentative contre des codes de la variante, à partir des tables précalculées."""
+        guess_digits = self.digits[guess]
+        blacks = (self.digits[codes] == guess_digits).sum(axis=1)
+        whites = np.minimum(self.counts[codes], self.counts[guess]).sum(axis=1) - blacks
+        return blacks, whites
+
+    def update(self, guess: int, feedback):
+        """Élimine les codes qui n'auraient pas donné ce feedback à cette tentative."""
+        black_pins, white_pins = feedback
+        codes = self.candidates()
+        if np is not None:
+            blacks, whites = self.score(guess, codes)
+            rejected = codes[(blacks != black_pins) | (whites != white_pins)]
+            self.mask[rejected] = False
+            self.remaining -= len(rejected)
+            return
+        blacks, whites = self.game.score_many(guess, codes)
+        for code, black, white in zip(codes, blacks, whites):
+            if black != black_pins or white != white_pins:
+                self.mask[code] = 0
+                self.remaining -= 1
+
+    def suggest(self):
+        """Tentative conseillée: le code restant dont le pire feedback laisse le moins de candidats."""
+        codes = self.candidates()
+        if len(codes) == 0:
+            return None
+        if len(codes) == 1 or len(codes) > self.MINIMAX_LIMIT:
+            return int(codes[0])
+        buckets = self.game.code_length + 1
+        best, best_worst = None, None
+        for guess in codes:
+            if np is not None:
+                blacks, whites = self.score(guess, codes)
+                worst = np.bincount(blacks * buckets + whites).max()
+            else:
+                blacks, whites = self.game.score_many(guess, codes)
+                worst = max(Counter(zip(blacks, whites)).values())
+            if best_worst is None or worst < best_worst:
+                best, best_worst = int(guess), worst
+        return best
@@ -0,0 +1,162 @@
+"""Journal des événements des matchs en cours.
+
+Chaque événement (START, MOVE, GUESS, END) est une ligne JSON ajoutée au
+fichier matches.journal. Les lignes sont écrites par lots et synchronisées
+sur disque (fsync) toutes les FLUSH_INTERVAL secondes par un thread dédié:
+les threads des matchs n'attendent jamais le disque, et un arrêt brutal ne
+perd au plus que les derniers événements.
+
+Au démarrage, les matchs ouverts (START sans END) sont relus pour être
+reconstruits, puis le journal est réécrit avec leurs seuls événements. En
+cours de route, le journal est compacté de la même façon par le thread
+d'écriture dès que les lignes des matchs terminés y sont COMPACT_RATIO fois
+plus nombreuses que celles des matchs ouverts: sa taille, et donc le temps
+de reprise, reste proportionnelle aux matchs en cours.
+"""
+import json
+import os
+import threading
+from actors import MatchActor
+
+PATH = "matches.journal"  # à côté de matchmaking.db
+
+class MatchJournal:
+    FLUSH_INTERVAL = 0.05      # secondes entre deux synchronisations
+    COMPACT_MIN_LINES = 10000  # taille en dessous de laquelle le journal n'est jamais compacté
+    COMPACT_RATIO = 4          # lignes du fichier par ligne d'un match ouvert avant compactage
+
+    def __init__(self, path=PATH):
+        self.path = path
+        self.pending = []  # lignes pas encore écrites
+        self.counts = {}   # match ouvert -> nombre de ses lignes dans le journal
+        self.live = 0      # lignes des matchs ouverts
+        self.lines = 0     # lignes du fichier et en attente
+        self.lock = threading.Lock()        # self.pending et les compteurs de lignes
+        self.write_lock = threading.Lock()  # écriture et synchronisation du fichier
+        self.file = None
+        self.stopped = threading.Event()
+
+    def open_matches(self) -> dict:
+        """Relit le journal: événements des matchs ouverts, par identifiant de match, avec leur ligne."""
+        matches = {}
+        if not os.path.exists(self.path):
+            return matches
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break  # dernière ligne tronquée par l'arrêt
+                if not line.endswith("\n"):
+                    break
+                if event["event"] == "START":
+                    matches[event["match"]] = [(event, line)]
+                elif event["event"] == "END":
+                    matches.pop(event["match"], None)
+                elif event["match"] in matches:
+                    matches[event["match"]].append((event, line))
+        return matches
+
+    def open(self, lines=()):
+        """Réécrit le journal avec les lignes des matchs encore ouverts et démarre l'écriture."""
+        lines = list(lines)
+        for line in lines:
+            match_id = json.loads(line)["match"]
+            self.counts[match_id] = self.counts.get(match_id, 0) + 1
+        self.live = self.lines = len(lines)
+        self.rewrite(lines)
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def rewrite(self, lines):
+        """Remplace le fichier du journal par ces lignes, sans risque en cas d'arrêt brutal."""
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        if self.file is not None:
+            self.file.close()
+        os.replace(temporary, self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, event, match_id, **data):
+        """Ajoute un événement, écrit au prochain lot."""
+        line = json.dumps({"event": event, "match": match_id, **data})
+        with self.lock:
+            self.pending.append(line)
+            self.lines += 1
+            if event == "START":
+                self.counts[match_id] = 1
+                self.live += 1
+            elif event == "END":
+                self.live -= self.counts.pop(match_id, 0)
+            elif match_id in self.counts:
+                self.counts[match_id] += 1
+                self.live += 1
+
+    def start(self, match, variant, data1, data2):
+        """Début d'un match: de quoi le recréer avec create_match."""
+        self.append("START", match.id, game_type=match.game_type, variant=variant,
+                    players=[match.player1.id, match.player2.id], data=[data1, data2])
+
+    def flush(self):
+        """Écrit les événements en attente et les synchronise sur disque."""
+        with self.write_lock:
+            with self.lock:
+                lines, self.pending = self.pending, []
+            if not lines or self.file is None:
+                return
+            self.file.write("\n".join(lines) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            with self.lock:
+                compact = self.lines >= self.COMPACT_MIN_LINES and self.lines > self.COMPACT_RATIO * self.live
+            if compact:
+                self.compact()
+
+    def compact(self):
+        """Réécrit le journal avec les seules lignes des matchs ouverts (appelé sous write_lock)."""
+        lines = [line for events in self.open_matches().values() for _, line in events]
+        self.rewrite(lines)
+        with self.lock:
+            self.lines = len(lines) + len(self.pending)
+
+    def run(self):
+        while not self.stopped.wait(self.FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Erreur lors de l'écriture du journal: {e}")
+
+    def close(self):
+        self.stopped.set()
+        self.flush()
+        with self.write_lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+def recover_matches(journal, db, games, pool) -> dict:
+    """Reconstruit les matchs ouverts du journal (START sans END) en rejouant leurs coups.
+
+    Retourne les acteurs des matchs reconstruits, par identifiant, après
+    avoir réécrit le journal avec leurs seuls événements.
+    """
+    events = journal.open_matches()
+    recovered = {}
+    for stored in db.get_matches(events):
+        start, *turns = (event for event, _ in events[stored.id])
+        plugin = games.get(start["game_type"])
+        if stored.is_finished or plugin is None:
+            continue  # END perdu alors que le match était déjà terminé en base
+        variant = start["variant"]
+        variant = tuple(variant) if isinstance(variant, list) else variant
+        match, game = plugin.create_match(variant, stored.player1, stored.player2, *start["data"])
+        match.id = stored.id
+        actor = MatchActor(match, game, pool)
+        for turn in turns:
+            plugin.restore_turn(actor, turn["player"], turn["move"], turn["feedback"])
+        plugin.start_clocks(actor, variant)
+        recovered[match.id] = actor
+    journal.open(line for match_id in recovered for _, line in events[match_id])
+    return recovered
@@ -0,0 +1,115 @@
+import threading
+from bisect import bisect_left, insort
+
+class Ranking:
+    """Joueurs triés par score décroissant.
+
+    La liste triée de clés (-score, identifiant) sert à la fois de top-K
+    (ses premiers éléments) et d'index de rang: le rang d'un joueur est une
+    recherche dichotomique de sa clé.
+    """
+    def __init__(self):
+        self.keys = []    # (-score, identifiant du joueur), triées
+        self.scores = {}  # identifiant du joueur -> score
+
+    def update(self, player_id, score):
+        """Place un joueur à son nouveau score."""
+        old = self.scores.get(player_id)
+        if old == score:
+            return
+        if old is not None:
+            del self.keys[bisect_left(self.keys, (-old, player_id))]
+        self.scores[player_id] = score
+        insort(self.keys, (-score, player_id))
+
+    def rank(self, player_id):
+        """Rang d'un joueur (1 pour le premier), ou None s'il n'est pas classé."""
+        score = self.scores.get(player_id)
+        if score is None:
+            return None
+        return bisect_left(self.keys, (-score, player_id)) + 1
+
+    def top(self, start, count):
+        """Joueurs classés de start à start + count: [(identifiant, score)]."""
+        return [(player_id, -score) for score, player_id in self.keys[start:start + count]]
+
+    def __len__(self):
+        return len(self.keys)
+
+class Leaderboard:
+    """Classement des joueurs d'un jeu, par classement Elo ou par victoires.
+
+    Le classement est mis à jour à la fin de chaque match, sans relire
+    l'historique. Les pages envoyées aux clients sont gardées en cache avec
+    le numéro de version du classement: tant qu'aucun match ne se termine,
+    une demande LEADERBOARD ne coûte qu'une recherche dans ce cache.
+    """
+    ORDERS = ("rating", "wins")
+    PAGE_SIZE = 20
+    TOP_K = 1000  # seuls les TOP_K premiers sont consultables par pages
+
+    def __init__(self):
+        self.rankings = {order: Ranking() for order in self.ORDERS}
+        self.names = {}   # identifiant du joueur -> pseudo affiché
+        self.version = 0  # incrémenté à chaque modification du classement
+        self.pages = {}   # (ordre, page) -> (version, page)
+        self.lock = threading.Lock()
+
+    def update(self, player_id, pseudo, rating=None, wins=None):
+        """Met à jour le classement Elo et/ou le nombre de victoires d'un joueur."""
+        with self.lock:
+            self._update(player_id, pseudo, rating, wins)
+
+    def record(self, match, winner_id, ratings):
+        """Prend en compte un match terminé (winner_id: identifiant du gagnant ou "draw")."""
+        # Lecture et écriture des victoires sous le même verrou: deux matchs d'un joueur peuvent finir ensemble
+        with self.lock:
+            for player in (match.player1, match.player2):
+                wins = self.rankings["wins"].scores.get(player.id, 0)
+                self._update(player.id, player.pseudo, ratings.get(player.id), wins + (winner_id == player.id))
+
+    def _update(self, player_id, pseudo, rating, wins):
+        """Corps de update, appelé sous self.lock."""
+        self.names[player_id] = pseudo
+        if rating is not None:
+            self.rankings["rating"].update(player_id, round(rating, 1))
+        if wins is not None:
+            self.rankings["wins"].update(player_id, wins)
+        self.version += 1
+
+    def page_count(self, order) -> int:
+        """Nombre de pages consultables pour un ordre."""
+        ranked = min(len(self.rankings[order]), self.TOP_K)
+        return max(1, -(-ranked // self.PAGE_SIZE))
+
+    def page(self, order, page) -> dict:
+        """Page du classement, calculée au plus une fois par version."""
+        with self.lock:
+            cached = self.pages.get((order, page))
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            start = page * self.PAGE_SIZE
+            count = max(0, min(self.PAGE_SIZE, self.TOP_K - start))
+            entries = [
+                {"rank": start + index + 1, "player_id": player_id, "pseudo": self.names.get(player_id), "score": score}
+                for index, (player_id, score) in enumerate(self.rankings[order].top(start, count))
+            ]
+            result = {"order": order, "page": page, "pages": self.page_count(order), "entries": entries}
+            self.pages[(order, page)] = (self.version, result)
+            return result
+
+    def lookup(self, player_id) -> dict:
+        """Rang et score d'un joueur dans chaque ordre (rang None s'il n'est pas classé)."""
+        with self.lock:
+            return {
+                order: {"rank": ranking.rank(player_id), "score": ranking.scores.get(player_id)}
+                for order, ranking in self.rankings.items()
+            }
+
+def load_leaderboards(db, ratings) -> dict:
+    """Construit le classement de chaque jeu à partir des statistiques et des classements Elo."""
+    leaderboards = {game_type: Leaderboard() for game_type in ratings}
+    for player_id, pseudo, game_type, wins in db.get_ranked_players():
+        if game_type in leaderboards:
+            leaderboards[game_type].update(player_id, pseudo, ratings[game_type].get(player_id), wins)
+    return leaderboards
@@ -0,0 +1,124 @@
+"""Salon: joueurs en ligne, files d'attente et position des joueurs en attente.
+
+Un client s'abonne avec LOBBY_SUBSCRIBE. Les changements ne sont pas poussés
+un par un: toutes les INTERVAL secondes, l'état du salon est calculé une
+fois, puis chaque abonné reçoit un message LOBBY avec seulement ce qui a
+changé depuis le précédent. La partie commune (joueurs en ligne, longueur
+des files par jeu) est encodée une seule fois pour tous les abonnés; un
+abonné en attente reçoit en plus sa position et l'attente estimée quand
+elles changent.
+"""
+import json
+import threading
+
+NEW = object()  # abonné qui n'a encore rien reçu: il recevra l'état complet
+
+class Lobby:
+    INTERVAL = 1.0         # secondes entre deux envois
+    RATE_SMOOTHING = 0.1   # poids de la dernière période dans le débit des files
+
+    def __init__(self, server):
+        self.server = server
+        self.lock = threading.Lock()
+        self.subscribers = {}  # session -> file où le joueur attendait au dernier envoi (NEW au départ)
+        self.matched = {}      # (jeu, variante) -> joueurs appariés depuis la dernière période
+        self.rates = {}        # (jeu, variante) -> joueurs appariés par seconde (moyenne lissée)
+        self.state = {}        # état commun envoyé à la dernière période
+        self.stopped = threading.Event()
+
+    def subscribe(self, session):
+        with self.lock:
+            self.subscribers[session] = NEW
+
+    def unsubscribe(self, session):
+        with self.lock:
+            self.subscribers.pop(session, None)
+
+    def record_matched(self, game_type, variant, players):
+        """Compte les joueurs sortis d'une file par le matchmaking (débit de la file)."""
+        with self.lock:
+            key = (game_type, variant)
+            self.matched[key] = self.matched.get(key, 0) + players
+
+    def update_rates(self):
+        """Met à jour le débit lissé de chaque file avec les appariements de la période."""
+        with self.lock:
+            matched, self.matched = self.matched, {}
+        for key in set(self.rates) | set(matched):
+            rate = matched.get(key, 0) / self.INTERVAL
+            self.rates[key] = (1 - self.RATE_SMOOTHING) * self.rates.get(key, 0.0) + self.RATE_SMOOTHING * rate
+
+    def snapshot(self, player_ids):
+        """État commun du salon et, pour les joueurs donnés qui attendent, leur file et leur position."""
+        with self.server.clients_lock:
+            online = len(self.server.clients)
+        queues, snapshots = {}, []
+        for name, plugin in self.server.games.items():
+            # Sous le verrou du jeu, seulement des copies: les positions sont calculées après
+            with plugin.lock:
+                queues[name] = plugin.waiting_count()
+                for variant, queue in plugin.queues.items():
+                    if not queue.entries.keys().isdisjoint(player_ids):
+                        snapshots.append((name, variant, queue, queue.snapshot()))
+        waiting = {}
+        for name, variant, queue, snapshot in snapshots:
+            rate = self.rates.get((name, variant), 0.0)
+            for position, player_id in enumerate(queue.order(snapshot), 1):
+                if player_id in player_ids and player_id not in waiting:
+                    wait = round(position / rate) if rate > 0 else None
+                    waiting[player_id] = {"game": name, "position": position, "wait": wait}
+        return {"online": online, "queues": queues}, waiting
+
+    def push(self):
+        """Envoie à chaque abonné ce qui a changé depuis son dernier message."""
+        self.update_rates()
+        with self.lock:
+            subscribers = list(self.subscribers.items())
+        if not subscribers:
+            return
+        state, waiting = self.snapshot({session.player_id for session, _ in subscribers})
+        previous = self.state
+        delta = {}
+        if state["online"] != previous.get("online"):
+            delta["online"] = state["online"]
+        queues = {name: count for name, count in state["queues"].items()
+                  if previous.get("queues", {}).get(name) != count}
+        if queues:
+            delta["queues"] = queues
+        self.state = state
+        shared = json.dumps({"action": "LOBBY", **delta}).encode() if delta else None  # encodé une fois
+
+        updated = {}
+        for session, last in subscribers:
+            entry = waiting.get(session.player_id)
+            if last is NEW:
+                data = json.dumps({"action": "LOBBY", **state, "waiting": entry}).encode()
+            elif entry != last:
+                data = json.dumps({"action": "LOBBY", **delta, "waiting": entry}).encode()
+            else:
+                data = shared
+            if data is None:
+                continue
+            updated[session] = entry if self.send(session, data) else NEW
+        with self.lock:
+            for session, entry in updated.items():
+                if session in self.subscribers:
+                    self.subscribers[session] = entry
+
+    def send(self, session, data) -> bool:
+        """Envoie sans jamais attendre; False si le client n'a pas fini de lire l'envoi précédent."""
+        # Client lent ou connexion fermée: il recevra l'état complet au prochain envoi
+        return session.write_nowait(data)
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        while not self.stopped.wait(self.INTERVAL):
+            try:
+                self.push()
+            except Exception as e:
+                print(f"Erreur lors de l'envoi du salon: {e}")
+
+    def stop(self):
+        self.stopped.set()
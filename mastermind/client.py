@@ -1,20 +1,23 @@
 import socket
 import threading
 import json
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
 
 from mastermind.ui.main_menu_ui import setup_main_menu_ui
 from mastermind.ui.rules_ui import setup_rules_ui
 from mastermind.ui.code_creation_ui import setup_code_creation_ui
-from mastermind.ui.waiting_ui import setup_waiting_ui
+from mastermind.ui.waiting_ui import setup_waiting_ui, update_lobby_ui
 from mastermind.ui.game_ui import setup_game_ui, update_game_ui
 from mastermind.ui.result_ui import setup_game_result_ui
+from mastermind.ui.replay_ui import setup_replay_ui, add_replay_guess
 from mastermind.config import Config
+from protocol import read_messages
 
 class MastermindClient:
     """Client pour jouer au Mastermind en 1v1."""
-    def __init__(self, pseudo, client_socket=None, parent_root=None, host="localhost", port=12345):
+    def __init__(self, pseudo, client_socket=None, parent_root=None, host="localhost", port=12345, resume_token=None):
         if client_socket:
             self.client = client_socket
         else:
@@ -27,6 +30,11 @@ class MastermindClient:
                 return
             
         self.pseudo = pseudo
+        self.server_address = self.client.getpeername()
+        self.resume_token = resume_token  # jeton reçu au CONNECT, pour reprendre un match après une coupure
+        self.reconnecting = False  # CONNECT envoyé après un jeton refusé, RESUME à suivre
+        self.last_seq = 0  # numéro du dernier message du match reçu
+        self.listening = False
         self.parent_root = parent_root
         self.match_id = None
         self.opponent = None
@@ -36,10 +44,25 @@ class MastermindClient:
         self.feedback = []  
         self.opponent_feedback = []  
         self.max_attempts = Config.MAX_ATTEMPTS
-        self.colors = Config.COLORS
-        self.code_length = Config.CODE_LENGTH
+        self.variant = 0  # index dans Config.VARIANTS
+        self.clock = False  # pendule demandée au JOIN (sur option)
+        _, self.code_length, color_count = Config.VARIANTS[self.variant]
+        self.colors = Config.COLORS[:color_count]
         self.game_over = False
         self.in_queue = False
+        self.lobby = None  # état du salon (LOBBY) pendant l'attente, None sans abonnement
+        self.deadline = None  # fin du temps pour la prochaine tentative (time.monotonic), None sans pendule
+        self.clock_job = None  # rafraîchissement du décompte
+        
+        # Relecture de la dernière partie (tentatives reçues par pages)
+        self.last_match_id = None
+        self.replay_turns = []
+        self.replay_next = None
+        self.replay_playing = False
+        self.replay_frame = None
+        self.replay_colors = self.colors
+        self.replay_length = self.code_length
+        self.replay_result = None
         
         # Interface graphique
         if parent_root:
@@ -73,7 +96,10 @@ class MastermindClient:
     def setup_main_menu(self):
         """Configure le menu principal."""
         setup_main_menu_ui(self)
-        threading.Thread(target=self.listen_server, daemon=True).start()
+        self.unsubscribe_lobby()
+        if not self.listening:
+            self.listening = True  # un seul thread lit le socket
+            threading.Thread(target=self.listen_server, daemon=True).start()
 
     def show_rules(self):
         """Affiche les règles du jeu."""
@@ -101,6 +127,30 @@ class MastermindClient:
         setup_code_creation_ui(self)
         self.my_code = []
 
+    def select_variant(self, index):
+        """Change de variante (nombre de pions et de couleurs) et recrée le code."""
+        self.variant = index
+        _, self.code_length, color_count = Config.VARIANTS[index]
+        self.colors = Config.COLORS[:color_count]
+        self.setup_code_creation_ui()
+
+    def pack_code(self, code):
+        """Compacte une liste de couleurs en entier pour le serveur (pion i = chiffre i)."""
+        value = 0
+        for color in reversed(code):
+            value = value * len(self.colors) + self.colors.index(color)
+        return value
+
+    def unpack_code(self, value, code_length=None, colors=None):
+        """Décompacte un entier reçu du serveur en liste de couleurs (variante en cours par défaut)."""
+        code_length = code_length or self.code_length
+        colors = colors or self.colors
+        code = []
+        for _ in range(code_length):
+            value, index = divmod(value, len(colors))
+            code.append(colors[index])
+        return code
+
     def add_color_to_code(self, color):
         """Ajoute une couleur au code."""
         if len(self.my_code) < self.code_length:
@@ -121,7 +171,7 @@ class MastermindClient:
     def validate_code(self):
         """Valide le code et cherche un adversaire."""
         if len(self.my_code) != self.code_length:
-            messagebox.showerror("Erreur", "Veuillez sélectionner 4 couleurs.")
+            messagebox.showerror("Erreur", f"Veuillez sélectionner {self.code_length} couleurs.")
             return
             
         # Afficher l'écran d'attente
@@ -131,7 +181,10 @@ class MastermindClient:
         message = json.dumps({
             "action": "JOIN_MASTERMIND", 
             "pseudo": self.pseudo, 
-            "code": self.my_code
+            "code_length": self.code_length,
+            "colors": len(self.colors),
+            "clock": self.clock,
+            "code": self.pack_code(self.my_code)
         })
         self.client.send(message.encode())
         self.in_queue = True
@@ -139,6 +192,33 @@ class MastermindClient:
     def setup_waiting_ui(self):
         """Affiche l'écran d'attente d'un adversaire."""
         setup_waiting_ui(self)
+        self.subscribe_lobby()
+
+    def subscribe_lobby(self):
+        """S'abonne au salon pour l'écran d'attente; l'état complet arrive au prochain envoi."""
+        if self.lobby is not None:
+            update_lobby_ui(self)
+            return
+        self.lobby = {}
+        self.client.send(json.dumps({"action": "LOBBY_SUBSCRIBE"}).encode())
+
+    def unsubscribe_lobby(self):
+        """Se désabonne du salon en quittant l'écran d'attente."""
+        if self.lobby is None:
+            return
+        self.lobby = None
+        self.client.send(json.dumps({"action": "LOBBY_UNSUBSCRIBE"}).encode())
+
+    def update_lobby(self, message):
+        """Applique un message LOBBY (état complet ou changements) et met à jour l'écran d'attente."""
+        if self.lobby is None:
+            return
+        for key, value in message.items():
+            if key == "queues":
+                self.lobby.setdefault("queues", {}).update(value)
+            elif key != "action":
+                self.lobby[key] = value
+        update_lobby_ui(self)
 
     def animate_waiting_dots(self):
         """Anime les points d'attente."""
@@ -178,6 +258,33 @@ class MastermindClient:
         self.game_over = False
         
         self.update_game_ui()
+        self.update_clock()
+
+    def restore_attempts(self, guesses, opponent_guesses):
+        """Rétablit les tentatives des deux joueurs envoyées par le serveur à la reprise du match."""
+        self.guesses = [self.unpack_code(guess) for guess, _ in guesses]
+        self.feedback = [tuple(feedback) for _, feedback in guesses]
+        self.opponent_guesses = [self.unpack_code(guess) for guess, _ in opponent_guesses]
+        self.opponent_feedback = [tuple(feedback) for _, feedback in opponent_guesses]
+        self.update_game_ui()
+
+    def set_deadline(self, time_left):
+        """Note le temps laissé par le serveur pour la prochaine tentative."""
+        self.deadline = time.monotonic() + time_left if time_left is not None else None
+
+    def update_clock(self):
+        """Affiche le temps restant pour la prochaine tentative, rafraîchi chaque seconde."""
+        if self.clock_job is not None:
+            self.root.after_cancel(self.clock_job)
+            self.clock_job = None
+        if not hasattr(self, 'clock_label') or not self.clock_label.winfo_exists():
+            return
+        if self.game_over or self.deadline is None:
+            self.clock_label.config(text="")
+            return
+        seconds = max(0, int(self.deadline - time.monotonic()))
+        self.clock_label.config(text=f"Temps pour votre prochaine tentative: {seconds} s")
+        self.clock_job = self.root.after(1000, self.update_clock)
 
     def add_color_to_guess(self, color):
         """Ajoute une couleur à la tentative actuelle."""
@@ -207,7 +314,7 @@ class MastermindClient:
             "action": "MASTERMIND_GUESS", 
             "pseudo": self.pseudo,
             "match_id": self.match_id,
-            "guess": self.current_guess
+            "guess": self.pack_code(self.current_guess)
         })
         self.client.send(message.encode())
         
@@ -216,15 +323,40 @@ class MastermindClient:
         # Mettre a jour l'interface
         self.update_game_ui()
 
+    def request_hint(self):
+        """Demande au serveur combien de codes restent possibles et une suggestion."""
+        if self.game_over:
+            return
+        message = json.dumps({
+            "action": "MASTERMIND_HINT",
+            "pseudo": self.pseudo,
+            "match_id": self.match_id,
+            "suggest": True
+        })
+        self.client.send(message.encode())
+
+    def show_hint(self, remaining, suggestion):
+        """Affiche l'indice reçu et propose la tentative suggérée."""
+        if remaining is None:
+            messagebox.showinfo("Indice", "Pas d'indice disponible pour cette variante.")
+            return
+        messagebox.showinfo("Indice", f"Codes encore possibles: {remaining}")
+        if suggestion is not None and not self.game_over:
+            self.clear_guess()
+            for color in self.unpack_code(suggestion):
+                self.add_color_to_guess(color)
+
     def update_game_ui(self):
         """Met à jour l'interface du jeu."""
         update_game_ui(self)
 
-    def show_game_result(self, result, player1_code, player2_code):
+    def show_game_result(self, result, player1_code, player2_code, reason=None):
         """Affiche le résultat de la partie avec une interface améliorée."""
-        setup_game_result_ui(self, result, player1_code, player2_code)
+        self.last_match_id = self.match_id
+        setup_game_result_ui(self, result, player1_code, player2_code, reason)
         #reset
         self.game_over = True
+        self.deadline = None
         self.opponent = None
         self.match_id = None
         self.guesses = []
@@ -232,21 +364,115 @@ class MastermindClient:
         self.feedback = []
         self.opponent_feedback = []
 
+    def request_replay(self, after=0):
+        """Demande au serveur une page de tentatives de la dernière partie."""
+        if after == 0:
+            self.replay_turns = []
+            self.replay_frame = None
+        message = json.dumps({"action": "REPLAY", "match_id": self.last_match_id, "after": after})
+        self.client.send(message.encode())
+
+    def show_replay_frame(self, message):
+        """Ajoute une page de tentatives à la relecture et demande la suivante sans attendre la fin de l'affichage."""
+        if self.replay_frame is None:
+            setup_replay_ui(self, message)
+            self.replay_colors = Config.COLORS[:message["colors"]]
+            self.replay_length = message["code_length"]
+            self.replay_result = message["result"]
+        self.replay_turns.extend(message["turns"])
+        self.replay_next = message["next"]
+        if self.replay_next is not None:
+            self.request_replay(self.replay_next)
+        if not self.replay_playing:
+            self.replay_playing = True
+            self.replay_step()
+
+    def replay_step(self):
+        """Affiche la tentative suivante de la relecture."""
+        if self.current_frame is not self.replay_frame:
+            self.replay_playing = False  # relecture quittée
+            return
+        if not self.replay_turns:
+            self.replay_playing = False
+            if self.replay_next is None:
+                result = "Match nul" if self.replay_result == "draw" else f"Victoire de {self.replay_result}"
+                self.replay_status.config(text=f"Fin de la relecture: {result}")
+            return
+        side, guess, feedback = self.replay_turns.pop(0)
+        add_replay_guess(self, side, self.unpack_code(guess, self.replay_length, self.replay_colors), feedback or (0, 0))
+        self.replay_status.config(text="Relecture en cours...")
+        self.root.after(Config.REPLAY_DELAY, self.replay_step)
+
+    def handle_match_interrupted(self, message):
+        """Gère l'interruption du match due à une déconnexion."""
+        messagebox.showinfo("Match annulé", message)
+        self.match_id = None
+        self.setup_main_menu()
+
+    def resume_session(self):
+        """Rouvre la connexion perdue pendant un match et la reprend (RESUME); retourne le nouveau socket ou None."""
+        if self.resume_token is None or self.match_id is None:
+            return None
+        for _ in range(Config.RESUME_ATTEMPTS):
+            time.sleep(Config.RESUME_DELAY)
+            try:
+                client_socket = socket.create_connection(self.server_address)
+                self.send_resume(client_socket)
+            except OSError:
+                continue
+            self.client = client_socket
+            self.reconnecting = False
+            return client_socket
+        return None
+
+    def send_resume(self, client_socket):
+        """Demande la reprise du match en cours avec le jeton actuel."""
+        client_socket.send(json.dumps({
+            "action": "RESUME",
+            "token": self.resume_token,
+            "match_id": self.match_id,
+            "last_seq": self.last_seq
+        }).encode())
+
+    def reconnect(self, message):
+        """Réponse au CONNECT envoyé après un jeton refusé: reprend le match avec le nouveau jeton."""
+        self.reconnecting = False
+        if message["status"] == "OK":
+            self.resume_token = message["resume_token"]
+            self.send_resume(self.client)
+        else:
+            self.root.after(0, self.handle_match_interrupted, message["message"])
+
     def listen_server(self):
         """Écoute les messages du serveur."""
         try:
-            while True:
-                data = self.client.recv(1024).decode()
-                if not data:
-                    break
-                message = json.loads(data)
+            for message in read_messages(self.client, self.resume_session):
                 action = message.get("action")
+                # Les messages d'un match sont numérotés par le serveur
+                self.last_seq = message.get("seq", self.last_seq)
                 
-                if action == "MASTERMIND_START":
+                if action == "CONNECT":
+                    # Réponse déjà gérée dans validate_pseudo, sauf après un jeton de reprise refusé
+                    if self.reconnecting:
+                        self.reconnect(message)
+                elif action == "PING":
+                    self.client.send(json.dumps({"action": "PONG"}).encode())
+                elif action == "MASTERMIND_START":
                     self.opponent = message["opponent"]
                     self.match_id = message["match_id"]
+                    # Après une reprise dont les messages manqués sont perdus: MASTERMIND_START avec les tentatives (resync)
+                    self.last_seq = message.get("seq", 0)
+                    self.max_attempts = message.get("max_attempts", Config.MAX_ATTEMPTS)
+                    limits = [limit for limit in (message.get("turn_time"), message.get("game_time")) if limit is not None]
+                    if message.get("resync"):
+                        self.set_deadline(message.get("time_left"))
+                    else:
+                        self.set_deadline(min(limits) if limits else None)
                     self.in_queue = False
+                    self.root.after(0, self.unsubscribe_lobby)
                     self.root.after(0, self.setup_game_ui)
+                    if message.get("resync"):
+                        self.root.after(0, self.restore_attempts, message["guesses"], message["opponent_guesses"])
                 
                 elif action == "MASTERMIND_FEEDBACK":
                     black_pins = message["black_pins"]
@@ -256,9 +482,12 @@ class MastermindClient:
                     if guess_number > len(self.feedback):
                         self.feedback.append((black_pins, white_pins))
                         self.root.after(0, self.update_game_ui)
+                    # Plus de pendule une fois les tentatives épuisées
+                    self.set_deadline(message.get("time_left") if guess_number < self.max_attempts else None)
+                    self.root.after(0, self.update_clock)
                 
                 elif action == "MASTERMIND_OPPONENT_GUESS":
-                    guess = message["guess"]
+                    guess = self.unpack_code(message["guess"])
                     black_pins = message["black_pins"]
                     white_pins = message["white_pins"]
                     
@@ -266,16 +495,43 @@ class MastermindClient:
                     self.opponent_feedback.append((black_pins, white_pins))
                     self.root.after(0, self.update_game_ui)
                 
+                elif action == "LOBBY":
+                    self.root.after(0, self.update_lobby, message)
+                
+                elif action == "MASTERMIND_HINT":
+                    remaining = message["remaining"]
+                    suggestion = message["suggestion"]
+                    self.root.after(0, lambda: self.show_hint(remaining, suggestion))
+                
                 elif action == "MASTERMIND_END":
                     result = message["result"]
-                    player1_code = message["player1_code"]
-                    player2_code = message["player2_code"]
-                    self.root.after(0, lambda: self.show_game_result(result, player1_code, player2_code))
+                    player1_code = self.unpack_code(message["player1_code"])
+                    player2_code = self.unpack_code(message["player2_code"])
+                    reason = message.get("reason")
+                    self.root.after(0, lambda: self.show_game_result(result, player1_code, player2_code, reason))
+                
+                elif action == "REPLAY" and message.get("game_type") == "mastermind":
+                    self.root.after(0, self.show_replay_frame, message)
                 
                 elif action == "LEFT_QUEUE":
                     self.in_queue = False
                     self.root.after(0, self.setup_main_menu)
                 
+                elif action == "ERROR":
+                    self.in_queue = False
+                    self.root.after(0, lambda: messagebox.showerror("Erreur", message["message"]))
+                    self.root.after(0, self.setup_code_creation_ui)
+                
+                elif action == "RESUME":
+                    if message["status"] != "OK" and "token" not in message and not self.reconnecting:
+                        # Jeton inconnu du serveur (redémarré entre-temps): nouvelle identification, puis RESUME
+                        self.reconnecting = True
+                        self.client.send(json.dumps({"action": "CONNECT", "pseudo": self.pseudo}).encode())
+                        continue
+                    self.resume_token = message.get("token", self.resume_token)
+                    if message["status"] != "OK":
+                        self.root.after(0, self.handle_match_interrupted, message["message"])
+                
                 elif action == "MATCH_INTERRUPTED":
                     messagebox.showinfo("Match annulé", message["message"])
                     self.root.after(0, self.setup_main_menu)
@@ -2,8 +2,20 @@ class Config:
     """Classe de configuration pour le client Mastermind."""
     # Paramètres du jeu
     MAX_ATTEMPTS = 10
-    CODE_LENGTH = 4
-    COLORS = ["red", "green", "blue", "yellow", "purple", "orange"]
+    COLORS = ["red", "green", "blue", "yellow", "purple", "orange", "pink", "cyan", "brown", "gray"]
+    # Variantes proposées: (libellé, nombre de pions, nombre de couleurs)
+    VARIANTS = [
+        ("Classique: 4 pions, 6 couleurs", 4, 6),
+        ("5 pions, 8 couleurs", 5, 8),
+        ("6 pions, 10 couleurs", 6, 10),
+    ]
+    
+    # Reprise d'un match après une coupure: tentatives de reconnexion et délai entre deux (s)
+    RESUME_ATTEMPTS = 5
+    RESUME_DELAY = 1.0
+
+    # Délai entre deux tentatives d'une relecture (ms)
+    REPLAY_DELAY = 500
     
     # Couleurs et styles
     BG_COLOR = "#f0f0f0"
@@ -1,5 +1,6 @@
 
 import tkinter as tk
+from mastermind.config import Config
 
 def setup_code_creation_ui(client):
     """Interface pour créer son code secret."""
@@ -21,10 +22,39 @@ def setup_code_creation_ui(client):
     )
     title_label.pack(pady=(30, 20))
     
+    # Choix de la variante
+    variants_frame = tk.Frame(client.current_frame, bg=client.bg_color)
+    variants_frame.pack(pady=5)
+    client.variant_var = tk.IntVar(value=client.variant)
+    for index, (label, _, _) in enumerate(Config.VARIANTS):
+        tk.Radiobutton(
+            variants_frame, 
+            text=label, 
+            variable=client.variant_var, 
+            value=index, 
+            font=("Helvetica", 11), 
+            bg=client.bg_color, 
+            fg=client.text_color, 
+            activebackground=client.bg_color, 
+            command=lambda i=index: client.select_variant(i)
+        ).grid(row=0, column=index, padx=10)
+    # Pendule sur option: temps par coup et temps total limités
+    client.clock_var = tk.BooleanVar(value=client.clock)
+    tk.Checkbutton(
+        variants_frame, 
+        text="Avec pendule", 
+        variable=client.clock_var, 
+        font=("Helvetica", 11), 
+        bg=client.bg_color, 
+        fg=client.text_color, 
+        activebackground=client.bg_color, 
+        command=lambda: setattr(client, "clock", client.clock_var.get())
+    ).grid(row=1, column=0, columnspan=len(Config.VARIANTS), pady=5)
+    
     # Instructions
     instructions_label = tk.Label(
         client.current_frame, 
-        text="Sélectionnez 4 couleurs pour créer votre code secret", 
+        text=f"Sélectionnez {client.code_length} couleurs pour créer votre code secret", 
         font=("Helvetica", 14), 
         bg=client.bg_color, 
         fg=client.text_color
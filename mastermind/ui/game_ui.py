@@ -19,6 +19,16 @@ def setup_game_ui(client):
         fg=client.accent_color
     )
     game_title.pack(pady=(10, 5))
+
+    # Temps restant pour la prochaine tentative (vide sans pendule)
+    client.clock_label = tk.Label(
+        client.current_frame,
+        text="",
+        font=("Helvetica", 12),
+        bg=client.bg_color,
+        fg=client.text_color
+    )
+    client.clock_label.pack()
     
     # Frame principale divisée en deux
     main_frame = tk.Frame(client.current_frame, bg=client.bg_color)
@@ -128,6 +138,22 @@ def setup_game_ui(client):
         activebackground=client.button_hover
     )
     client.submit_guess_button.grid(row=0, column=1, padx=5)
+    
+    # Bouton pour demander un indice au serveur
+    hint_button = tk.Button(
+        actions_frame, 
+        text="Indice", 
+        font=("Helvetica", 10), 
+        bg="#5cb85c", 
+        fg="white", 
+        padx=10, 
+        pady=2, 
+        bd=0, 
+        relief=tk.FLAT, 
+        command=client.request_hint,
+        activebackground="#449d44"
+    )
+    hint_button.grid(row=0, column=2, padx=5)
 
 def update_game_ui(client):
     """Met à jour l'interface du jeu."""
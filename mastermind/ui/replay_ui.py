@@ -0,0 +1,85 @@
+import tkinter as tk
+
+def setup_replay_ui(client, message):
+    """Affiche les deux colonnes de tentatives d'une relecture, remplies au fil des pages reçues."""
+    if client.current_frame:
+        client.current_frame.destroy()
+        
+    client.current_frame = tk.Frame(client.root, bg=client.bg_color)
+    client.current_frame.pack(fill="both", expand=True)
+    client.replay_frame = client.current_frame
+    
+    client.root.title(f"Mastermind - Relecture du match {message['match_id']}")
+    
+    # Titre de la relecture
+    title_label = tk.Label(
+        client.current_frame, 
+        text=f"Relecture: {message['player1']} vs {message['player2']}", 
+        font=("Helvetica", 18, "bold"), 
+        bg=client.bg_color, 
+        fg=client.accent_color
+    )
+    title_label.pack(pady=(20, 10))
+    
+    # Une colonne de tentatives par joueur
+    columns_frame = tk.Frame(client.current_frame, bg=client.bg_color)
+    columns_frame.pack(fill="both", expand=True, padx=20)
+    client.replay_columns = {}
+    for side, pseudo in ((1, message["player1"]), (2, message["player2"])):
+        column = tk.Frame(columns_frame, bg=client.bg_color, bd=2, relief=tk.GROOVE)
+        column.grid(row=0, column=side - 1, padx=10, sticky="n")
+        tk.Label(
+            column, 
+            text=f"Tentatives de {pseudo}", 
+            font=("Helvetica", 12, "bold"), 
+            bg=client.bg_color, 
+            fg=client.text_color
+        ).pack(pady=5)
+        client.replay_columns[side] = column
+    
+    # Avancement de la relecture
+    client.replay_status = tk.Label(
+        client.current_frame, 
+        text="Chargement des tentatives...", 
+        font=("Helvetica", 14), 
+        bg=client.bg_color, 
+        fg=client.text_color
+    )
+    client.replay_status.pack(pady=10)
+    
+    # Bouton pour revenir au menu
+    back_button = tk.Button(
+        client.current_frame, 
+        text="Menu principal", 
+        font=("Helvetica", 12, "bold"), 
+        bg=client.button_color, 
+        fg="white", 
+        padx=20, 
+        pady=5, 
+        bd=0, 
+        relief=tk.FLAT, 
+        command=client.setup_main_menu,
+        activebackground=client.button_hover
+    )
+    back_button.pack(pady=10)
+
+def add_replay_guess(client, side, guess, feedback):
+    """Ajoute une tentative et son feedback dans la colonne d'un joueur."""
+    guess_frame = tk.Frame(client.replay_columns[side], bg=client.bg_color)
+    guess_frame.pack(fill="x", pady=2, padx=5)
+    
+    # Couleurs de la tentative
+    for j, color in enumerate(guess):
+        color_canvas = tk.Canvas(guess_frame, width=20, height=20, bg=color, highlightthickness=1, highlightbackground="black")
+        color_canvas.grid(row=0, column=j, padx=2)
+    
+    # Feedback (pions noirs et blancs)
+    black_pins, white_pins = feedback
+    feedback_frame = tk.Frame(guess_frame, bg=client.bg_color)
+    feedback_frame.grid(row=0, column=len(guess), padx=5)
+    for j in range(black_pins):
+        pin = tk.Canvas(feedback_frame, width=10, height=10, bg="black", highlightthickness=0)
+        pin.grid(row=0, column=j, padx=1)
+    for j in range(white_pins):
+        pin = tk.Canvas(feedback_frame, width=10, height=10, bg="white", highlightthickness=1, highlightbackground="black")
+        pin.grid(row=0, column=black_pins+j, padx=1)
@@ -1,7 +1,7 @@
 import tkinter as tk
 from config import Config
 
-def setup_game_result_ui(client, result, player1_code, player2_code):
+def setup_game_result_ui(client, result, player1_code, player2_code, reason=None):
     """Affiche le résultat de la partie avec une interface améliorée."""
     if client.current_frame:
         client.current_frame.destroy()
@@ -31,6 +31,8 @@ def setup_game_result_ui(client, result, player1_code, player2_code):
     else:
         result_text = f"{client.opponent} a gagné !"
         result_color = Config.DANGER_COLOR
+    if reason == "timeout":
+        result_text = "Temps écoulé, vous avez gagné !" if result == client.pseudo else "Temps écoulé, vous avez perdu."
         
     result_label = tk.Label(
         client.current_frame, 
@@ -162,9 +164,8 @@ def setup_game_result_ui(client, result, player1_code, player2_code):
     opponent_code_frame.grid(row=1, column=1, padx=5, pady=5)
     
     # Déterminer quel code est celui de l'adversaire
-    # Si je suis player1, alors le code de l'adversaire est player2_code
-    # Si je suis player2, alors le code de l'adversaire est player1_code
-    opponent_code = player2_code if client.pseudo == player1_code else player1_code
+    # Si mon code est player1_code, alors le code de l'adversaire est player2_code
+    opponent_code = player2_code if player1_code == client.my_code else player1_code
     
     for i, color in enumerate(opponent_code):
         color_canvas = tk.Canvas(opponent_code_frame, width=30, height=30, bg=color, highlightthickness=1, highlightbackground="black")
@@ -205,3 +206,20 @@ def setup_game_result_ui(client, result, player1_code, player2_code):
         activebackground=client.button_hover
     )
     menu_button.grid(row=0, column=1, padx=10)
+    
+    # Bouton pour revoir la partie tentative par tentative
+    if client.last_match_id is not None:
+        review_button = tk.Button(
+            buttons_frame, 
+            text="Revoir la partie", 
+            font=("Helvetica", 12, "bold"), 
+            bg=client.button_color, 
+            fg="white", 
+            padx=20, 
+            pady=5, 
+            bd=0, 
+            relief=tk.FLAT, 
+            command=client.request_replay,
+            activebackground=client.button_hover
+        )
+        review_button.grid(row=0, column=2, padx=10)
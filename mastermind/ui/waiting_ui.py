@@ -41,6 +41,17 @@ def setup_waiting_ui(client):
     client.waiting_animation_label.pack(pady=20)
     client.animate_waiting_dots()
     
+    # Salon: joueurs en ligne, file d'attente et position (messages LOBBY)
+    client.lobby_label = tk.Label(
+        client.current_frame, 
+        text="", 
+        font=("Helvetica", 11), 
+        bg=client.bg_color, 
+        fg=client.text_color, 
+        justify=tk.CENTER
+    )
+    client.lobby_label.pack(pady=5)
+    
     # Bouton pour annuler
     cancel_button = tk.Button(
         client.current_frame, 
@@ -56,3 +67,17 @@ def setup_waiting_ui(client):
         activebackground="#c9302c"
     )
     cancel_button.pack(pady=30)
+
+def update_lobby_ui(client):
+    """Affiche l'état du salon: joueurs en ligne, file du Mastermind et position du joueur."""
+    if not hasattr(client, "lobby_label") or not client.lobby_label.winfo_exists():
+        return
+    lobby = client.lobby
+    lines = [f"{lobby.get('online', 0)} joueur(s) en ligne, {lobby.get('queues', {}).get('mastermind', 0)} en attente au Mastermind"]
+    waiting = lobby.get("waiting")
+    if waiting and waiting["game"] == "mastermind":
+        line = f"Votre position dans la file: {waiting['position']}"
+        if waiting["wait"] is not None:
+            line += f" (attente estimée: {waiting['wait']} s)"
+        lines.append(line)
+    client.lobby_label.config(text="\n".join(lines))
@@ -0,0 +1,153 @@
+import threading
+import time
+import heapq
+from bisect import bisect_left, bisect_right, insort
+
+class RatedQueue:
+    """File d'attente indexée par classement.
+
+    Les joueurs sont rangés dans des seaux de classement dont les clés sont
+    gardées triées: la recherche du plus proche adversaire est une recherche
+    dichotomique suivie du parcours de quelques seaux voisins. La fenêtre de
+    recherche s'élargit avec le temps d'attente; chaque joueur n'est
+    réexaminé que lorsque sa fenêtre a gagné un seau, ce qui borne le travail
+    d'une passe aux arrivées et aux fenêtres qui ont changé.
+    """
+    BUCKET_WIDTH = 25     # largeur d'un seau, en points de classement
+    BASE_WINDOW = 50      # écart accepté à l'arrivée
+    WINDOW_GROWTH = 25    # élargissement par seconde d'attente
+    MAX_WINDOW = 400      # écart maximal accepté
+    RECHECK_DELAY = 1.0   # délai entre deux recherches une fois la fenêtre maximale atteinte
+
+    def __init__(self, rating_of, clock=time.monotonic):
+        self.rating_of = rating_of
+        self.clock = clock
+        self.entries = {}   # identifiant du joueur -> (Player, session, classement, arrivée)
+        self.buckets = {}   # clé de seau -> {identifiant: classement}
+        self.keys = []      # clés des seaux non vides, triées
+        self.pending = []   # tas (prochaine recherche, arrivée, identifiant)
+
+    def put(self, player, session):
+        """Ajoute un joueur dans la file (sans doublon)."""
+        if player.id in self.entries:
+            return
+        rating = self.rating_of(player.id)
+        joined_at = self.clock()
+        self.entries[player.id] = (player, session, rating, joined_at)
+        key = int(rating // self.BUCKET_WIDTH)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {}
+            insort(self.keys, key)
+        bucket[player.id] = rating
+        heapq.heappush(self.pending, (joined_at, joined_at, player.id))
+
+    def remove(self, player_id):
+        """Retire un joueur de la file et retourne son entrée, ou None."""
+        entry = self.entries.pop(player_id, None)
+        if entry is None:
+            return None
+        key = int(entry[2] // self.BUCKET_WIDTH)
+        bucket = self.buckets[key]
+        del bucket[player_id]
+        if not bucket:
+            del self.buckets[key]
+            del self.keys[bisect_left(self.keys, key)]
+        # L'entrée du tas devient obsolète et sera ignorée
+        return entry[:2]
+
+    def window(self, waited: float) -> float:
+        """Écart de classement accepté après une attente donnée."""
+        return min(self.BASE_WINDOW + self.WINDOW_GROWTH * waited, self.MAX_WINDOW)
+
+    def nearest(self, player_id: int, rating: float, window: float):
+        """Cherche le joueur en attente le plus proche en classement dans la fenêtre."""
+        lo = bisect_left(self.keys, int((rating - window) // self.BUCKET_WIDTH))
+        hi = bisect_right(self.keys, int((rating + window) // self.BUCKET_WIDTH))
+        best, best_gap = None, window
+        for key in self.keys[lo:hi]:
+            for other, other_rating in self.buckets[key].items():
+                gap = abs(other_rating - rating)
+                if other != player_id and gap <= best_gap:
+                    best, best_gap = other, gap
+        return best
+
+    def drain_pairs(self):
+        """Forme toutes les paires possibles pour les joueurs dont la recherche est due."""
+        now = self.clock()
+        pairs = []
+        while self.pending and self.pending[0][0] <= now:
+            _, joined_at, player_id = heapq.heappop(self.pending)
+            entry = self.entries.get(player_id)
+            if entry is None or entry[3] != joined_at:
+                continue  # joueur déjà apparié ou parti
+            window = self.window(now - joined_at)
+            opponent = self.nearest(player_id, entry[2], window)
+            if opponent is not None:
+                # Le joueur qui attend depuis le plus longtemps est le joueur 1
+                first, second = sorted((player_id, opponent), key=lambda p: self.entries[p][3])
+                pairs.append((self.remove(first), self.remove(second)))
+            elif window < self.MAX_WINDOW:
+                # Prochaine recherche quand la fenêtre aura gagné un seau
+                heapq.heappush(self.pending, (now + self.BUCKET_WIDTH / self.WINDOW_GROWTH, joined_at, player_id))
+            else:
+                heapq.heappush(self.pending, (now + self.RECHECK_DELAY, joined_at, player_id))
+        return pairs
+
+    def snapshot(self):
+        """Copie de la file, prise sous le verrou de son jeu, à passer à order hors du verrou."""
+        return list(self.pending), self.entries.copy()
+
+    @staticmethod
+    def order(snapshot) -> list:
+        """Joueurs en attente dans l'ordre où drain_pairs les examinera (prochaine recherche, puis ancienneté)."""
+        pending, entries = snapshot
+        pending.sort()
+        order = []
+        for _, joined_at, player_id in pending:
+            entry = entries.get(player_id)
+            if entry is not None and entry[3] == joined_at:
+                order.append(player_id)
+        return order
+
+    def __len__(self):
+        return len(self.entries)
+
+class Matchmaker(threading.Thread):
+    """Ordonnanceur de matchmaking par lots.
+
+    Les JOIN ne créent plus de match eux-mêmes: ils réveillent l'ordonnanceur,
+    qui attend quelques millisecondes pour laisser arriver les autres joueurs,
+    puis forme tous les matchs possibles en une seule passe. Sans JOIN, une
+    passe est tout de même faite régulièrement pour que les fenêtres de
+    recherche des joueurs en attente puissent s'élargir.
+    """
+    def __init__(self, tick, interval=0.005, idle_interval=0.25):
+        super().__init__(daemon=True, name="matchmaker")
+        self.tick = tick
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.wake = threading.Event()
+        self.running = True
+
+    def notify(self):
+        """Signale qu'une file d'attente a changé."""
+        self.wake.set()
+
+    def stop(self):
+        """Arrête l'ordonnanceur."""
+        self.running = False
+        self.wake.set()
+
+    def run(self):
+        while self.running:
+            self.wake.wait(self.idle_interval)
+            # Regrouper les arrivées proches dans une même passe
+            time.sleep(self.interval)
+            self.wake.clear()
+            if not self.running:
+                break
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Erreur de matchmaking: {e}")
@@ -0,0 +1,294 @@
+"""Migrations du schéma de matchmaking.db.
+
+Chaque étape porte un numéro de version; la table schema_version garde les
+étapes déjà appliquées. Au démarrage, les étapes manquantes sont exécutées
+dans l'ordre, chacune dans sa propre transaction. Les étapes sont aussi
+idempotentes, car les bases antérieures à schema_version ont déjà une
+partie du schéma.
+"""
+import json
+from datetime import datetime
+from models import Mastermind
+
+# Schémas des tables référencées par identifiant de joueur
+PLAYERS_SCHEMA = '''(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pseudo TEXT UNIQUE NOT NULL,
+    ip TEXT,
+    port INTEGER,
+    join_date TEXT
+)'''
+MATCHES_SCHEMA = '''(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player1_id INTEGER,
+    player2_id INTEGER,
+    board TEXT,
+    is_finished INTEGER,
+    result TEXT,
+    game_type TEXT DEFAULT 'morpion',
+    FOREIGN KEY (player1_id) REFERENCES players(id),
+    FOREIGN KEY (player2_id) REFERENCES players(id)
+)'''
+TURNS_SCHEMA = '''(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_id INTEGER,
+    player_id INTEGER,
+    move TEXT,
+    feedback TEXT,
+    grade TEXT,
+    FOREIGN KEY (match_id) REFERENCES matches(id),
+    FOREIGN KEY (player_id) REFERENCES players(id)
+)'''
+
+def columns_of(cursor, table) -> set:
+    """Noms des colonnes d'une table."""
+    return {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+
+def add_column(cursor, table, column, definition):
+    """Ajoute une colonne si elle n'existe pas encore."""
+    if column not in columns_of(cursor, table):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+def create_tables(cursor):
+    """Tables d'origine, indexées par pseudo."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS players (
+            pseudo TEXT PRIMARY KEY,
+            ip TEXT,
+            port INTEGER,
+            join_date TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS matches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player1 TEXT,
+            player2 TEXT,
+            board TEXT,
+            is_finished INTEGER,
+            result TEXT,
+            game_type TEXT DEFAULT 'morpion'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS turns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id INTEGER,
+            player TEXT,
+            move TEXT,
+            feedback TEXT,
+            FOREIGN KEY (match_id) REFERENCES matches(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS mastermind_matches (
+            match_id INTEGER PRIMARY KEY,
+            player1_code TEXT,
+            player2_code TEXT,
+            player1_guesses TEXT,
+            player2_guesses TEXT,
+            player1_feedback TEXT,
+            player2_feedback TEXT,
+            max_attempts INTEGER DEFAULT 10,
+            FOREIGN KEY (match_id) REFERENCES matches(id)
+        )
+    ''')
+    # Les toutes premières bases n'avaient que des matchs de Morpion
+    add_column(cursor, "matches", "game_type", "TEXT DEFAULT 'morpion'")
+
+def add_mastermind_variants(cursor):
+    """Nombre de pions et de couleurs des matchs de Mastermind."""
+    add_column(cursor, "mastermind_matches", "code_length", "INTEGER DEFAULT 4")
+    add_column(cursor, "mastermind_matches", "colors", "INTEGER DEFAULT 6")
+
+def add_turn_grades(cursor):
+    """Note des coups de Morpion 3×3 (table de finales)."""
+    add_column(cursor, "turns", "grade", "TEXT")
+
+def use_player_ids(cursor):
+    """Remplace les pseudos par des identifiants de joueur dans players, matches et turns."""
+    if "id" in columns_of(cursor, "players"):
+        return
+    cursor.execute(f"CREATE TABLE players_new {PLAYERS_SCHEMA}")
+    cursor.execute('''
+        INSERT INTO players_new (pseudo, ip, port, join_date)
+        SELECT pseudo, ip, port, join_date FROM players ORDER BY join_date
+    ''')
+    # Pseudos présents dans l'historique mais jamais enregistrés comme joueurs
+    cursor.execute('''
+        INSERT INTO players_new (pseudo)
+        SELECT pseudo FROM (
+            SELECT player1 AS pseudo FROM matches
+            UNION SELECT player2 FROM matches
+            UNION SELECT player FROM turns
+        )
+        WHERE pseudo IS NOT NULL AND pseudo NOT IN (SELECT pseudo FROM players_new)
+    ''')
+    cursor.execute(f"CREATE TABLE matches_new {MATCHES_SCHEMA}")
+    cursor.execute('''
+        INSERT INTO matches_new (id, player1_id, player2_id, board, is_finished, result, game_type)
+        SELECT matches.id, p1.id, p2.id, board, is_finished, result, game_type
+        FROM matches
+        LEFT JOIN players_new p1 ON p1.pseudo = matches.player1
+        LEFT JOIN players_new p2 ON p2.pseudo = matches.player2
+    ''')
+    cursor.execute(f"CREATE TABLE turns_new {TURNS_SCHEMA}")
+    cursor.execute('''
+        INSERT INTO turns_new (id, match_id, player_id, move, feedback, grade)
+        SELECT turns.id, match_id, players_new.id, move, feedback, grade
+        FROM turns LEFT JOIN players_new ON players_new.pseudo = turns.player
+    ''')
+    for table in ("players", "matches", "turns"):
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+def add_indexes(cursor):
+    """Index des requêtes d'historique, de classement et de relecture."""
+    # Coups d'un match dans l'ordre (relecture, annotation)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_turns_match ON turns(match_id, id)")
+    # Matchs terminés: couvre le recalcul des classements et l'historique par jeu
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_finished
+        ON matches(is_finished, game_type, player1_id, player2_id, result)
+    ''')
+    # Matchs d'un joueur, quel que soit son côté
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_player1 ON matches(player1_id, is_finished, game_type)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_matches_player2 ON matches(player2_id, is_finished, game_type)")
+
+def add_player_stats(cursor):
+    """Statistiques cumulées par joueur et par jeu, calculées une fois à partir de l'historique."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS player_stats (
+            player_id INTEGER,
+            game_type TEXT,
+            games INTEGER DEFAULT 0,
+            wins INTEGER DEFAULT 0,
+            losses INTEGER DEFAULT 0,
+            draws INTEGER DEFAULT 0,
+            attempts INTEGER DEFAULT 0,
+            PRIMARY KEY (player_id, game_type),
+            FOREIGN KEY (player_id) REFERENCES players(id)
+        )
+    ''')
+    # Chaque match terminé compte pour ses deux joueurs (les matchs interrompus sont ignorés)
+    cursor.execute('''
+        INSERT OR REPLACE INTO player_stats (player_id, game_type, games, wins, losses, draws, attempts)
+        SELECT player_id, game_type, COUNT(*),
+               SUM(result = pseudo),
+               SUM(result != pseudo AND result != 'draw'),
+               SUM(result = 'draw'),
+               COALESCE(SUM(json_array_length(guesses)), 0)
+        FROM (
+            SELECT matches.player1_id AS player_id, matches.game_type, matches.result,
+                   players.pseudo, mm.player1_guesses AS guesses
+            FROM matches
+            JOIN players ON players.id = matches.player1_id
+            LEFT JOIN mastermind_matches mm ON mm.match_id = matches.id
+            WHERE matches.is_finished = 1 AND matches.result != 'interrupted'
+            UNION ALL
+            SELECT matches.player2_id, matches.game_type, matches.result,
+                   players.pseudo, mm.player2_guesses
+            FROM matches
+            JOIN players ON players.id = matches.player2_id
+            LEFT JOIN mastermind_matches mm ON mm.match_id = matches.id
+            WHERE matches.is_finished = 1 AND matches.result != 'interrupted'
+        )
+        GROUP BY player_id, game_type
+    ''')
+
+def add_archive_state(cursor):
+    """État d'archivage des matchs (0: à archiver, 1: archivé, -1: ancien format laissé en base)."""
+    add_column(cursor, "matches", "archived", "INTEGER DEFAULT 0")
+    # Index partiel: seuls les matchs terminés en attente d'archivage y figurent
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_unarchived
+        ON matches(id) WHERE is_finished = 1 AND archived = 0
+    ''')
+
+def store_winner_ids(cursor):
+    """Résultat des matchs gagnés: identifiant du gagnant au lieu de son pseudo."""
+    cursor.execute('''
+        UPDATE matches SET result = CASE result
+            WHEN (SELECT pseudo FROM players WHERE players.id = matches.player1_id) THEN matches.player1_id
+            WHEN (SELECT pseudo FROM players WHERE players.id = matches.player2_id) THEN matches.player2_id
+            ELSE result
+        END
+        WHERE result IS NOT NULL AND result NOT IN ('draw', 'interrupted')
+    ''')
+
+# Couleurs des anciens matchs de Mastermind, stockées par nom (la couleur i est l'entier i)
+LEGACY_COLORS = ["red", "green", "blue", "yellow", "purple", "orange"]
+
+def pack_mastermind_codes(cursor):
+    """Codes, tentatives et coups des anciens matchs de Mastermind: noms de couleurs compactés en entiers."""
+    rows = cursor.execute('''
+        SELECT match_id, player1_code, player2_code, player1_guesses, player2_guesses, code_length, colors
+        FROM mastermind_matches
+    ''').fetchall()
+    for match_id, code1, code2, guesses1, guesses2, code_length, colors in rows:
+        codes = [json.loads(code) if code else None for code in (code1, code2)]
+        guesses = [json.loads(stored) if stored else [] for stored in (guesses1, guesses2)]
+        if not any(isinstance(code, list) for code in codes + guesses[0] + guesses[1]):
+            continue  # déjà compacté
+        game = Mastermind(code_length or 4, colors or 6)
+        pack = lambda code: game.pack([LEGACY_COLORS.index(color) for color in code]) if isinstance(code, list) else code
+        turns = cursor.execute("SELECT id, move FROM turns WHERE match_id = ? AND move LIKE '[%'", (match_id,)).fetchall()
+        try:
+            codes = [pack(code) for code in codes]
+            guesses = [[pack(guess) for guess in player_guesses] for player_guesses in guesses]
+            moves = [(str(pack(json.loads(move))), turn_id) for turn_id, move in turns]
+        except ValueError:
+            continue  # couleur inconnue: le match reste à l'ancien format
+        cursor.execute('''
+            UPDATE mastermind_matches
+            SET player1_code = ?, player2_code = ?, player1_guesses = ?, player2_guesses = ?
+            WHERE match_id = ?
+        ''', (*map(json.dumps, codes), *map(json.dumps, guesses), match_id))
+        cursor.executemany("UPDATE turns SET move = ? WHERE id = ?", moves)
+        # Laissé de côté par l'archivage tant qu'il était à l'ancien format
+        cursor.execute("UPDATE matches SET archived = 0 WHERE id = ? AND archived = -1", (match_id,))
+
+# Étapes dans l'ordre d'application: (version, migration)
+MIGRATIONS = (
+    (1, create_tables),
+    (2, add_mastermind_variants),
+    (3, add_turn_grades),
+    (4, use_player_ids),
+    (5, add_indexes),
+    (6, add_player_stats),
+    (7, add_archive_state),
+    (8, store_winner_ids),
+    (9, pack_mastermind_codes),
+)
+
+def schema_version(conn) -> int:
+    """Dernière version appliquée (0 pour une base vide ou antérieure aux migrations)."""
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+def migrate(conn) -> int:
+    """Applique les migrations manquantes et retourne la version du schéma."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TEXT
+        )
+    ''')
+    conn.commit()
+    for version, migration in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        cursor = conn.cursor()
+        # Verrou d'écriture pris d'emblée: deux serveurs démarrés ensemble ne migrent pas deux fois
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            if version > schema_version(conn):
+                migration(cursor)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
+                    (version, datetime.now().isoformat())
+                )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return schema_version(conn)
@@ -1,44 +1,68 @@
 from dataclasses import dataclass
-from datetime import datetime
 from typing import List, Optional, Tuple
 
-@dataclass
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel: score_many bascule alors en Python pur
+    np = None
+
+# Les modèles sont "slotted" (pas de __dict__ par instance): le serveur en
+# garde un grand nombre en mémoire tant que les matchs sont en cours.
+
+@dataclass(slots=True)
 class Player:
-    """Représente un joueur dans la file d'attente ou un match."""
+    """Représente un joueur dans la file d'attente ou un match.
+
+    Le joueur est identifié par id (attribué à la connexion); le pseudo ne
+    sert qu'à l'affichage.
+    """
+    id: int
     pseudo: str
     ip: str
     port: int
-    join_date: datetime
+    join_date: int  # horodatage Unix, en secondes
 
-@dataclass
+@dataclass(slots=True)
 class Match:
-    """Représente un match entre deux joueurs."""
+    """Représente un match entre deux joueurs.
+
+    Pendant la partie, board est l'objet de jeu lui-même (TicTacToe,
+    ConnectFour), partagé avec l'acteur du match plutôt que recopié à chaque
+    coup: str(board) en donne la forme compacte écrite en base. Relu depuis
+    la base, board est cette forme compacte.
+    """
     id: int 
     player1: Player
     player2: Player
-    board: list  
+    board: object  
     is_finished: bool
-    result: str 
+    result: object  # identifiant du gagnant, "draw", "interrupted" ou None
     game_type: str = "morpion"  
 
-@dataclass
+@dataclass(slots=True)
 class Turn:
     """Représente un tour joué dans un match."""
     match_id: int
     player: Player
     move: int  
     feedback: list = None  
+    grade: str = None  # qualité du coup selon la table de finales du Morpion
 
-@dataclass
+@dataclass(slots=True)
 class MastermindMatch(Match):
-    """Représente un match de Mastermind entre deux joueurs."""
-    player1_code: list = None  
-    player2_code: list = None  
+    """Représente un match de Mastermind entre deux joueurs.
+
+    Codes et tentatives sont des entiers compacts (voir Mastermind.pack).
+    """
+    player1_code: int = None  
+    player2_code: int = None  
     player1_guesses: list = None  
     player2_guesses: list = None  
     player1_feedback: list = None  
     player2_feedback: list = None  
     max_attempts: int = 10  
+    code_length: int = 4
+    colors: int = 6
 
     def __post_init__(self):
         if self.player1_guesses is None:
@@ -51,83 +75,312 @@ class MastermindMatch(Match):
             self.player2_feedback = []
         self.game_type = "mastermind"
 
+@dataclass(slots=True)
+class ConnectFourMatch(Match):
+    """Représente un match de Puissance 4 entre deux joueurs.
+
+    Le plateau est stocké sous forme compacte: les deux bitboards en
+    hexadécimal (voir ConnectFour.encode).
+    """
+    def __post_init__(self):
+        self.game_type = "puissance4"
+
 class TicTacToe:
-    """Logique du jeu Morpion."""
-    def __init__(self):
-        self.board = [" " for _ in range(9)] 
+    """Logique du jeu Morpion sur un plateau N×N, gagné avec K pions alignés.
+
+    Le plateau est creux: seules les cases jouées sont stockées, ce qui
+    garde les grands plateaux (Gomoku 15×15) peu coûteux en mémoire et en
+    base. La victoire se vérifie en comptant, dans chaque direction, la suite
+    de pions identiques autour du dernier coup: O(K) au lieu de parcourir
+    tout le plateau.
+    """
+    __slots__ = ("size", "win_length", "cells", "last_move", "rays")
+    DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))  # ligne, colonne, diagonales
+    _rays = {}  # (taille, K) -> rayons précalculés, partagés entre les parties
+
+    def __init__(self, size=3, win_length=3):
+        self.size = size
+        self.win_length = win_length
+        self.cells = {}  # position -> symbole, dans l'ordre des coups
+        self.last_move = None
+        self.rays = self._rays.get((size, win_length)) or self._build_rays(size, win_length)
+
+    @classmethod
+    def _build_rays(cls, size, win_length):
+        """Pour chaque case et direction, les K-1 cases de chaque côté (bornées par le plateau)."""
+        rays = []
+        for position in range(size * size):
+            row, column = divmod(position, size)
+            directions = []
+            for d_row, d_column in cls.DIRECTIONS:
+                sides = []
+                for sign in (1, -1):
+                    side = []
+                    r, c = row + sign * d_row, column + sign * d_column
+                    while len(side) < win_length - 1 and 0 <= r < size and 0 <= c < size:
+                        side.append(r * size + c)
+                        r += sign * d_row
+                        c += sign * d_column
+                    sides.append(tuple(side))
+                directions.append(tuple(sides))
+            rays.append(tuple(directions))
+        cls._rays[(size, win_length)] = rays
+        return rays
 
     def play_move(self, position: int, player: str) -> bool:
         """Joue un coup à la position donnée si valide."""
-        if 0 <= position < 9 and self.board[position] == " ":
-            self.board[position] = player
+        if 0 <= position < self.size * self.size and position not in self.cells:
+            self.cells[position] = player
+            self.last_move = position
             return True
         return False
 
     def check_winner(self) -> str:
-        """Vérifie s'il y a un gagnant ou une égalité."""
-        # Combinaisons gagnantes : lignes, colonnes, diagonales
-        win_conditions = [
-            (0, 1, 2), (3, 4, 5), (6, 7, 8),  # Lignes
-            (0, 3, 6), (1, 4, 7), (2, 5, 8),  # Colonnes
-            (0, 4, 8), (2, 4, 6)              # Diagonales
-        ]
-        for a, b, c in win_conditions:
-            if self.board[a] == self.board[b] == self.board[c] != " ":
-                return self.board[a]  # Retourne "X" ou "O"
-        if " " not in self.board:
+        """Vérifie si le dernier coup est gagnant, ou s'il y a égalité."""
+        if self.last_move is None:
+            return None
+        cells, needed = self.cells, self.win_length
+        symbol = cells[self.last_move]
+        # Compter la suite de pions identiques de part et d'autre du dernier coup
+        for forward, backward in self.rays[self.last_move]:
+            count = 1
+            for position in forward:
+                if cells.get(position) != symbol:
+                    break
+                count += 1
+            for position in backward:
+                if cells.get(position) != symbol:
+                    break
+                count += 1
+            if count >= needed:
+                return symbol  # Retourne "X" ou "O"
+        if len(cells) == self.size * self.size:
+            return "draw"
+        return None
+
+    @property
+    def board(self) -> list:
+        """Plateau complet sous forme de liste de cases (" ", "X" ou "O")."""
+        board = [" "] * (self.size * self.size)
+        for position, symbol in self.cells.items():
+            board[position] = symbol
+        return board
+
+    def grid(self) -> list:
+        """Plateau sous forme de lignes de symboles, pour l'affichage."""
+        board = self.board
+        return [board[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+    def encode(self) -> str:
+        """Représentation creuse du plateau pour la base de données, ex: "3x3:4X,0O"."""
+        moves = ",".join(f"{position}{symbol}" for position, symbol in self.cells.items())
+        return f"{self.size}x{self.win_length}:{moves}"
+
+    __str__ = encode  # forme écrite en base quand le plateau est partagé avec le match
+
+    @classmethod
+    def decode(cls, board: str) -> "TicTacToe":
+        """Reconstruit un plateau à partir de sa représentation creuse."""
+        header, _, moves = board.partition(":")
+        size, win_length = (int(value) for value in header.split("x"))
+        game = cls(size, win_length)
+        for move in filter(None, moves.split(",")):
+            game.play_move(int(move[:-1]), move[-1])
+        return game
+
+class ConnectFour:
+    """Logique du jeu Puissance 4 sur bitboards.
+
+    Chaque joueur a un entier dont les bits sont les cases occupées. Les
+    colonnes sont codées sur ROWS + 1 bits (une ligne sentinelle vide), ce
+    qui permet de détecter un alignement de 4 par décalages successifs du
+    masque, en temps constant, sans jamais déborder d'une colonne à l'autre.
+    """
+    __slots__ = ("masks", "heights", "moves", "last_player")
+    COLUMNS = 7
+    ROWS = 6
+    HEIGHT = ROWS + 1
+    SYMBOLS = ("X", "O")
+
+    def __init__(self):
+        self.masks = [0, 0]  # bitboards du joueur X et du joueur O
+        self.heights = [column * self.HEIGHT for column in range(self.COLUMNS)]  # prochain bit libre par colonne
+        self.moves = 0
+        self.last_player = None
+
+    def play_move(self, column: int, player: str):
+        """Fait tomber un pion dans la colonne. Retourne la ligne atteinte, ou None si le coup est invalide."""
+        turn = self.moves & 1
+        # X commence, puis les joueurs alternent
+        if player != self.SYMBOLS[turn] or not 0 <= column < self.COLUMNS:
+            return None
+        bit = self.heights[column]
+        row = bit - column * self.HEIGHT
+        if row >= self.ROWS:
+            return None
+        self.masks[turn] |= 1 << bit
+        self.heights[column] = bit + 1
+        self.moves += 1
+        self.last_player = player
+        return row
+
+    @staticmethod
+    def has_four(mask: int) -> bool:
+        """Vérifie si un bitboard contient un alignement de 4 (décalages déroulés)."""
+        pairs = mask & (mask >> 1)          # vertical
+        if pairs & (pairs >> 2):
+            return True
+        pairs = mask & (mask >> 7)          # horizontal (HEIGHT)
+        if pairs & (pairs >> 14):
+            return True
+        pairs = mask & (mask >> 8)          # diagonale / (HEIGHT + 1)
+        if pairs & (pairs >> 16):
+            return True
+        pairs = mask & (mask >> 6)          # diagonale \ (HEIGHT - 1)
+        return bool(pairs & (pairs >> 12))
+
+    def check_winner(self) -> str:
+        """Vérifie si le dernier joueur a gagné, ou s'il y a égalité."""
+        moves = self.moves
+        if not moves:
+            return None
+        # Seul le joueur qui vient de jouer peut avoir gagné
+        if self.has_four(self.masks[(moves - 1) & 1]):
+            return self.last_player
+        if moves == 42:  # COLUMNS * ROWS
             return "draw"
         return None
 
+    def encode(self) -> str:
+        """Représentation compacte du plateau pour la base de données."""
+        return f"{self.masks[0]:x},{self.masks[1]:x}"
+
+    __str__ = encode  # forme écrite en base quand le plateau est partagé avec le match
+
+    @classmethod
+    def decode(cls, board: str) -> "ConnectFour":
+        """Reconstruit un plateau à partir de sa représentation compacte."""
+        game = cls()
+        game.masks = [int(mask, 16) for mask in board.split(",")]
+        occupied = game.masks[0] | game.masks[1]
+        for column in range(cls.COLUMNS):
+            while occupied >> game.heights[column] & 1:
+                game.heights[column] += 1
+        game.moves = bin(occupied).count("1")
+        if game.moves:
+            game.last_player = cls.SYMBOLS[(game.moves - 1) % 2]
+        return game
+
+    def grid(self) -> list:
+        """Plateau sous forme de lignes (de haut en bas) de symboles, pour l'affichage."""
+        rows = []
+        for row in reversed(range(self.ROWS)):
+            line = []
+            for column in range(self.COLUMNS):
+                bit = 1 << (column * self.HEIGHT + row)
+                line.append("X" if self.masks[0] & bit else "O" if self.masks[1] & bit else " ")
+            rows.append(line)
+        return rows
+
 class Mastermind:
-    """Logique du jeu Mastermind."""
-    def __init__(self, code_length=4, colors=None, max_attempts=10):
+    """Logique du jeu Mastermind.
+
+    Les couleurs sont des entiers de 0 à colors - 1 et un code est compacté
+    en un seul entier: le pion i est le i-ème chiffre en base colors (voir
+    pack). C'est sous cette forme que les codes circulent sur le réseau et
+    sont stockés en base, quelle que soit la variante.
+    """
+    __slots__ = ("code_length", "colors", "max_attempts")
+
+    def __init__(self, code_length=4, colors=6, max_attempts=10):
         self.code_length = code_length
-        self.colors = colors or ["red", "green", "blue", "yellow", "purple", "orange"]
+        self.colors = colors
         self.max_attempts = max_attempts
 
-    def check_guess(self, code: List[str], guess: List[str]) -> Tuple[int, int]:
+    def pack(self, pegs: List[int]) -> int:
+        """Compacte une liste de couleurs en un entier."""
+        code = 0
+        for peg in reversed(pegs):
+            code = code * self.colors + peg
+        return code
+
+    def unpack(self, code: int) -> List[int]:
+        """Décompacte un entier en liste de couleurs."""
+        pegs = []
+        for _ in range(self.code_length):
+            code, peg = divmod(code, self.colors)
+            pegs.append(peg)
+        return pegs
+
+    def is_valid(self, code) -> bool:
+        """Vérifie qu'une valeur reçue est un code compact de cette variante."""
+        return type(code) is int and 0 <= code < self.colors ** self.code_length
+
+    def check_guess(self, code: int, guess: int) -> Tuple[int, int]:
         """
         Vérifie une tentative et retourne le feedback.
+
+        Les pions sont lus chiffre par chiffre dans les deux entiers, et les
+        couleurs mal placées sont comptées dans deux tableaux de taille
+        colors: O(code_length + colors), sans copie de liste.
         
         Args:
-            code: Le code secret à deviner
-            guess: La tentative du joueur
+            code: Le code secret à deviner (entier compact)
+            guess: La tentative du joueur (entier compact)
             
         Returns:
             Tuple[int, int]: (nombre de pions noirs, nombre de pions blancs)
             - Pions noirs: bonne couleur à la bonne position
             - Pions blancs: bonne couleur mais mauvaise position
         """
-        if len(code) != len(guess):
-            raise ValueError("Le code et la tentative doivent avoir la même longueur")
-            
-        # Copie des listes pour ne pas modifier les originales
-        code_copy = code.copy()
-        guess_copy = guess.copy()
-        
-        # Compter les pions noirs (bonne couleur, bonne position)
+        colors = self.colors
+        code_counts = [0] * colors
+        guess_counts = [0] * colors
         black_pins = 0
-        for i in range(len(code)):
-            if i < len(guess) and code[i] == guess[i]:
+        for _ in range(self.code_length):
+            code, code_peg = divmod(code, colors)
+            guess, guess_peg = divmod(guess, colors)
+            if code_peg == guess_peg:
                 black_pins += 1
-                code_copy[i] = None  # Marquer comme traité
-                guess_copy[i] = None  # Marquer comme traité
-        
-        # Compter les pions blancs (bonne couleur, mauvaise position)
-        white_pins = 0
-        for i in range(len(guess_copy)):
-            if guess_copy[i] is not None:
-                for j in range(len(code_copy)):
-                    if code_copy[j] is not None and guess_copy[i] == code_copy[j]:
-                        white_pins += 1
-                        code_copy[j] = None  
-                        break
-        
+            else:
+                code_counts[code_peg] += 1
+                guess_counts[guess_peg] += 1
+        white_pins = sum(map(min, code_counts, guess_counts))
         return (black_pins, white_pins)
 
-    def is_correct(self, code: List[str], guess: List[str]) -> bool:
+    def fits_int64(self) -> bool:
+        """Vrai si tous les codes de la variante tiennent dans un entier NumPy 64 bits."""
+        return self.colors ** self.code_length <= 2 ** 62
+
+    def unpack_many(self, codes):
+        """Décompacte un tableau NumPy de codes en matrice (codes x pions) de couleurs."""
+        powers = self.colors ** np.arange(self.code_length, dtype=np.int64)
+        return (np.asarray(codes, dtype=np.int64)[:, None] // powers) % self.colors
+
+    def score_many(self, guess: int, codes):
+        """
+        Score une même tentative contre plusieurs codes à la fois.
+
+        Retourne deux tableaux (pions noirs, pions blancs) alignés sur codes.
+        Vectorisé avec NumPy quand il est disponible et que les codes tiennent
+        sur 64 bits, en Python pur sinon (listes).
+        """
+        if np is None or not self.fits_int64():
+            scores = [self.check_guess(code, guess) for code in codes]
+            return [black for black, _ in scores], [white for _, white in scores]
+        digits = self.unpack_many(codes)
+        guess_digits = self.unpack_many([guess])[0]
+        black = (digits == guess_digits).sum(axis=1)
+        # Histogramme des couleurs de chaque code en un seul bincount
+        rows = len(digits)
+        offsets = (np.arange(rows, dtype=np.int64) * self.colors)[:, None]
+        code_counts = np.bincount((digits + offsets).ravel(), minlength=rows * self.colors).reshape(rows, self.colors)
+        guess_counts = np.bincount(guess_digits, minlength=self.colors)
+        white = np.minimum(code_counts, guess_counts).sum(axis=1) - black
+        return black, white
+
+    def is_correct(self, code: int, guess: int) -> bool:
         """Vérifie si la tentative est correcte (tous les pions sont noirs)."""
-        black_pins, _ = self.check_guess(code, guess)
-        return black_pins == len(code)
+        return code == guess
 
 print("Models mis à jour avec succès!")
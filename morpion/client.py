@@ -1,19 +1,22 @@
 import socket
 import threading
 import json
+import time
 import tkinter as tk
 from tkinter import messagebox, ttk
 
 from morpion.ui.main_menu_ui import setup_main_menu_ui
-from morpion.ui.waiting_ui import setup_waiting_ui
+from morpion.ui.waiting_ui import setup_waiting_ui, update_lobby_ui
 from morpion.ui.game_ui import setup_game_ui
 from morpion.ui.result_ui import setup_result_ui
 from morpion.ui.stats_ui import setup_stats_ui
+from morpion.ui.replay_ui import setup_replay_ui
 from morpion.config import Config
+from protocol import read_messages
 
 class MorpionClient:
     """Client pour jouer au Morpion en 1v1."""
-    def __init__(self, pseudo, client_socket=None, parent_root=None, host="localhost", port=12345):
+    def __init__(self, pseudo, client_socket=None, parent_root=None, host="localhost", port=12345, resume_token=None):
         # Si un socket client est fourni, l'utiliser, sinon en créer un nouveau
         if client_socket:
             self.client = client_socket
@@ -27,14 +30,35 @@ class MorpionClient:
                 return
             
         self.pseudo = pseudo
+        self.server_address = self.client.getpeername()
+        self.resume_token = resume_token  # jeton reçu au CONNECT, pour reprendre un match après une coupure
+        self.reconnecting = False  # CONNECT envoyé après un jeton refusé, RESUME à suivre
+        self.last_seq = 0  # numéro du dernier message du match reçu
+        self.listening = False
         self.parent_root = parent_root
         self.match_id = None
         self.opponent = None
         self.symbol = None
         self.is_my_turn = False
+        self.deadline = None  # fin du temps pour jouer (time.monotonic), None sans pendule
+        self.clock_job = None  # rafraîchissement du décompte
         self.in_queue = False
+        self.lobby = None  # état du salon (LOBBY) pendant l'attente, None sans abonnement
+        self.variant = 0  # index dans Config.VARIANTS
+        self.clock = False  # pendule demandée au JOIN (sur option)
+        self.size = 3
+        self.win_length = 3
         
-        # Statistiques du joueur
+        # Relecture de la dernière partie (coups reçus par pages)
+        self.last_match_id = None
+        self.replay_turns = []
+        self.replay_next = None
+        self.replay_playing = False
+        self.replay_frame = None
+        self.replay_count = 0
+        self.replay_result = None
+        
+        # Statistiques du joueur (tenues par le serveur, voir show_statistics)
         self.stats = {
             "games_played": 0,
             "wins": 0,
@@ -74,11 +98,25 @@ class MorpionClient:
     def setup_main_menu(self):
         """Configure le menu principal."""
         setup_main_menu_ui(self)
+        self.unsubscribe_lobby()
         # Lancer l'écoute du serveur
-        threading.Thread(target=self.listen_server, daemon=True).start()
+        if not self.listening:
+            self.listening = True  # un seul thread lit le socket
+            threading.Thread(target=self.listen_server, daemon=True).start()
 
     def show_statistics(self):
-        """Affiche les statistiques du joueur."""
+        """Demande au serveur les statistiques du joueur; l'écran s'affiche à la réponse."""
+        message = json.dumps({"action": "STATS", "game_type": "morpion"})
+        self.client.send(message.encode())
+
+    def update_statistics(self, stats):
+        """Affiche les statistiques envoyées par le serveur."""
+        self.stats = {
+            "games_played": stats.get("games", 0),
+            "wins": stats.get("wins", 0),
+            "losses": stats.get("losses", 0),
+            "draws": stats.get("draws", 0)
+        }
         setup_stats_ui(self)
 
     def quit_game(self):
@@ -100,13 +138,42 @@ class MorpionClient:
 
     def setup_waiting_ui(self):
         """Configure l'écran pour rejoindre ou quitter la file."""
+        self.root.geometry("600x500")  # taille d'origine après un grand plateau
         setup_waiting_ui(self)
+        self.subscribe_lobby()
+
+    def subscribe_lobby(self):
+        """S'abonne au salon pour l'écran d'attente; l'état complet arrive au prochain envoi."""
+        if self.lobby is not None:
+            update_lobby_ui(self)
+            return
+        self.lobby = {}
+        self.client.send(json.dumps({"action": "LOBBY_SUBSCRIBE"}).encode())
+
+    def unsubscribe_lobby(self):
+        """Se désabonne du salon en quittant l'écran d'attente."""
+        if self.lobby is None:
+            return
+        self.lobby = None
+        self.client.send(json.dumps({"action": "LOBBY_UNSUBSCRIBE"}).encode())
+
+    def update_lobby(self, message):
+        """Applique un message LOBBY (état complet ou changements) et met à jour l'écran d'attente."""
+        if self.lobby is None:
+            return
+        for key, value in message.items():
+            if key == "queues":
+                self.lobby.setdefault("queues", {}).update(value)
+            elif key != "action":
+                self.lobby[key] = value
+        update_lobby_ui(self)
 
     def join_queue(self):
         """Envoie une requête pour rejoindre la file d'attente."""
         if self.in_queue:
             return
-        message = json.dumps({"action": "JOIN", "pseudo": self.pseudo})
+        _, size, win_length = Config.VARIANTS[self.variant_var.get()]
+        message = json.dumps({"action": "JOIN", "pseudo": self.pseudo, "size": size, "win_length": win_length, "clock": self.clock})
         self.client.send(message.encode())
         self.in_queue = True
         self.status_label.config(text="Vous êtes dans la file d'attente...")
@@ -133,6 +200,8 @@ class MorpionClient:
         """Joue un coup si c'est au tour du joueur."""
         if not self.is_my_turn or self.buttons[position]["text"] != " ":
             return
+        for button in self.buttons:
+            button["bg"] = "white"  # effacer un éventuel indice
         self.buttons[position]["text"] = self.symbol
         self.buttons[position]["fg"] = "#4a6ea9" if self.symbol == "X" else "#d9534f"
         self.is_my_turn = False
@@ -145,15 +214,42 @@ class MorpionClient:
         })
         self.client.send(message.encode())
 
+    def request_hint(self):
+        """Demande au serveur le meilleur coup (Morpion 3×3)."""
+        if not self.is_my_turn:
+            return
+        message = json.dumps({"action": "HINT", "pseudo": self.pseudo, "match_id": self.match_id})
+        self.client.send(message.encode())
+
+    def show_hint(self, position, outcome):
+        """Met en évidence la case conseillée."""
+        if position is None:
+            messagebox.showinfo("Indice", "Pas d'indice disponible pour ce plateau.")
+            return
+        outcomes = {"win": "victoire", "draw": "match nul", "loss": "défaite"}
+        self.buttons[position]["bg"] = "#f0ad4e"
+        self.status_label.config(text=f"Indice: jouez la case en surbrillance ({outcomes[outcome]} attendue)")
+
     def update_board(self, position, symbol):
         """Met à jour le plateau avec le coup de l'adversaire."""
         self.buttons[position]["text"] = symbol
         self.buttons[position]["fg"] = "#4a6ea9" if symbol == "X" else "#d9534f"
 
+    def set_deadline(self, time_left):
+        """Note le temps laissé par le serveur pour jouer le prochain coup."""
+        self.deadline = time.monotonic() + time_left if time_left is not None else None
+
     def update_status(self):
         """Met à jour le message de statut."""
-        if hasattr(self, 'status_label'):
-            if self.is_my_turn:
+        if self.clock_job is not None:
+            self.root.after_cancel(self.clock_job)
+            self.clock_job = None
+        if hasattr(self, 'status_label') and self.status_label.winfo_exists():
+            if self.is_my_turn and self.deadline is not None:
+                seconds = max(0, int(self.deadline - time.monotonic()))
+                self.status_label.config(text=f"À votre tour ! ({seconds} s)", fg="#5cb85c")
+                self.clock_job = self.root.after(1000, self.update_status)
+            elif self.is_my_turn:
                 self.status_label.config(text="À votre tour !", fg="#5cb85c")
             elif self.in_queue:
                 self.status_label.config(text="Vous êtes dans la file d'attente...", fg=self.text_color)
@@ -163,24 +259,23 @@ class MorpionClient:
                 else:
                     self.status_label.config(text="Vous n'êtes pas dans la file d'attente.", fg=self.text_color)
 
-    def end_game(self, result):
+    def end_game(self, result, reason=None):
         """Affiche le résultat du match."""
-        # Mettre à jour les statistiques
-        self.stats["games_played"] += 1
-        if result == self.pseudo:
-            self.stats["wins"] += 1
+        if reason == "timeout":
+            message = "Temps écoulé, vous avez gagné !" if result == self.pseudo else "Temps écoulé, vous avez perdu."
+            color = "#5cb85c" if result == self.pseudo else "#d9534f"
+        elif result == self.pseudo:
             message = "Vous avez gagné !"
             color = "#5cb85c"  # Vert
         elif result == "draw":
-            self.stats["draws"] += 1
             message = "Match nul !"
             color = "#f0ad4e"  # Orange
         else:
-            self.stats["losses"] += 1
             message = f"{self.opponent} a gagné !"
             color = "#d9534f"  # Rouge
             
         # Afficher le résultat
+        self.last_match_id = self.match_id
         setup_result_ui(self, message, color)
         
         # Réinitialiser les variables de jeu
@@ -188,6 +283,48 @@ class MorpionClient:
         self.match_id = None
         self.symbol = None
         self.is_my_turn = False
+        self.deadline = None
+
+    def request_replay(self, after=0):
+        """Demande au serveur une page de coups de la dernière partie."""
+        if after == 0:
+            self.replay_turns = []
+            self.replay_frame = None
+        message = json.dumps({"action": "REPLAY", "match_id": self.last_match_id, "after": after})
+        self.client.send(message.encode())
+
+    def show_replay_frame(self, message):
+        """Ajoute une page de coups à la relecture et demande la suivante sans attendre la fin de l'affichage."""
+        if self.replay_frame is None:
+            setup_replay_ui(self, message)
+            self.replay_count = 0
+            self.replay_result = message["result"]
+        self.replay_turns.extend(message["turns"])
+        self.replay_next = message["next"]
+        if self.replay_next is not None:
+            self.request_replay(self.replay_next)
+        if not self.replay_playing:
+            self.replay_playing = True
+            self.replay_step()
+
+    def replay_step(self):
+        """Affiche le coup suivant de la relecture."""
+        if self.current_frame is not self.replay_frame:
+            self.replay_playing = False  # relecture quittée
+            return
+        if not self.replay_turns:
+            self.replay_playing = False
+            if self.replay_next is None:
+                result = "Match nul" if self.replay_result == "draw" else f"Victoire de {self.replay_result}"
+                self.replay_status.config(text=f"Fin de la relecture: {result}")
+            return
+        side, position, _ = self.replay_turns.pop(0)
+        symbol = "X" if side == 1 else "O"
+        self.replay_cells[position]["text"] = symbol
+        self.replay_cells[position]["fg"] = "#4a6ea9" if symbol == "X" else "#d9534f"
+        self.replay_count += 1
+        self.replay_status.config(text=f"Coup {self.replay_count}")
+        self.root.after(Config.REPLAY_DELAY, self.replay_step)
 
     def forfeit_game(self):
         """Abandonne la partie en cours."""
@@ -202,43 +339,110 @@ class MorpionClient:
         self.match_id = None
         self.symbol = None
         self.is_my_turn = False
+        self.deadline = None
         self.setup_main_menu()
 
+    def resume_session(self):
+        """Rouvre la connexion perdue pendant un match et la reprend (RESUME); retourne le nouveau socket ou None."""
+        if self.resume_token is None or self.match_id is None:
+            return None
+        for _ in range(Config.RESUME_ATTEMPTS):
+            time.sleep(Config.RESUME_DELAY)
+            try:
+                client_socket = socket.create_connection(self.server_address)
+                self.send_resume(client_socket)
+            except OSError:
+                continue
+            self.client = client_socket
+            self.reconnecting = False
+            return client_socket
+        return None
+
+    def send_resume(self, client_socket):
+        """Demande la reprise du match en cours avec le jeton actuel."""
+        client_socket.send(json.dumps({
+            "action": "RESUME",
+            "token": self.resume_token,
+            "match_id": self.match_id,
+            "last_seq": self.last_seq
+        }).encode())
+
+    def reconnect(self, message):
+        """Réponse au CONNECT envoyé après un jeton refusé: reprend le match avec le nouveau jeton."""
+        self.reconnecting = False
+        if message["status"] == "OK":
+            self.resume_token = message["resume_token"]
+            self.send_resume(self.client)
+        else:
+            self.root.after(0, self.handle_match_interrupted, message["message"])
+
     def listen_server(self):
         """Écoute les messages du serveur."""
         try:
-            while True:
-                data = self.client.recv(1024).decode()
-                if not data:
-                    break
-                message = json.loads(data)
+            for message in read_messages(self.client, self.resume_session):
                 action = message["action"]
+                # Les messages d'un match sont numérotés par le serveur
+                self.last_seq = message.get("seq", self.last_seq)
 
                 if action == "CONNECT":
-                    # Réponse déjà gérée dans validate_pseudo
-                    pass
+                    # Réponse déjà gérée dans validate_pseudo, sauf après un jeton de reprise refusé
+                    if self.reconnecting:
+                        self.reconnect(message)
+                elif action == "PING":
+                    self.client.send(json.dumps({"action": "PONG"}).encode())
                 elif action == "START":
                     self.opponent = message["opponent"]
                     self.match_id = message["match_id"]
+                    # Après une reprise dont les messages manqués sont perdus: START avec l'état complet (resync)
+                    self.last_seq = message.get("seq", 0)
                     self.symbol = message["symbol"]
-                    self.is_my_turn = self.symbol == "X"
+                    self.size = message.get("size", 3)
+                    self.win_length = message.get("win_length", 3)
+                    self.is_my_turn = message.get("your_turn", self.symbol == "X")
+                    limits = [limit for limit in (message.get("turn_time"), message.get("game_time")) if limit is not None]
+                    if message.get("resync"):
+                        self.set_deadline(message.get("time_left"))
+                    else:
+                        self.set_deadline(min(limits) if limits and self.is_my_turn else None)
                     self.in_queue = False
+                    self.root.after(0, self.unsubscribe_lobby)
                     self.root.after(0, self.setup_game_ui)
+                    for position, symbol in message.get("moves", []):
+                        self.root.after(0, self.update_board, position, symbol)
                     self.root.after(100, self.update_status)
                 elif action == "MOVE":
                     position = message["position"]
                     symbol = message["symbol"]
                     self.root.after(0, self.update_board, position, symbol)
+                    self.set_deadline(message.get("time_left"))
                     self.is_my_turn = True
                     self.root.after(0, self.update_status)
+                elif action == "LOBBY":
+                    self.root.after(0, self.update_lobby, message)
+                elif action == "HINT":
+                    self.root.after(0, self.show_hint, message["position"], message["outcome"])
+                elif action == "STATS" and message.get("game_type") == "morpion":
+                    stats = message["stats"].get("morpion", {})
+                    self.root.after(0, self.update_statistics, stats)
+                elif action == "REPLAY" and message.get("game_type") == "morpion":
+                    self.root.after(0, self.show_replay_frame, message)
                 elif action == "END":
                     result = message["result"]
-                    self.root.after(0, self.end_game, result)
+                    self.root.after(0, self.end_game, result, message.get("reason"))
                 elif action == "LEFT_QUEUE":
                     self.in_queue = False
                     self.root.after(0, lambda: self.status_label.config(text="Vous avez quitté la file d'attente."))
                     self.root.after(0, lambda: self.join_button.config(state=tk.NORMAL))
                     self.root.after(0, lambda: self.leave_button.config(state=tk.DISABLED))
+                elif action == "RESUME":
+                    if message["status"] != "OK" and "token" not in message and not self.reconnecting:
+                        # Jeton inconnu du serveur (redémarré entre-temps): nouvelle identification, puis RESUME
+                        self.reconnecting = True
+                        self.client.send(json.dumps({"action": "CONNECT", "pseudo": self.pseudo}).encode())
+                        continue
+                    self.resume_token = message.get("token", self.resume_token)
+                    if message["status"] != "OK":
+                        self.root.after(0, self.handle_match_interrupted, message["message"])
                 elif action == "MATCH_INTERRUPTED":
                     self.root.after(0, self.handle_match_interrupted, message["message"])
 
@@ -9,3 +9,17 @@ class Config:
     SUCCESS_COLOR = "#5cb85c"
     WARNING_COLOR = "#f0ad4e"
     DANGER_COLOR = "#d9534f"
+
+    # Reprise d'un match après une coupure: tentatives de reconnexion et délai entre deux (s)
+    RESUME_ATTEMPTS = 5
+    RESUME_DELAY = 1.0
+
+    # Délai entre deux coups d'une relecture (ms)
+    REPLAY_DELAY = 500
+
+    # Variantes proposées: (libellé, taille du plateau, pions à aligner)
+    VARIANTS = [
+        ("Classique 3×3", 3, 3),
+        ("Gomoku 15×15", 15, 5),
+        ("Gomoku 19×19", 19, 5),
+    ]
@@ -13,7 +13,7 @@ def setup_game_ui(client):
     # Titre du jeu
     game_title = tk.Label(
         client.current_frame, 
-        text=f"Morpion: {client.pseudo} ({client.symbol}) vs {client.opponent}", 
+        text=f"Morpion {client.size}×{client.size}: {client.pseudo} ({client.symbol}) vs {client.opponent}", 
         font=("Helvetica", 16, "bold"), 
         bg=client.bg_color, 
         fg=client.accent_color
@@ -24,22 +24,26 @@ def setup_game_ui(client):
     game_frame = tk.Frame(client.current_frame, bg=client.bg_color)
     game_frame.pack(pady=10)
     
-    # Plateau de jeu
+    # Plateau de jeu (cases plus petites pour les grands plateaux)
+    size = client.size
+    large = size > 3
+    if large:
+        client.root.geometry("")  # ajuster la fenêtre au plateau
     client.buttons = []
-    for i in range(9):
+    for i in range(size * size):
         btn = tk.Button(
             game_frame, 
             text=" ", 
-            font=("Helvetica", 24, "bold"), 
-            width=3, 
+            font=("Helvetica", 9 if large else 24, "bold"), 
+            width=2 if large else 3, 
             height=1, 
-            bd=2, 
+            bd=1 if large else 2, 
             relief=tk.RAISED, 
             command=lambda x=i: client.play_move(x),
             bg="white",
             activebackground="#e6e6e6"
         )
-        btn.grid(row=i//3, column=i%3, padx=5, pady=5)
+        btn.grid(row=i//size, column=i%size, padx=0 if large else 5, pady=0 if large else 5)
         client.buttons.append(btn)
     
     # Status du jeu
@@ -52,6 +56,23 @@ def setup_game_ui(client):
     )
     client.status_label.pack(pady=20)
     
+    # Bouton pour demander un indice (Morpion 3×3)
+    if client.size == 3:
+        hint_button = tk.Button(
+            client.current_frame, 
+            text="Indice", 
+            font=("Helvetica", 12), 
+            bg="#5cb85c", 
+            fg="white", 
+            padx=10, 
+            pady=3, 
+            bd=0, 
+            relief=tk.FLAT, 
+            command=client.request_hint,
+            activebackground="#449d44"
+        )
+        hint_button.pack(pady=5)
+    
     # Bouton pour abandonner
     forfeit_button = tk.Button(
         client.current_frame, 
@@ -0,0 +1,71 @@
+import tkinter as tk
+
+def setup_replay_ui(client, message):
+    """Affiche le plateau vide d'une relecture; les coups s'y ajoutent au fil des pages reçues."""
+    if client.current_frame:
+        client.current_frame.destroy()
+        
+    client.current_frame = tk.Frame(client.root, bg=client.bg_color)
+    client.current_frame.pack(fill="both", expand=True)
+    client.replay_frame = client.current_frame
+    
+    client.root.title(f"Morpion - Relecture du match {message['match_id']}")
+    
+    # Titre de la relecture
+    title_label = tk.Label(
+        client.current_frame, 
+        text=f"Relecture: {message['player1']} (X) vs {message['player2']} (O)", 
+        font=("Helvetica", 16, "bold"), 
+        bg=client.bg_color, 
+        fg=client.accent_color
+    )
+    title_label.pack(pady=(20, 10))
+    
+    # Plateau en lecture seule
+    board_frame = tk.Frame(client.current_frame, bg=client.bg_color)
+    board_frame.pack(pady=10)
+    
+    size = message.get("size", 3)
+    large = size > 3
+    if large:
+        client.root.geometry("")  # ajuster la fenêtre au plateau
+    client.replay_cells = []
+    for i in range(size * size):
+        cell = tk.Label(
+            board_frame, 
+            text=" ", 
+            font=("Helvetica", 9 if large else 24, "bold"), 
+            width=2 if large else 3, 
+            height=1, 
+            bd=1 if large else 2, 
+            relief=tk.RAISED, 
+            bg="white"
+        )
+        cell.grid(row=i//size, column=i%size, padx=0 if large else 5, pady=0 if large else 5)
+        client.replay_cells.append(cell)
+    
+    # Avancement de la relecture
+    client.replay_status = tk.Label(
+        client.current_frame, 
+        text="Chargement des coups...", 
+        font=("Helvetica", 14), 
+        bg=client.bg_color, 
+        fg=client.text_color
+    )
+    client.replay_status.pack(pady=20)
+    
+    # Bouton pour revenir au menu
+    back_button = tk.Button(
+        client.current_frame, 
+        text="Retour au Menu", 
+        font=("Helvetica", 12, "bold"), 
+        bg=client.button_color, 
+        fg="white", 
+        padx=20, 
+        pady=5, 
+        bd=0, 
+        relief=tk.FLAT, 
+        command=client.setup_main_menu,
+        activebackground=client.button_hover
+    )
+    back_button.pack(pady=10)
@@ -63,3 +63,20 @@ def setup_result_ui(client, message, color):
         activebackground=client.button_hover
     )
     menu_button.grid(row=0, column=1, padx=10, pady=10)
+    
+    # Bouton pour revoir la partie coup par coup
+    if client.last_match_id is not None:
+        review_button = tk.Button(
+            buttons_frame, 
+            text="Revoir la partie", 
+            font=("Helvetica", 12, "bold"), 
+            bg=client.button_color, 
+            fg="white", 
+            padx=20, 
+            pady=5, 
+            bd=0, 
+            relief=tk.FLAT, 
+            command=client.request_replay,
+            activebackground=client.button_hover
+        )
+        review_button.grid(row=1, column=0, columnspan=2, padx=10, pady=10)
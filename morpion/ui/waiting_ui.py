@@ -1,4 +1,5 @@
 import tkinter as tk
+from morpion.config import Config
 
 def setup_waiting_ui(client):
     """Configure l'écran pour rejoindre ou quitter la file."""
@@ -30,6 +31,46 @@ def setup_waiting_ui(client):
     )
     client.status_label.pack(pady=20)
     
+    # Salon: joueurs en ligne, file d'attente et position (messages LOBBY)
+    client.lobby_label = tk.Label(
+        client.current_frame, 
+        text="", 
+        font=("Helvetica", 11), 
+        bg=client.bg_color, 
+        fg=client.text_color, 
+        justify=tk.CENTER
+    )
+    client.lobby_label.pack(pady=5)
+    
+    # Choix de la variante (taille du plateau)
+    variants_frame = tk.Frame(client.current_frame, bg=client.bg_color)
+    variants_frame.pack(pady=5)
+    client.variant_var = tk.IntVar(value=client.variant)
+    for index, (label, _, _) in enumerate(Config.VARIANTS):
+        tk.Radiobutton(
+            variants_frame, 
+            text=label, 
+            variable=client.variant_var, 
+            value=index, 
+            font=("Helvetica", 11), 
+            bg=client.bg_color, 
+            fg=client.text_color, 
+            activebackground=client.bg_color, 
+            command=lambda: setattr(client, "variant", client.variant_var.get())
+        ).grid(row=0, column=index, padx=10)
+    # Pendule sur option: temps par coup et temps total limités
+    client.clock_var = tk.BooleanVar(value=client.clock)
+    tk.Checkbutton(
+        variants_frame, 
+        text="Avec pendule", 
+        variable=client.clock_var, 
+        font=("Helvetica", 11), 
+        bg=client.bg_color, 
+        fg=client.text_color, 
+        activebackground=client.bg_color, 
+        command=lambda: setattr(client, "clock", client.clock_var.get())
+    ).grid(row=1, column=0, columnspan=len(Config.VARIANTS), pady=5)
+    
     # Frame pour les boutons
     buttons_frame = tk.Frame(client.current_frame, bg=client.bg_color)
     buttons_frame.pack(pady=20)
@@ -82,3 +123,17 @@ def setup_waiting_ui(client):
         activebackground=client.button_hover
     )
     back_button.pack(pady=20)
+
+def update_lobby_ui(client):
+    """Affiche l'état du salon: joueurs en ligne, file du Morpion et position du joueur."""
+    if not hasattr(client, "lobby_label") or not client.lobby_label.winfo_exists():
+        return
+    lobby = client.lobby
+    lines = [f"{lobby.get('online', 0)} joueur(s) en ligne, {lobby.get('queues', {}).get('morpion', 0)} en attente au Morpion"]
+    waiting = lobby.get("waiting")
+    if waiting and waiting["game"] == "morpion":
+        line = f"Votre position dans la file: {waiting['position']}"
+        if waiting["wait"] is not None:
+            line += f" (attente estimée: {waiting['wait']} s)"
+        lines.append(line)
+    client.lobby_label.config(text="\n".join(lines))
@@ -0,0 +1,44 @@
+"""Lecture des messages JSON envoyés par le serveur.
+
+Le serveur écrit ses messages les uns à la suite des autres, sans
+séparateur: une même lecture du socket peut en contenir plusieurs, ou
+seulement le début d'un message.
+"""
+import codecs
+import json
+
+def read_messages(client_socket, reconnect=None):
+    """Messages reçus sur un socket, un par un.
+
+    Quand la connexion est perdue, reconnect (s'il est donné) est appelé et
+    doit retourner un nouveau socket, ou None pour arrêter la lecture.
+    """
+    while True:
+        error = None
+        try:
+            yield from _read(client_socket)
+        except OSError as e:
+            error = e
+        client_socket = reconnect() if reconnect is not None else None
+        if client_socket is None:
+            if error is not None:
+                raise error
+            return
+
+def _read(client_socket):
+    """Messages d'un socket jusqu'à sa fermeture."""
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()  # un caractère peut être coupé entre deux lectures
+    buffer = ""
+    while True:
+        data = client_socket.recv(4096)
+        if not data:
+            return
+        buffer += utf8.decode(data)
+        while buffer:
+            try:
+                message, end = decoder.raw_decode(buffer)
+            except ValueError:
+                break  # message incomplet: attendre la suite
+            buffer = buffer[end:].lstrip()
+            yield message
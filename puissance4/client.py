@@ -0,0 +1,377 @@
+import socket
+import threading
+import json
+import time
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+from puissance4.ui.main_menu_ui import setup_main_menu_ui
+from puissance4.ui.waiting_ui import setup_waiting_ui
+from puissance4.ui.game_ui import setup_game_ui
+from puissance4.ui.result_ui import setup_result_ui
+from puissance4.ui.stats_ui import setup_stats_ui
+from puissance4.ui.replay_ui import setup_replay_ui
+from puissance4.config import Config
+from protocol import read_messages
+
+class Puissance4Client:
+    """Client pour jouer au Puissance 4 en 1v1."""
+    def __init__(self, pseudo, client_socket=None, parent_root=None, host="localhost", port=12345, resume_token=None):
+        # Si un socket client est fourni, l'utiliser, sinon en créer un nouveau
+        if client_socket:
+            self.client = client_socket
+        else:
+            self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                self.client.connect((host, port))
+            except Exception as e:
+                print(f"Erreur de connexion: {e}")
+                messagebox.showerror("Erreur", f"Impossible de se connecter au serveur: {e}")
+                return
+            
+        self.pseudo = pseudo
+        self.server_address = self.client.getpeername()
+        self.resume_token = resume_token  # jeton reçu au CONNECT, pour reprendre un match après une coupure
+        self.reconnecting = False  # CONNECT envoyé après un jeton refusé, RESUME à suivre
+        self.last_seq = 0  # numéro du dernier message du match reçu
+        self.listening = False
+        self.parent_root = parent_root
+        self.match_id = None
+        self.opponent = None
+        self.symbol = None
+        self.is_my_turn = False
+        self.in_queue = False
+        self.heights = [0] * Config.COLUMNS  # nombre de pions par colonne
+        
+        # Relecture de la dernière partie (coups reçus par pages)
+        self.last_match_id = None
+        self.replay_turns = []
+        self.replay_next = None
+        self.replay_playing = False
+        self.replay_frame = None
+        self.replay_count = 0
+        self.replay_result = None
+        
+        # Statistiques du joueur (tenues par le serveur, voir show_statistics)
+        self.stats = {
+            "games_played": 0,
+            "wins": 0,
+            "losses": 0,
+            "draws": 0
+        }
+        
+        # Interface graphique
+        if parent_root:
+            self.root = tk.Toplevel(parent_root)
+            self.root.protocol("WM_DELETE_WINDOW", self.return_to_main)
+        else:
+            self.root = tk.Tk()
+            
+        self.root.title("Puissance 4 - Menu Principal")
+        self.root.geometry("600x560")
+        self.root.resizable(False, False)
+        
+        # Définir les couleurs et styles
+        self.bg_color = Config.BG_COLOR
+        self.accent_color = Config.ACCENT_COLOR
+        self.text_color = Config.TEXT_COLOR
+        self.button_color = Config.BUTTON_COLOR
+        self.button_hover = Config.BUTTON_HOVER
+        
+        self.root.configure(bg=self.bg_color)
+        
+        # Créer un style pour les widgets
+        self.style = ttk.Style()
+        self.style.configure("TButton", font=("Helvetica", 12), background=self.button_color)
+        self.style.configure("TLabel", font=("Helvetica", 12), background=self.bg_color, foreground=self.text_color)
+        self.style.configure("TFrame", background=self.bg_color)
+        
+        self.current_frame = None
+        self.setup_main_menu()
+
+    def setup_main_menu(self):
+        """Configure le menu principal."""
+        setup_main_menu_ui(self)
+        # Lancer l'écoute du serveur
+        if not self.listening:
+            self.listening = True  # un seul thread lit le socket
+            threading.Thread(target=self.listen_server, daemon=True).start()
+
+    def show_statistics(self):
+        """Demande au serveur les statistiques du joueur; l'écran s'affiche à la réponse."""
+        message = json.dumps({"action": "STATS", "game_type": "puissance4"})
+        self.client.send(message.encode())
+
+    def update_statistics(self, stats):
+        """Affiche les statistiques envoyées par le serveur."""
+        self.stats = {
+            "games_played": stats.get("games", 0),
+            "wins": stats.get("wins", 0),
+            "losses": stats.get("losses", 0),
+            "draws": stats.get("draws", 0)
+        }
+        setup_stats_ui(self)
+
+    def quit_game(self):
+        """Quitte le jeu."""
+        if messagebox.askyesno("Quitter", "Êtes-vous sûr de vouloir quitter?"):
+            self.return_to_main()
+
+    def return_to_main(self):
+        """Retourne au menu principal de l'application."""
+        if self.parent_root:
+            self.root.destroy()
+            self.parent_root.deiconify()  # Réaffiche la fenêtre principale
+        else:
+            try:
+                self.client.close()
+            except:
+                pass
+            self.root.quit()
+
+    def setup_waiting_ui(self):
+        """Configure l'écran pour rejoindre ou quitter la file."""
+        setup_waiting_ui(self)
+
+    def join_queue(self):
+        """Envoie une requête pour rejoindre la file d'attente."""
+        if self.in_queue:
+            return
+        message = json.dumps({"action": "JOIN_PUISSANCE4", "pseudo": self.pseudo})
+        self.client.send(message.encode())
+        self.in_queue = True
+        self.status_label.config(text="Vous êtes dans la file d'attente...")
+        self.join_button.config(state=tk.DISABLED)
+        self.leave_button.config(state=tk.NORMAL)
+
+    def leave_queue(self):
+        """Envoie une requête pour quitter la file d'attente."""
+        if not self.in_queue:
+            return
+        message = json.dumps({"action": "LEAVE_PUISSANCE4", "pseudo": self.pseudo})
+        self.client.send(message.encode())
+        self.in_queue = False
+        self.status_label.config(text="Vous avez quitté la file d'attente.")
+        self.join_button.config(state=tk.NORMAL)
+        self.leave_button.config(state=tk.DISABLED)
+
+    def setup_game_ui(self):
+        """Configure l'interface du jeu."""
+        self.heights = [0] * Config.COLUMNS
+        setup_game_ui(self)
+        self.update_status()
+
+    def play_move(self, column):
+        """Fait tomber un pion dans la colonne si c'est au tour du joueur."""
+        if not self.is_my_turn or self.heights[column] >= Config.ROWS:
+            return
+        self.update_board(column, self.heights[column], self.symbol)
+        self.is_my_turn = False
+        self.update_status()
+        message = json.dumps({
+            "action": "PUISSANCE4_MOVE",
+            "pseudo": self.pseudo,
+            "match_id": self.match_id,
+            "column": column
+        })
+        self.client.send(message.encode())
+
+    def update_board(self, column, row, symbol):
+        """Affiche un pion sur le plateau."""
+        self.heights[column] = row + 1
+        self.cells[row][column].itemconfig("piece", fill=Config.PIECE_COLORS[symbol])
+
+    def update_status(self):
+        """Met à jour le message de statut."""
+        if hasattr(self, 'status_label'):
+            if self.is_my_turn:
+                self.status_label.config(text="À votre tour !", fg="#5cb85c")
+            elif self.in_queue:
+                self.status_label.config(text="Vous êtes dans la file d'attente...", fg=self.text_color)
+            else:
+                if self.opponent:
+                    self.status_label.config(text=f"Tour de {self.opponent}...", fg="#d9534f")
+                else:
+                    self.status_label.config(text="Vous n'êtes pas dans la file d'attente.", fg=self.text_color)
+
+    def end_game(self, result):
+        """Affiche le résultat du match."""
+        if result == self.pseudo:
+            message = "Vous avez gagné !"
+            color = "#5cb85c"  # Vert
+        elif result == "draw":
+            message = "Match nul !"
+            color = "#f0ad4e"  # Orange
+        else:
+            message = f"{self.opponent} a gagné !"
+            color = "#d9534f"  # Rouge
+            
+        # Afficher le résultat
+        self.last_match_id = self.match_id
+        setup_result_ui(self, message, color)
+        
+        # Réinitialiser les variables de jeu
+        self.opponent = None
+        self.match_id = None
+        self.symbol = None
+        self.is_my_turn = False
+
+    def request_replay(self, after=0):
+        """Demande au serveur une page de coups de la dernière partie."""
+        if after == 0:
+            self.replay_turns = []
+            self.replay_frame = None
+        message = json.dumps({"action": "REPLAY", "match_id": self.last_match_id, "after": after})
+        self.client.send(message.encode())
+
+    def show_replay_frame(self, message):
+        """Ajoute une page de coups à la relecture et demande la suivante sans attendre la fin de l'affichage."""
+        if self.replay_frame is None:
+            setup_replay_ui(self, message)
+            self.replay_count = 0
+            self.replay_result = message["result"]
+        self.replay_turns.extend(message["turns"])
+        self.replay_next = message["next"]
+        if self.replay_next is not None:
+            self.request_replay(self.replay_next)
+        if not self.replay_playing:
+            self.replay_playing = True
+            self.replay_step()
+
+    def replay_step(self):
+        """Fait tomber le pion suivant de la relecture."""
+        if self.current_frame is not self.replay_frame:
+            self.replay_playing = False  # relecture quittée
+            return
+        if not self.replay_turns:
+            self.replay_playing = False
+            if self.replay_next is None:
+                result = "Match nul" if self.replay_result == "draw" else f"Victoire de {self.replay_result}"
+                self.replay_status.config(text=f"Fin de la relecture: {result}")
+            return
+        side, column, _ = self.replay_turns.pop(0)
+        row = self.replay_heights[column]
+        self.replay_heights[column] += 1
+        self.replay_cells[row][column].itemconfig("piece", fill=Config.PIECE_COLORS["X" if side == 1 else "O"])
+        self.replay_count += 1
+        self.replay_status.config(text=f"Coup {self.replay_count}")
+        self.root.after(Config.REPLAY_DELAY, self.replay_step)
+
+    def forfeit_game(self):
+        """Abandonne la partie en cours."""
+        if messagebox.askyesno("Abandonner", "Êtes-vous sûr de vouloir abandonner cette partie?"):
+            # Ici vous pourriez envoyer un message au serveur pour signaler l'abandon
+            self.setup_main_menu()
+
+    def handle_match_interrupted(self, message):
+        """Gère l'interruption du match due à une déconnexion."""
+        messagebox.showinfo("Match annulé", message)
+        self.opponent = None
+        self.match_id = None
+        self.symbol = None
+        self.is_my_turn = False
+        self.setup_main_menu()
+
+    def resume_session(self):
+        """Rouvre la connexion perdue pendant un match et la reprend (RESUME); retourne le nouveau socket ou None."""
+        if self.resume_token is None or self.match_id is None:
+            return None
+        for _ in range(Config.RESUME_ATTEMPTS):
+            time.sleep(Config.RESUME_DELAY)
+            try:
+                client_socket = socket.create_connection(self.server_address)
+                self.send_resume(client_socket)
+            except OSError:
+                continue
+            self.client = client_socket
+            self.reconnecting = False
+            return client_socket
+        return None
+
+    def send_resume(self, client_socket):
+        """Demande la reprise du match en cours avec le jeton actuel."""
+        client_socket.send(json.dumps({
+            "action": "RESUME",
+            "token": self.resume_token,
+            "match_id": self.match_id,
+            "last_seq": self.last_seq
+        }).encode())
+
+    def reconnect(self, message):
+        """Réponse au CONNECT envoyé après un jeton refusé: reprend le match avec le nouveau jeton."""
+        self.reconnecting = False
+        if message["status"] == "OK":
+            self.resume_token = message["resume_token"]
+            self.send_resume(self.client)
+        else:
+            self.root.after(0, self.handle_match_interrupted, message["message"])
+
+    def listen_server(self):
+        """Écoute les messages du serveur."""
+        try:
+            for message in read_messages(self.client, self.resume_session):
+                action = message["action"]
+                # Les messages d'un match sont numérotés par le serveur
+                self.last_seq = message.get("seq", self.last_seq)
+
+                if action == "CONNECT":
+                    # Réponse déjà gérée dans validate_pseudo, sauf après un jeton de reprise refusé
+                    if self.reconnecting:
+                        self.reconnect(message)
+                elif action == "PING":
+                    self.client.send(json.dumps({"action": "PONG"}).encode())
+                elif action == "PUISSANCE4_START":
+                    self.opponent = message["opponent"]
+                    self.match_id = message["match_id"]
+                    # Après une reprise dont les messages manqués sont perdus: PUISSANCE4_START avec le plateau (resync)
+                    self.last_seq = message.get("seq", 0)
+                    self.symbol = message["symbol"]
+                    self.is_my_turn = message.get("your_turn", self.symbol == "X")
+                    self.in_queue = False
+                    self.root.after(0, self.setup_game_ui)
+                    # Lignes du plateau de haut en bas
+                    for row, line in enumerate(reversed(message.get("board", []))):
+                        for column, symbol in enumerate(line):
+                            if symbol != " ":
+                                self.root.after(0, self.update_board, column, row, symbol)
+                    self.root.after(100, self.update_status)
+                elif action == "PUISSANCE4_MOVE":
+                    column = message["column"]
+                    row = message["row"]
+                    symbol = message["symbol"]
+                    self.root.after(0, self.update_board, column, row, symbol)
+                    self.is_my_turn = True
+                    self.root.after(0, self.update_status)
+                elif action == "STATS" and message.get("game_type") == "puissance4":
+                    stats = message["stats"].get("puissance4", {})
+                    self.root.after(0, self.update_statistics, stats)
+                elif action == "REPLAY" and message.get("game_type") == "puissance4":
+                    self.root.after(0, self.show_replay_frame, message)
+                elif action == "PUISSANCE4_END":
+                    result = message["result"]
+                    self.root.after(0, self.end_game, result)
+                elif action == "LEFT_QUEUE":
+                    self.in_queue = False
+                    self.root.after(0, lambda: self.status_label.config(text="Vous avez quitté la file d'attente."))
+                    self.root.after(0, lambda: self.join_button.config(state=tk.NORMAL))
+                    self.root.after(0, lambda: self.leave_button.config(state=tk.DISABLED))
+                elif action == "RESUME":
+                    if message["status"] != "OK" and "token" not in message and not self.reconnecting:
+                        # Jeton inconnu du serveur (redémarré entre-temps): nouvelle identification, puis RESUME
+                        self.reconnecting = True
+                        self.client.send(json.dumps({"action": "CONNECT", "pseudo": self.pseudo}).encode())
+                        continue
+                    self.resume_token = message.get("token", self.resume_token)
+                    if message["status"] != "OK":
+                        self.root.after(0, self.handle_match_interrupted, message["message"])
+                elif action == "MATCH_INTERRUPTED":
+                    self.root.after(0, self.handle_match_interrupted, message["message"])
+
+        except Exception as e:
+            print(f"Erreur de connexion: {e}")
+            self.root.after(0, lambda: messagebox.showerror("Erreur", "Connexion perdue."))
+            self.return_to_main()
+
+    def run(self):
+        """Démarre l'interface graphique."""
+        self.root.mainloop()
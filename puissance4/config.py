@@ -0,0 +1,27 @@
+class Config:
+    """Classe de configuration pour le client Puissance 4."""
+    # Paramètres du jeu
+    COLUMNS = 7
+    ROWS = 6
+    
+    # Reprise d'un match après une coupure: tentatives de reconnexion et délai entre deux (s)
+    RESUME_ATTEMPTS = 5
+    RESUME_DELAY = 1.0
+
+    # Délai entre deux coups d'une relecture (ms)
+    REPLAY_DELAY = 500
+    
+    # Couleurs et styles
+    BG_COLOR = "#f0f0f0"
+    ACCENT_COLOR = "#4a6ea9"
+    TEXT_COLOR = "#333333"
+    BUTTON_COLOR = "#5a81c2"
+    BUTTON_HOVER = "#7094d1"
+    SUCCESS_COLOR = "#5cb85c"
+    WARNING_COLOR = "#f0ad4e"
+    DANGER_COLOR = "#d9534f"
+    
+    # Couleurs du plateau et des pions
+    BOARD_COLOR = "#4a6ea9"
+    EMPTY_COLOR = "white"
+    PIECE_COLORS = {"X": "#d9534f", "O": "#f0ad4e"}
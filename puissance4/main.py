@@ -0,0 +1,5 @@
+from client import Puissance4Client
+
+if __name__ == "__main__":
+    client = Puissance4Client()
+    client.run()
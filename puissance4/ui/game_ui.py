@@ -0,0 +1,89 @@
+import tkinter as tk
+from puissance4.config import Config
+
+def setup_game_ui(client):
+    """Configure l'interface du jeu."""
+    if client.current_frame:
+        client.current_frame.destroy()
+        
+    client.current_frame = tk.Frame(client.root, bg=client.bg_color)
+    client.current_frame.pack(fill="both", expand=True)
+    
+    client.root.title(f"Puissance 4 vs {client.opponent}")
+    
+    # Titre du jeu
+    game_title = tk.Label(
+        client.current_frame, 
+        text=f"Puissance 4: {client.pseudo} vs {client.opponent}", 
+        font=("Helvetica", 16, "bold"), 
+        bg=client.bg_color, 
+        fg=client.accent_color
+    )
+    game_title.pack(pady=(10, 5))
+    
+    # Couleur du joueur
+    color_label = tk.Label(
+        client.current_frame, 
+        text="Votre couleur: ●", 
+        font=("Helvetica", 12, "bold"), 
+        bg=client.bg_color, 
+        fg=Config.PIECE_COLORS[client.symbol]
+    )
+    color_label.pack()
+    
+    # Frame pour le plateau de jeu
+    game_frame = tk.Frame(client.current_frame, bg=Config.BOARD_COLOR, bd=2)
+    game_frame.pack(pady=10)
+    
+    # Boutons pour faire tomber un pion dans une colonne
+    for column in range(Config.COLUMNS):
+        btn = tk.Button(
+            game_frame, 
+            text="▼", 
+            font=("Helvetica", 12, "bold"), 
+            width=3, 
+            bd=0, 
+            relief=tk.FLAT, 
+            command=lambda c=column: client.play_move(c),
+            bg=client.button_color,
+            fg="white",
+            activebackground=client.button_hover
+        )
+        btn.grid(row=0, column=column, padx=2, pady=2)
+    
+    # Plateau: la ligne 0 est en bas
+    client.cells = []
+    for row in range(Config.ROWS):
+        line = []
+        for column in range(Config.COLUMNS):
+            cell = tk.Canvas(game_frame, width=44, height=44, bg=Config.BOARD_COLOR, highlightthickness=0)
+            cell.create_oval(4, 4, 40, 40, fill=Config.EMPTY_COLOR, outline="", tags="piece")
+            cell.grid(row=Config.ROWS - row, column=column, padx=2, pady=2)
+            line.append(cell)
+        client.cells.append(line)
+    
+    # Status du jeu
+    client.status_label = tk.Label(
+        client.current_frame, 
+        text="En attente de votre tour...", 
+        font=("Helvetica", 14), 
+        bg=client.bg_color, 
+        fg=client.text_color
+    )
+    client.status_label.pack(pady=10)
+    
+    # Bouton pour abandonner
+    forfeit_button = tk.Button(
+        client.current_frame, 
+        text="Abandonner", 
+        font=("Helvetica", 12), 
+        bg="#d9534f", 
+        fg="white", 
+        padx=10, 
+        pady=3, 
+        bd=0, 
+        relief=tk.FLAT, 
+        command=client.forfeit_game,
+        activebackground="#c9302c"
+    )
+    forfeit_button.pack(pady=5)
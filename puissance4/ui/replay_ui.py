@@ -0,0 +1,63 @@
+import tkinter as tk
+from puissance4.config import Config
+
+def setup_replay_ui(client, message):
+    """Affiche le plateau vide d'une relecture; les pions s'y ajoutent au fil des pages reçues."""
+    if client.current_frame:
+        client.current_frame.destroy()
+        
+    client.current_frame = tk.Frame(client.root, bg=client.bg_color)
+    client.current_frame.pack(fill="both", expand=True)
+    client.replay_frame = client.current_frame
+    
+    client.root.title(f"Puissance 4 - Relecture du match {message['match_id']}")
+    
+    # Titre de la relecture
+    title_label = tk.Label(
+        client.current_frame, 
+        text=f"Relecture: {message['player1']} vs {message['player2']}", 
+        font=("Helvetica", 16, "bold"), 
+        bg=client.bg_color, 
+        fg=client.accent_color
+    )
+    title_label.pack(pady=(10, 5))
+    
+    # Plateau en lecture seule: la ligne 0 est en bas
+    board_frame = tk.Frame(client.current_frame, bg=Config.BOARD_COLOR, bd=2)
+    board_frame.pack(pady=10)
+    client.replay_cells = []
+    for row in range(Config.ROWS):
+        line = []
+        for column in range(Config.COLUMNS):
+            cell = tk.Canvas(board_frame, width=44, height=44, bg=Config.BOARD_COLOR, highlightthickness=0)
+            cell.create_oval(4, 4, 40, 40, fill=Config.EMPTY_COLOR, outline="", tags="piece")
+            cell.grid(row=Config.ROWS - row, column=column, padx=2, pady=2)
+            line.append(cell)
+        client.replay_cells.append(line)
+    client.replay_heights = [0] * Config.COLUMNS
+    
+    # Avancement de la relecture
+    client.replay_status = tk.Label(
+        client.current_frame, 
+        text="Chargement des coups...", 
+        font=("Helvetica", 14), 
+        bg=client.bg_color, 
+        fg=client.text_color
+    )
+    client.replay_status.pack(pady=10)
+    
+    # Bouton pour revenir au menu
+    back_button = tk.Button(
+        client.current_frame, 
+        text="Retour au Menu", 
+        font=("Helvetica", 12, "bold"), 
+        bg=client.button_color, 
+        fg="white", 
+        padx=20, 
+        pady=5, 
+        bd=0, 
+        relief=tk.FLAT, 
+        command=client.setup_main_menu,
+        activebackground=client.button_hover
+    )
+    back_button.pack(pady=10)
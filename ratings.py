@@ -0,0 +1,44 @@
+import threading
+
+class EloRatings:
+    """Classement Elo des joueurs pour un type de jeu."""
+    DEFAULT_RATING = 1500.0
+    K_FACTOR = 32
+
+    def __init__(self):
+        self.ratings = {}  # identifiant du joueur -> classement
+        self.lock = threading.Lock()
+
+    def get(self, player_id: int) -> float:
+        """Retourne le classement d'un joueur (classement initial s'il est inconnu)."""
+        return self.ratings.get(player_id, self.DEFAULT_RATING)
+
+    def record(self, player1: int, player2: int, result):
+        """Met à jour les classements après un match terminé.
+
+        Le résultat est l'identifiant du gagnant ou "draw".
+        Les matchs interrompus ou sans résultat ne sont pas pris en compte.
+        """
+        if result == "draw":
+            score1 = 0.5
+        elif result == player1:
+            score1 = 1.0
+        elif result == player2:
+            score1 = 0.0
+        else:
+            return
+        with self.lock:
+            rating1 = self.get(player1)
+            rating2 = self.get(player2)
+            expected1 = 1 / (1 + 10 ** ((rating2 - rating1) / 400))
+            delta = self.K_FACTOR * (score1 - expected1)
+            self.ratings[player1] = rating1 + delta
+            self.ratings[player2] = rating2 - delta
+
+def load_ratings(db, game_types) -> dict:
+    """Calcule les classements de chaque jeu à partir des matchs terminés."""
+    ratings = {game_type: EloRatings() for game_type in game_types}
+    for game_type, player1, player2, result in db.get_finished_matches():
+        if game_type in ratings:
+            ratings[game_type].record(player1, player2, result)
+    return ratings
@@ -0,0 +1,64 @@
+import json
+from models import Turn
+
+class Replay:
+    """Relecture d'un match terminé à partir de la table turns.
+
+    Les coups sont lus par pages au fil de l'itération, jamais chargés en
+    entier; les plateaux intermédiaires ne sont reconstruits que si on les
+    demande (states). Un match archivé est relu dans l'archive binaire, dont
+    les coups gardent leur id de la table turns.
+    """
+    PAGE_SIZE = 16  # coups par page envoyée aux clients (messages de moins de 1 Ko)
+
+    def __init__(self, db, plugin, match, archive=None):
+        self.db = db
+        self.archive = archive
+        self.plugin = plugin
+        self.match = match
+        self.sides = {match.player1.id: match.player1, match.player2.id: match.player2}
+
+    def turns(self, after: int = 0, batch: int = 256):
+        """Coups du match dans l'ordre, à partir de l'id de coup after: (id, Turn)."""
+        if self.archive is not None and self.match.id in self.archive:
+            players = (None, self.match.player1, self.match.player2)
+            for turn_id, side, move, feedback, grade in self.archive.turns(self.match.id):
+                if turn_id > after:
+                    yield turn_id, Turn(self.match.id, players[side], move, feedback, grade)
+            return
+        for turn_id, player_id, move, feedback in self.db.iter_turns(self.match.id, after, batch):
+            # Les coups sont des entiers écrits en texte (ou des listes JSON pour d'anciens matchs)
+            turn = Turn(self.match.id, self.sides.get(player_id), json.loads(move),
+                        json.loads(feedback) if feedback else None)
+            yield turn_id, turn
+
+    def frames(self, after: int = 0, page_size: int = PAGE_SIZE):
+        """Coups regroupés par pages: listes de (id, Turn)."""
+        frame = []
+        for item in self.turns(after):
+            frame.append(item)
+            if len(frame) == page_size:
+                yield frame
+                frame = []
+        if frame:
+            yield frame
+
+    def page(self, after: int = 0, page_size: int = PAGE_SIZE):
+        """Une page de coups et l'id à passer pour la suivante (None à la fin)."""
+        turns = self.turns(after, page_size + 1)
+        frame = [item for _, item in zip(range(page_size + 1), turns)]
+        turns.close()
+        if len(frame) > page_size:
+            return frame[:page_size], frame[page_size - 1][0]
+        return frame, None
+
+    def states(self):
+        """Plateau après chaque coup: (Turn, plateau). Le même plateau est avancé d'un coup à chaque étape."""
+        game = self.plugin.replay_game(self.match)
+        for _, turn in self.turns():
+            self.plugin.replay_turn(game, self.match, turn)
+            yield turn, game
+
+    def side(self, turn) -> int:
+        """Joueur 1 ou 2 d'un coup."""
+        return 1 if turn.player is self.match.player1 else 2
@@ -1,26 +1,77 @@
 import socket
 import threading
 import json
-from queue import Queue
-from models import Player, Match, Turn, TicTacToe, MastermindMatch, Mastermind
+import secrets
+from functools import partial
+from models import Player
 from database import Database
-from datetime import datetime
+from actors import MatchActor, ActorPool
+from ratings import load_ratings
+from stats import PlayerStats
+from leaderboard import Leaderboard, load_leaderboards
+from replay import Replay
+from archive import ArchiveReader, ArchiveJob
+from journal import MatchJournal, recover_matches
+from protocol import read_messages
+from timer_wheel import TimerWheel
+from spectators import SpectatorHub
+from lobby import Lobby
+from session import Session
+from tournament import Tournament, TournamentHub
+from games import GAMES
+import time
 import tkinter as tk
 from tkinter import ttk
 
+PING = json.dumps({"action": "PING"}).encode()
+
 class MatchmakingServer:
-    """Serveur de matchmaking pour les jeux Morpion et Mastermind avec interface de monitoring."""
-    def __init__(self, host="localhost", port=12345):
+    """Serveur de matchmaking pour les jeux enregistrés (Morpion, Mastermind...) avec interface de monitoring."""
+    ARCHIVE_INTERVAL = 300  # secondes entre deux archivages des matchs terminés
+    ARCHIVE_PRUNE = False   # supprimer de la table turns les coups archivés
+    RECOVERY_GRACE = 60     # secondes laissées aux joueurs d'un match reconstruit pour se reconnecter
+    RESUME_GRACE = 30       # secondes pendant lesquelles un joueur déconnecté peut reprendre son match
+    HEARTBEAT_INTERVAL = 15  # secondes de silence avant l'envoi d'un PING
+    HEARTBEAT_TIMEOUT = 45   # secondes de silence avant la fermeture de la connexion
+
+    def __init__(self, host="localhost", port=12345, workers=None):
         self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server.bind((host, port))
         self.server.listen(5)
-        self.morpion_queue = Queue()  # File d'attente des joueurs pour Morpion
-        self.mastermind_queue = Queue()  # File d'attente des joueurs pour Mastermind
-        self.matches = {}     # Dictionnaire match_id -> (Match, Game)
-        self.clients = {}     # Dictionnaire pseudo -> socket
-        self.mastermind_codes = {}  # Dictionnaire pseudo -> code secret pour Mastermind
+        self.matches = {}     # Dictionnaire match_id -> MatchActor
+        self.clients = {}     # Dictionnaire identifiant du joueur -> Session
+        self.resume_tokens = {}  # jeton de reprise -> identifiant du joueur
+        self.player_tokens = {}  # identifiant du joueur -> son jeton de reprise
+        self.suspended = {}      # (match_id, identifiant du joueur déconnecté) -> minuteur d'annulation
+        # Minuteurs du serveur (battements de cœur, délais de reprise, pendules): un seul thread pour tout
+        self.timers = TimerWheel()
+        # Spectateurs des matchs en cours (SPECTATE)
+        self.spectators = SpectatorHub()
+        # Salon: joueurs en ligne et files d'attente, poussés par deltas aux abonnés
+        self.lobby = Lobby(self)
+        # Tournois (rondes suisses ou élimination directe), joués avec les matchs du serveur
+        self.tournaments = TournamentHub(self)
         self.db = Database()
-        self.lock = threading.Lock()
+        # Classements Elo par jeu, recalculés à partir des matchs terminés
+        self.ratings = load_ratings(self.db, GAMES)
+        # Statistiques cumulées des joueurs (table player_stats)
+        self.stats = PlayerStats(self.db)
+        # Classements consultables (LEADERBOARD), tenus à jour à la fin des matchs
+        self.leaderboards = load_leaderboards(self.db, self.ratings)
+        # Archive binaire des matchs terminés, complétée en tâche de fond
+        self.archive = ArchiveReader()
+        self.archiver = ArchiveJob(self.db, self.archive, self.ARCHIVE_INTERVAL, self.ARCHIVE_PRUNE)
+        # Sections critiques séparées: chaque match est protégé par son acteur
+        # et chaque file d'attente par le verrou de son jeu
+        self.clients_lock = threading.Lock()   # self.clients, jetons de reprise et matchs suspendus
+        self.matches_lock = threading.Lock()   # self.matches
+        self.pool = ActorPool(workers)
+        # Une instance de plugin (file + ordonnanceur) par jeu enregistré
+        self.games = {name: plugin_class(self, self.ratings[name]) for name, plugin_class in GAMES.items()}
+        # Journal des matchs en cours: ceux laissés ouverts par un arrêt brutal sont reconstruits
+        self.journal = MatchJournal()
+        self.recover_matches()
+        self.actions = self.build_dispatch_table()
         print(f"Serveur démarré sur {host}:{port}")
 
         # Interface graphique
@@ -41,27 +92,20 @@ class MatchmakingServer:
         self.connected_label = tk.Label(general_tab, text="Joueurs connectés: 0")
         self.connected_label.pack(pady=5)
 
-        self.morpion_queue_label = tk.Label(general_tab, text="Joueurs en file Morpion: 0")
-        self.morpion_queue_label.pack(pady=5)
-        
-        self.mastermind_queue_label = tk.Label(general_tab, text="Joueurs en file Mastermind: 0")
-        self.mastermind_queue_label.pack(pady=5)
+        self.queue_labels = {}
+        for plugin in self.games.values():
+            self.queue_labels[plugin.name] = tk.Label(general_tab, text=f"Joueurs en file {plugin.label}: 0")
+            self.queue_labels[plugin.name].pack(pady=5)
 
-        # Onglet Morpion
-        morpion_tab = ttk.Frame(notebook)
-        notebook.add(morpion_tab, text="Morpion")
-        
-        tk.Label(morpion_tab, text="Matchs de Morpion en cours:").pack(pady=5)
-        self.morpion_matches_frame = tk.Frame(morpion_tab)
-        self.morpion_matches_frame.pack(fill="both", expand=True)
-        
-        # Onglet Mastermind
-        mastermind_tab = ttk.Frame(notebook)
-        notebook.add(mastermind_tab, text="Mastermind")
-        
-        tk.Label(mastermind_tab, text="Matchs de Mastermind en cours:").pack(pady=5)
-        self.mastermind_matches_frame = tk.Frame(mastermind_tab)
-        self.mastermind_matches_frame.pack(fill="both", expand=True)
+        # Un onglet par jeu
+        self.matches_frames = {}
+        for plugin in self.games.values():
+            game_tab = ttk.Frame(notebook)
+            notebook.add(game_tab, text=plugin.label)
+            
+            tk.Label(game_tab, text=f"Matchs de {plugin.label} en cours:").pack(pady=5)
+            self.matches_frames[plugin.name] = tk.Frame(game_tab)
+            self.matches_frames[plugin.name].pack(fill="both", expand=True)
 
         # Onglet Historique
         history_tab = ttk.Frame(notebook)
@@ -88,444 +132,651 @@ class MatchmakingServer:
         self.connection_tree.heading("JoinDate", text="Date de connexion")
         self.connection_tree.pack(fill="both", expand=True)
 
+        # Onglet Classements
+        leaderboard_tab = ttk.Frame(notebook)
+        notebook.add(leaderboard_tab, text="Classements")
+
+        selection = tk.Frame(leaderboard_tab)
+        selection.pack(pady=5)
+        self.leaderboard_game = tk.StringVar(value=next(iter(self.games)))
+        self.leaderboard_order = tk.StringVar(value=Leaderboard.ORDERS[0])
+        ttk.Combobox(selection, textvariable=self.leaderboard_game, values=list(self.games), state="readonly").pack(side="left", padx=5)
+        ttk.Combobox(selection, textvariable=self.leaderboard_order, values=Leaderboard.ORDERS, state="readonly").pack(side="left", padx=5)
+        self.leaderboard_tree = ttk.Treeview(leaderboard_tab, columns=("Rank", "Pseudo", "Score"), show="headings")
+        self.leaderboard_tree.heading("Rank", text="Rang")
+        self.leaderboard_tree.heading("Pseudo", text="Pseudo")
+        self.leaderboard_tree.heading("Score", text="Score")
+        self.leaderboard_tree.pack(fill="both", expand=True)
+        self.leaderboard_shown = None  # (jeu, ordre, version) affichés
+
         tk.Button(self.root, text="Rafraîchir l'historique", command=self.update_history).pack(pady=5)
         self.update_monitoring_ui()
 
     def update_monitoring_ui(self):
         """Met à jour l'interface de monitoring."""
-        with self.lock:
-            self.connected_label.config(text=f"Joueurs connectés: {len(self.clients)}")
-            self.morpion_queue_label.config(text=f"Joueurs en file Morpion: {self.morpion_queue.qsize()}")
-            self.mastermind_queue_label.config(text=f"Joueurs en file Mastermind: {self.mastermind_queue.qsize()}")
-
-            # Mise à jour des matchs de Morpion
-            for widget in self.morpion_matches_frame.winfo_children():
+        with self.clients_lock:
+            connected = len(self.clients)
+        waiting = {}
+        for plugin in self.games.values():
+            with plugin.lock:
+                waiting[plugin.name] = plugin.waiting_count()
+        with self.matches_lock:
+            actors = list(self.matches.values())
+
+        self.connected_label.config(text=f"Joueurs connectés: {connected}")
+        for plugin in self.games.values():
+            self.queue_labels[plugin.name].config(text=f"Joueurs en file {plugin.label}: {waiting[plugin.name]}")
+
+        # Mise à jour des matchs de chaque jeu
+        for frame in self.matches_frames.values():
+            for widget in frame.winfo_children():
                 widget.destroy()
-                
-            # Mise à jour des matchs de Mastermind
-            for widget in self.mastermind_matches_frame.winfo_children():
-                widget.destroy()
-                
-            for match_id, (match, game) in self.matches.items():
-                if match.game_type == "morpion":
-                    board_str = "\n".join([f"{game.board[0:3]}", f"{game.board[3:6]}", f"{game.board[6:9]}"])
-                    label_text = f"Match {match_id}: {match.player1.pseudo} vs {match.player2.pseudo}\nPlateau:\n{board_str}\nStatut: {'Terminé' if match.is_finished else 'En cours'}"
-                    label = tk.Label(self.morpion_matches_frame, text=label_text, justify="left", font=("Courier", 10))
-                    label.pack(anchor="w", pady=2)
-                elif match.game_type == "mastermind":
-                    p1_guesses = len(match.player1_guesses)
-                    p2_guesses = len(match.player2_guesses)
-                    label_text = f"Match {match_id}: {match.player1.pseudo} vs {match.player2.pseudo}\n"
-                    label_text += f"Tentatives: {match.player1.pseudo}: {p1_guesses}, {match.player2.pseudo}: {p2_guesses}\n"
-                    label_text += f"Statut: {'Terminé' if match.is_finished else 'En cours'}"
-                    label = tk.Label(self.mastermind_matches_frame, text=label_text, justify="left", font=("Courier", 10))
-                    label.pack(anchor="w", pady=2)
+            
+        for actor in actors:
+            match, game = actor.match, actor.game
+            plugin = self.games[match.game_type]
+            label = tk.Label(self.matches_frames[match.game_type], text=plugin.describe(match, game), justify="left", font=("Courier", 10))
+            label.pack(anchor="w", pady=2)
 
+        self.update_leaderboard_tab()
         self.root.after(1000, self.update_monitoring_ui)
 
+    def update_leaderboard_tab(self):
+        """Affiche la première page du classement choisi, seulement s'il a changé."""
+        leaderboard = self.leaderboards[self.leaderboard_game.get()]
+        shown = (self.leaderboard_game.get(), self.leaderboard_order.get(), leaderboard.version)
+        if shown == self.leaderboard_shown:
+            return
+        self.leaderboard_shown = shown
+        for item in self.leaderboard_tree.get_children():
+            self.leaderboard_tree.delete(item)
+        for entry in leaderboard.page(self.leaderboard_order.get(), 0)["entries"]:
+            self.leaderboard_tree.insert("", "end", values=(entry["rank"], entry["pseudo"], entry["score"]))
+
     def update_history(self):
         """Met à jour l'historique des matchs et connexions terminés."""
         try:
             for item in self.history_tree.get_children():
                 self.history_tree.delete(item)
             
-            # Vérifier si la colonne game_type existe
-            self.db.cursor.execute("PRAGMA table_info(matches)")
-            columns = [column[1] for column in self.db.cursor.fetchall()]
-            
-            if 'game_type' in columns:
-                self.db.cursor.execute("SELECT id, game_type, player1, player2, result FROM matches WHERE is_finished = 1")
-            else:
-                self.db.cursor.execute("SELECT id, 'morpion' as game_type, player1, player2, result FROM matches WHERE is_finished = 1")
-            
-            for row in self.db.cursor.fetchall():
-                self.history_tree.insert("", "end", values=row)
+            with self.db.lock:
+                self.db.cursor.execute('''
+                    SELECT matches.id, game_type, p1.pseudo, p2.pseudo, result, p1.id, p2.id FROM matches
+                    JOIN players p1 ON p1.id = matches.player1_id
+                    JOIN players p2 ON p2.id = matches.player2_id
+                    WHERE is_finished = 1
+                ''')
+                history = self.db.cursor.fetchall()
+
+                self.db.cursor.execute("SELECT pseudo, ip, port, join_date FROM players")
+                connections = self.db.cursor.fetchall()
+
+            for match_id, game_type, pseudo1, pseudo2, result, player1_id, player2_id in history:
+                result = self.db.read_result(result)
+                result = {player1_id: pseudo1, player2_id: pseudo2}.get(result, result)
+                self.history_tree.insert("", "end", values=(match_id, game_type, pseudo1, pseudo2, result))
 
             for item in self.connection_tree.get_children():
                 self.connection_tree.delete(item)
-            self.db.cursor.execute("SELECT pseudo, ip, port, join_date FROM players")
-            for row in self.db.cursor.fetchall():
+            for row in connections:
                 self.connection_tree.insert("", "end", values=row)
         except Exception as e:
             print(f"Erreur lors de la mise à jour de l'historique: {e}")
 
+    def build_dispatch_table(self):
+        """Construit la table action -> gestionnaire à partir des jeux enregistrés."""
+        actions = {
+            "CONNECT": self.on_connect,
+            "STATS": self.on_stats,
+            "LEADERBOARD": self.on_leaderboard,
+            "REPLAY": self.on_replay,
+            "RESUME": self.on_resume,
+            "PONG": self.on_pong,
+            "SPECTATE": self.on_spectate,
+            "UNSPECTATE": self.on_unspectate,
+            "LOBBY_SUBSCRIBE": self.on_lobby_subscribe,
+            "LOBBY_UNSUBSCRIBE": self.on_lobby_unsubscribe,
+            "TOURNAMENT_CREATE": self.on_tournament_create,
+            "TOURNAMENT_JOIN": self.on_tournament_join,
+            "TOURNAMENT_LEAVE": self.on_tournament_leave,
+            "TOURNAMENT_START": self.on_tournament_start,
+            "TOURNAMENT_STANDINGS": self.on_tournament_standings
+        }
+        for plugin in self.games.values():
+            actions[plugin.join_action] = partial(self.on_join, plugin)
+            actions[plugin.leave_action] = partial(self.on_leave, plugin)
+            for action, method in plugin.match_actions.items():
+                actions[action] = partial(self.on_match_action, plugin, getattr(plugin, method))
+        return actions
+
     def handle_client(self, client_socket, address):
         """Gère la communication avec un client."""
-        pseudo = None
-        game_type = "morpion"
+        session = Session(client_socket, address)
+        session.heartbeat = self.timers.schedule(self.HEARTBEAT_INTERVAL, self.check_heartbeat, session)
         try:
-            while True:
-                data = client_socket.recv(1024).decode()
-                if not data:
-                    break
-                message = json.loads(data)
-                action = message.get("action")
-
-                if action == "CONNECT":
-                    pseudo = message["pseudo"]
-                    game_type = message.get("game", "morpion") 
-                    with self.lock:
-                        if pseudo in self.clients:
-                            client_socket.send(json.dumps({
-                                "action": "CONNECT",
-                                "status": "ERROR",
-                                "message": "Pseudo déjà pris."
-                            }).encode())
-                            continue
-                        player = Player(pseudo, address[0], address[1], datetime.now())
-                        self.clients[pseudo] = client_socket
-                        self.db.add_player(player)
-                        client_socket.send(json.dumps({
-                            "action": "CONNECT",
-                            "status": "OK"
-                        }).encode())
-                elif action == "JOIN":
-                    if not pseudo:
-                        continue
-                    player = Player(pseudo, address[0], address[1], datetime.now())
-                    with self.lock:
-                        self.db.update_player(player)
-                        self.morpion_queue.put((player, client_socket))
-                    self.check_morpion_queue()
-                elif action == "JOIN_MASTERMIND":
-                    if not pseudo:
-                        continue
-                    player = Player(pseudo, address[0], address[1], datetime.now())
-                    code = message.get("code", [])
-                    with self.lock:
-                        self.db.update_player(player)
-                        self.mastermind_codes[pseudo] = code
-                        self.mastermind_queue.put((player, client_socket))
-                    self.check_mastermind_queue()
-                elif action == "LEAVE":
-                    if not pseudo:
-                        continue
-                    with self.lock:
-                        temp_queue = Queue()
-                        removed = False
-                        while not self.morpion_queue.empty():
-                            player, socket = self.morpion_queue.get()
-                            if player.pseudo != pseudo:
-                                temp_queue.put((player, socket))
-                            else:
-                                removed = True
-                                socket.send(json.dumps({"action": "LEFT_QUEUE"}).encode())
-                        self.morpion_queue = temp_queue
-                    self.check_morpion_queue()
-                elif action == "LEAVE_MASTERMIND":
-                    if not pseudo:
-                        continue
-                    with self.lock:
-                        temp_queue = Queue()
-                        removed = False
-                        while not self.mastermind_queue.empty():
-                            player, socket = self.mastermind_queue.get()
-                            if player.pseudo != pseudo:
-                                temp_queue.put((player, socket))
-                            else:
-                                removed = True
-                                socket.send(json.dumps({"action": "LEFT_QUEUE"}).encode())
-                        self.mastermind_queue = temp_queue
-                        if pseudo in self.mastermind_codes:
-                            del self.mastermind_codes[pseudo]
-                elif action == "MOVE":
-                    if not pseudo:
-                        continue
-                    self.handle_morpion_move(pseudo, message["match_id"], message["position"])
-                elif action == "MASTERMIND_GUESS":
-                    if not pseudo:
-                        continue
-                    self.handle_mastermind_guess(pseudo, message["match_id"], message["guess"])
+            for message in read_messages(client_socket):
+                session.last_seen = time.monotonic()
+                handler = self.actions.get(message.get("action"))
+                if handler is None:
+                    continue
+                # Seuls CONNECT, RESUME et PONG sont acceptés avant l'identification
+                if session.player_id is None and handler not in (self.on_connect, self.on_resume, self.on_pong):
+                    continue
+                handler(session, message)
 
         except Exception as e:
             print(f"Erreur avec client {address}: {e}")
         finally:
-            self.handle_disconnect(pseudo, client_socket)
-
-    def handle_disconnect(self, pseudo, client_socket):
-        """Gère la déconnexion d'un client."""
-        with self.lock:
-            if pseudo and pseudo in self.clients:
-                del self.clients[pseudo]
-                if pseudo in self.mastermind_codes:
-                    del self.mastermind_codes[pseudo]
-
-            # Nettoyer la file d'attente Morpion
-            temp_queue = Queue()
-            while not self.morpion_queue.empty():
-                player, socket = self.morpion_queue.get()
-                if socket != client_socket:
-                    temp_queue.put((player, socket))
-            self.morpion_queue = temp_queue
-            
-            # Nettoyer la file d'attente Mastermind
-            temp_queue = Queue()
-            while not self.mastermind_queue.empty():
-                player, socket = self.mastermind_queue.get()
-                if socket != client_socket:
-                    temp_queue.put((player, socket))
-            self.mastermind_queue = temp_queue
-
-            # Gérer les matchs en cours
-            for match_id, (match, game) in list(self.matches.items()):
-                opponent_pseudo = None
-                if match.player1.pseudo == pseudo:
-                    opponent_pseudo = match.player2.pseudo
-                elif match.player2.pseudo == pseudo:
-                    opponent_pseudo = match.player1.pseudo
-
-                if opponent_pseudo and opponent_pseudo in self.clients:
-                    match.is_finished = True
-                    match.result = "interrupted"
-                    self.db.update_match(match)
-                    try:
-                        self.clients[opponent_pseudo].send(json.dumps({
-                            "action": "MATCH_INTERRUPTED",
-                            "message": f"Votre adversaire ({pseudo}) s'est déconnecté. Le match est annulé."
-                        }).encode())
-                    except:
-                        pass
-                    del self.matches[match_id]
-
-    def check_morpion_queue(self):
-        """Vérifie la file d'attente pour créer des matchs de Morpion."""
-        with self.lock:
-            if self.morpion_queue.qsize() >= 2:
-                player1, socket1 = self.morpion_queue.get()
-                player2, socket2 = self.morpion_queue.get()
-                game = TicTacToe()
-                match = Match(id=0, player1=player1, player2=player2, board=game.board, is_finished=False, result=None, game_type="morpion")
-                match.id = self.db.add_match(match)
-                self.matches[match.id] = (match, game)
-
-                start_message = json.dumps({
-                    "action": "START",
-                    "opponent": player2.pseudo,
-                    "match_id": match.id,
-                    "symbol": "X"
-                })
-                socket1.send(start_message.encode())
-                start_message = json.dumps({
-                    "action": "START",
-                    "opponent": player1.pseudo,
-                    "match_id": match.id,
-                    "symbol": "O"
-                })
-                socket2.send(start_message.encode())
-
-    def check_mastermind_queue(self):
-        """Vérifie la file d'attente pour créer des matchs de Mastermind."""
-        with self.lock:
-            if self.mastermind_queue.qsize() >= 2:
-                player1, socket1 = self.mastermind_queue.get()
-                player2, socket2 = self.mastermind_queue.get()
-                
-                # Récupérer les codes secrets
-                player1_code = self.mastermind_codes.get(player1.pseudo, [])
-                player2_code = self.mastermind_codes.get(player2.pseudo, [])
-                
-                # Créer le match de Mastermind
-                game = Mastermind()
-                match = MastermindMatch(
-                    id=0, 
-                    player1=player1, 
-                    player2=player2, 
-                    board=[], 
-                    is_finished=False, 
-                    result=None,
-                    player1_code=player1_code,
-                    player2_code=player2_code
-                )
-                match.id = self.db.add_match(match)
-                self.matches[match.id] = (match, game)
-
-                # Envoyer les messages de début de partie
-                start_message1 = json.dumps({
-                    "action": "MASTERMIND_START",
-                    "opponent": player2.pseudo,
-                    "match_id": match.id
-                })
-                socket1.send(start_message1.encode())
-                
-                start_message2 = json.dumps({
-                    "action": "MASTERMIND_START",
-                    "opponent": player1.pseudo,
-                    "match_id": match.id
-                })
-                socket2.send(start_message2.encode())
-                
-                # Nettoyer les codes stockés
-                if player1.pseudo in self.mastermind_codes:
-                    del self.mastermind_codes[player1.pseudo]
-                if player2.pseudo in self.mastermind_codes:
-                    del self.mastermind_codes[player2.pseudo]
-
-    def handle_morpion_move(self, pseudo: str, match_id: int, position: int):
-        """Gère un coup joué par un joueur au Morpion."""
-        with self.lock:
-            if match_id not in self.matches:
-                print(f"Match {match_id} not found for {pseudo}")
-                return
-            match, game = self.matches[match_id]
-            if match.game_type != "morpion":
-                print(f"Match {match_id} is not a Morpion game")
-                return
-                
-            player = match.player1 if pseudo == match.player1.pseudo else match.player2
-            opponent = match.player2 if pseudo == match.player1.pseudo else match.player1
-            symbol = "X" if pseudo == match.player1.pseudo else "O"
-
-            print(f"Processing move: {pseudo} plays {symbol} at position {position}")
-            if game.play_move(position, symbol):
-                turn = Turn(match_id, player, position)
-                self.db.add_turn(turn)
-                match.board = game.board
-                self.db.update_match(match)
-
-                move_message = json.dumps({
-                    "action": "MOVE",
-                    "position": position,
-                    "symbol": symbol
-                })
-                try:
-                    self.clients[opponent.pseudo].send(move_message.encode())
-                    print(f"Sent move to {opponent.pseudo}: {move_message}")
-                except Exception as e:
-                    print(f"Failed to send move to {opponent.pseudo}: {e}")
-
-                result = game.check_winner()
-                if result:
-                    match.is_finished = True
-                    if result == "X":
-                        match.result = match.player1.pseudo
-                    elif result == "O":
-                        match.result = match.player2.pseudo
-                    else:
-                        match.result = "draw"
-                    self.db.update_match(match)
-
-                    end_message = json.dumps({
-                        "action": "END",
-                        "result": match.result
-                    })
-                    try:
-                        self.clients[match.player1.pseudo].send(end_message.encode())
-                        self.clients[match.player2.pseudo].send(end_message.encode())
-                        print(f"Sent end message to {match.player1.pseudo} and {match.player2.pseudo}")
-                    except Exception as e:
-                        print(f"Failed to send end message: {e}")
-                    del self.matches[match_id]
-            else:
-                print(f"Invalid move by {pseudo} at position {position}")
-
-    def handle_mastermind_guess(self, pseudo: str, match_id: int, guess: list):
-        """Gère une tentative de devinette au Mastermind."""
-        with self.lock:
-            if match_id not in self.matches:
-                print(f"Match {match_id} not found for {pseudo}")
-                return
-            match, game = self.matches[match_id]
-            if match.game_type != "mastermind" or not isinstance(match, MastermindMatch):
-                print(f"Match {match_id} is not a Mastermind game")
-                return
-                
-            # Déterminer si c'est le joueur 1 ou 2
-            is_player1 = (pseudo == match.player1.pseudo)
-            player = match.player1 if is_player1 else match.player2
-            opponent = match.player2 if is_player1 else match.player1
-            
-            # Récupérer le code à deviner (code de l'adversaire)
-            code_to_guess = match.player2_code if is_player1 else match.player1_code
-            
-            # Vérifier la tentative
-            black_pins, white_pins = game.check_guess(code_to_guess, guess)
-            feedback = (black_pins, white_pins)
-            
-            # Enregistrer la tentative et le feedback
-            if is_player1:
-                match.player1_guesses.append(guess)
-                match.player1_feedback.append(feedback)
-            else:
-                match.player2_guesses.append(guess)
-                match.player2_feedback.append(feedback)
-                
-            # Enregistrer le tour dans la base de données
-            turn = Turn(match_id, player, guess, feedback)
-            self.db.add_turn(turn)
-            self.db.update_mastermind_match(match)
-            
-            # Envoyer le feedback au joueur
-            guess_feedback_message = json.dumps({
-                "action": "MASTERMIND_FEEDBACK",
-                "black_pins": black_pins,
-                "white_pins": white_pins,
-                "guess_number": len(match.player1_guesses) if is_player1 else len(match.player2_guesses)
-            })
-            self.clients[pseudo].send(guess_feedback_message.encode())
-            
-            # Informer l'adversaire de la tentative
-            opponent_message = json.dumps({
-                "action": "MASTERMIND_OPPONENT_GUESS",
-                "guess": guess,
-                "black_pins": black_pins,
-                "white_pins": white_pins,
-                "guess_number": len(match.player1_guesses) if is_player1 else len(match.player2_guesses)
+            self.timers.cancel(session.heartbeat)
+            self.spectators.unsubscribe(session)
+            self.lobby.unsubscribe(session)
+            self.handle_disconnect(session)
+            client_socket.close()
+
+    def check_heartbeat(self, session):
+        """Relance un client silencieux par un PING, ou ferme sa connexion s'il ne répond plus."""
+        idle = time.monotonic() - session.last_seen
+        try:
+            if idle >= self.HEARTBEAT_TIMEOUT:
+                raise TimeoutError(f"aucun message depuis {idle:.0f} s")
+            # Sans attendre: un envoi précédent toujours bloqué est le signe d'une connexion morte
+            if idle >= self.HEARTBEAT_INTERVAL and not session.write_nowait(PING) and session.pending:
+                raise TimeoutError("tampon d'envoi plein")
+        except OSError as e:
+            print(f"Connexion inactive fermée {session.address}: {e}")
+            try:
+                session.socket.shutdown(socket.SHUT_RDWR)  # réveille handle_client, qui gère la déconnexion
+            except OSError:
+                pass
+            return
+        session.heartbeat = self.timers.schedule(self.HEARTBEAT_INTERVAL, self.check_heartbeat, session)
+
+    def on_pong(self, session, message):
+        """Réponse à un PING (ou signe de vie spontané): l'activité est déjà notée."""
+
+    def on_connect(self, session, message):
+        """Identifie un client: son pseudo est associé à un identifiant de joueur stable."""
+        pseudo = message["pseudo"]
+        player_id = self.db.get_player_id(pseudo)
+        with self.clients_lock:
+            taken = player_id in self.clients
+            if not taken:
+                self.clients[player_id] = session
+        if taken:
+            session.send({
+                "action": "CONNECT",
+                "status": "ERROR",
+                "message": "Pseudo déjà pris."
             })
-            self.clients[opponent.pseudo].send(opponent_message.encode())
-            
-            # Vérifier si le joueur a trouvé le code
-            has_won = (black_pins == len(code_to_guess))
-            
-            # Vérifier si le match est terminé
-            match_ended = False
-            result = None
-            
-            if has_won:
-                # Le joueur a trouvé le code
-                match_ended = True
-                result = pseudo
-            elif (is_player1 and len(match.player1_guesses) >= match.max_attempts) or \
-                 (not is_player1 and len(match.player2_guesses) >= match.max_attempts):
-                # Le joueur a atteint le nombre maximum de tentatives
-                if is_player1 and len(match.player2_guesses) >= match.max_attempts:
-                    # Les deux joueurs ont atteint le max de tentatives
-                    match_ended = True
-                    result = "draw"
-                elif not is_player1 and len(match.player1_guesses) >= match.max_attempts:
-                    # Les deux joueurs ont atteint le max de tentatives
-                    match_ended = True
-                    result = "draw"
-            
-            if match_ended:
-                match.is_finished = True
-                match.result = result
-                self.db.update_match(match)
-                
-                end_message = json.dumps({
-                    "action": "MASTERMIND_END",
-                    "result": result,
-                    "player1_code": match.player1_code,
-                    "player2_code": match.player2_code
-                })
-                
+            return
+        session.player_id = player_id
+        session.pseudo = pseudo
+        player = Player(player_id, pseudo, session.address[0], session.address[1], int(time.time()))
+        self.db.update_player(player)
+        session.send({
+            "action": "CONNECT",
+            "status": "OK",
+            "player_id": player_id,
+            "resume_token": self.issue_token(player_id)
+        })
+
+    def issue_token(self, player_id) -> str:
+        """Crée le jeton de reprise d'un joueur, qui remplace le précédent."""
+        token = secrets.token_urlsafe(16)
+        with self.clients_lock:
+            self.resume_tokens.pop(self.player_tokens.get(player_id), None)
+            self.resume_tokens[token] = player_id
+            self.player_tokens[player_id] = token
+        return token
+
+    def on_resume(self, session, message):
+        """Rattache une nouvelle connexion au joueur d'un jeton de reprise et reprend son match."""
+        with self.clients_lock:
+            player_id = self.resume_tokens.get(message.get("token"))
+            previous = self.clients.get(player_id)
+            if player_id is not None:
+                self.clients[player_id] = session
+        if player_id is None:
+            session.send({"action": "RESUME", "status": "ERROR", "message": "Reprise impossible, reconnectez-vous."})
+            return
+        if previous is not None and previous is not session:
+            # Ancienne connexion restée ouverte: réveille son handle_client, qui la ferme (déconnexion ignorée)
+            try:
+                previous.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        session.player_id = player_id
+        session.pseudo = self.db.get_player(player_id).pseudo
+        token = self.issue_token(player_id)
+        actor = self.get_actor(message.get("match_id"))
+        if actor is None or player_id not in (actor.match.player1.id, actor.match.player2.id):
+            session.send({"action": "RESUME", "status": "ERROR", "token": token, "message": "La partie est terminée."})
+            return
+        session.send({"action": "RESUME", "status": "OK", "token": token, "match_id": actor.match.id})
+        last_seq = message.get("last_seq", 0)
+        actor.post(self.resume_match, player_id, last_seq if isinstance(last_seq, int) else 0)
+
+    def on_spectate(self, session, message):
+        """Abonne un client aux événements d'un match en cours."""
+        actor = self.get_actor(message.get("match_id"))
+        if actor is None:
+            session.send({"action": "SPECTATE", "status": "ERROR", "message": "Match introuvable ou terminé."})
+            return
+        # Abonnement et état initial dans l'acteur: aucun coup ne passe entre les deux
+        actor.post(self.start_spectating, session)
+
+    def start_spectating(self, actor, session):
+        """Envoie l'état du match au spectateur puis lui diffuse les événements suivants."""
+        match = actor.match
+        if match.is_finished:
+            session.send({"action": "SPECTATE", "status": "ERROR", "message": "Match introuvable ou terminé."})
+            return
+        self.spectators.subscribe(session, match.id, {
+            "action": "SPECTATE",
+            "status": "OK",
+            "match_id": match.id,
+            "game_type": match.game_type,
+            "player1": match.player1.pseudo,
+            "player2": match.player2.pseudo,
+            **self.games[match.game_type].spectate_info(actor)
+        })
+
+    def on_unspectate(self, session, message):
+        """Arrête la diffusion d'un match à un spectateur."""
+        self.spectators.unsubscribe(session, message.get("match_id"))
+
+    def on_lobby_subscribe(self, session, message):
+        """Abonne un client au salon: l'état complet lui est envoyé au prochain envoi, puis les changements."""
+        self.lobby.subscribe(session)
+
+    def on_lobby_unsubscribe(self, session, message):
+        self.lobby.unsubscribe(session)
+
+    def on_tournament_create(self, session, message):
+        """Crée un tournoi ouvert aux inscriptions; son créateur y est inscrit."""
+        plugin = self.games.get(message.get("game_type"))
+        # Un match de tournoi doit finir (un joueur absent bloquerait la ronde): toujours à la pendule
+        try:
+            variant = plugin.read_variant({**message, "clock": True}) if plugin is not None else None
+        except ValueError as e:
+            session.send({"action": "ERROR", "message": str(e)})
+            return
+        if plugin is None or not plugin.clocked(variant):
+            session.send({"action": "ERROR", "message": "Pas de tournoi pour ce jeu."})
+            return
+        format = message.get("format", "swiss")
+        capacity = message.get("players", TournamentHub.MAX_PLAYERS)
+        rounds = message.get("rounds")
+        if (format not in Tournament.FORMATS
+                or type(capacity) is not int or not 2 <= capacity <= TournamentHub.MAX_PLAYERS
+                or rounds is not None and (type(rounds) is not int or not 1 <= rounds < capacity)):
+            session.send({"action": "ERROR", "message": "Paramètres du tournoi invalides."})
+            return
+        tournament = self.tournaments.create(plugin.name, variant, format, capacity, rounds, session.player_id)
+        session.send({
+            "action": "TOURNAMENT_CREATED",
+            "tournament_id": tournament.id,
+            "game_type": plugin.name,
+            "format": format,
+            "players": capacity
+        })
+        self.tournaments.join(tournament, session)
+
+    def on_tournament_join(self, session, message):
+        """Inscrit le joueur à un tournoi ouvert; le tournoi commence dès qu'il est complet."""
+        tournament = self.tournaments.get(message.get("tournament_id"))
+        if tournament is None or not self.tournaments.join(tournament, session):
+            session.send({"action": "ERROR", "message": "Tournoi introuvable, complet ou déjà commencé."})
+            return
+        session.send({"action": "TOURNAMENT_JOINED", "tournament_id": tournament.id})
+        self.tournaments.start_if_full(tournament)
+
+    def on_tournament_leave(self, session, message):
+        """Désinscrit le joueur d'un tournoi qui n'a pas commencé."""
+        tournament = self.tournaments.get(message.get("tournament_id"))
+        if tournament is not None:
+            with tournament.lock:
+                removed = tournament.remove(session.player_id)
+            if removed:
+                session.send({"action": "TOURNAMENT_LEFT", "tournament_id": tournament.id})
+
+    def on_tournament_start(self, session, message):
+        """Lance un tournoi avant qu'il soit complet (réservé à son créateur)."""
+        tournament = self.tournaments.get(message.get("tournament_id"))
+        if tournament is None or tournament.creator_id != session.player_id or not self.tournaments.start(tournament):
+            session.send({"action": "ERROR", "message": "Impossible de lancer ce tournoi."})
+
+    def on_tournament_standings(self, session, message):
+        """Envoie une page du classement d'un tournoi et le rang du joueur."""
+        tournament = self.tournaments.get(message.get("tournament_id"))
+        if tournament is None:
+            session.send({"action": "ERROR", "message": "Tournoi introuvable."})
+            return
+        session.send({
+            "action": "TOURNAMENT_STANDINGS",
+            **self.tournaments.standings(tournament, message.get("page", 0), session.player_id)
+        })
+
+    def on_stats(self, session, message):
+        """Envoie les statistiques du joueur, pour un jeu ou pour tous."""
+        stats = self.stats.get(session.player_id)
+        game_type = message.get("game_type")
+        if game_type is not None:
+            stats = {game_type: stats[game_type]} if game_type in stats else {}
+        session.send({"action": "STATS", "game_type": game_type, "stats": stats})
+
+    def on_leaderboard(self, session, message):
+        """Envoie une page du classement d'un jeu et le rang du joueur."""
+        game_type = message.get("game_type")
+        order = message.get("order", "rating")
+        leaderboard = self.leaderboards.get(game_type)
+        if leaderboard is None or order not in Leaderboard.ORDERS:
+            session.send({"action": "ERROR", "message": "Classement inconnu."})
+            return
+        page = message.get("page", 0)
+        if not isinstance(page, int) or not 0 <= page < leaderboard.page_count(order):
+            page = 0
+        session.send({
+            "action": "LEADERBOARD",
+            "game_type": game_type,
+            **leaderboard.page(order, page),
+            "me": leaderboard.lookup(session.player_id)[order]
+        })
+
+    def on_replay(self, session, message):
+        """Envoie une page de la relecture d'un match terminé (à partir du coup "after")."""
+        match = self.db.get_match(message.get("match_id"))
+        if match is None or not match.is_finished or match.game_type not in self.games:
+            session.send({"action": "ERROR", "message": "Partie introuvable."})
+            return
+        plugin = self.games[match.game_type]
+        replay = Replay(self.db, plugin, match, self.archive)
+        after = message.get("after", 0)
+        turns, next_after = replay.page(after if isinstance(after, int) else 0)
+        session.send({
+            "action": "REPLAY",
+            "match_id": match.id,
+            "game_type": match.game_type,
+            "player1": match.player1.pseudo,
+            "player2": match.player2.pseudo,
+            "result": plugin.result_label(match, match.result),
+            **plugin.replay_info(match),
+            # Coups compacts [joueur 1 ou 2, coup, feedback]: une page tient dans un seul message
+            "turns": [[replay.side(turn), turn.move, turn.feedback] for _, turn in turns],
+            "next": next_after
+        })
+
+    def on_join(self, plugin, session, message):
+        """Place le joueur dans la file d'attente d'un jeu."""
+        try:
+            variant = plugin.read_variant(message)
+            data = plugin.read_join_data(message)
+        except ValueError as e:
+            session.send({"action": "ERROR", "message": str(e)})
+            return
+        player = Player(session.player_id, session.pseudo, session.address[0], session.address[1], int(time.time()))
+        self.db.update_player(player)
+        with plugin.lock:
+            # Un joueur n'attend que dans une seule variante à la fois
+            plugin.remove_waiting(session.player_id)
+            plugin.join_data[session.player_id] = data
+            plugin.queues[variant].put(player, session)
+        plugin.matchmaker.notify()
+
+    def on_leave(self, plugin, session, message):
+        """Retire le joueur de la file d'attente d'un jeu."""
+        with plugin.lock:
+            removed = plugin.remove_waiting(session.player_id)
+        if removed:
+            session.send({"action": "LEFT_QUEUE"})
+
+    def on_match_action(self, plugin, handler, session, message):
+        """Transmet une action de jeu à l'acteur du match concerné."""
+        match_id = message["match_id"]
+        actor = self.get_actor(match_id)
+        if actor is None:
+            print(f"Match {match_id} not found for {session.pseudo}")
+            return
+        if actor.match.game_type != plugin.name:
+            print(f"Match {match_id} is not a {plugin.label} game")
+            return
+        actor.post(self.run_match_action, handler, session.player_id, message)
+
+    def run_match_action(self, actor, handler, player_id, message):
+        """Exécute une action de jeu dans l'acteur, si le match est toujours en cours."""
+        if actor.match.is_finished:
+            return
+        if player_id not in (actor.match.player1.id, actor.match.player2.id):
+            return
+        handler(actor, player_id, message)
+
+    def send_to(self, player_id, message, actor=None):
+        """Envoie un message JSON à un joueur connecté.
+
+        Un message envoyé par l'acteur d'un match est numéroté et gardé
+        pour la reprise, même si le joueur est déconnecté.
+        """
+        if actor is not None:
+            message = actor.record(player_id, message)
+        with self.clients_lock:
+            session = self.clients.get(player_id)
+        if session is None:
+            return False
+        try:
+            session.send(message)
+            return True
+        except Exception as e:
+            print(f"Failed to send {message.get('action')} to player {player_id}: {e}")
+            return False
+
+    def get_actor(self, match_id):
+        """Retourne l'acteur d'un match en cours, ou None."""
+        with self.matches_lock:
+            return self.matches.get(match_id)
+
+    def record_result(self, match):
+        """Met à jour classements et statistiques avec le résultat d'un match terminé."""
+        # Le résultat d'un match est l'identifiant du gagnant, "draw" ou "interrupted"
+        self.ratings[match.game_type].record(match.player1.id, match.player2.id, match.result)
+        if match.result != "interrupted":
+            self.stats.record(match, self.games[match.game_type].attempts(match))
+            self.leaderboards[match.game_type].record(match, match.result, self.ratings[match.game_type])
+
+    def finish_match(self, match):
+        """Retire un match terminé (résultat déjà enregistré) des matchs en cours et prévient son tournoi."""
+        with self.matches_lock:
+            self.matches.pop(match.id, None)
+        with self.clients_lock:
+            timers = [self.suspended.pop((match.id, player.id), None) for player in (match.player1, match.player2)]
+        for timer in filter(None, timers):
+            self.timers.cancel(timer)
+        self.journal.append("END", match.id)
+        self.spectators.close_match(match.id)
+        self.tournaments.match_finished(match, match.result)
+
+    def handle_disconnect(self, session):
+        """Gère la déconnexion d'un client."""
+        player_id = session.player_id
+        if player_id is None:
+            return
+        with self.clients_lock:
+            if self.clients.get(player_id) is not session:
+                return  # connexion remplacée par une reprise (RESUME)
+            del self.clients[player_id]
+
+        # Nettoyer les files d'attente et les inscriptions aux tournois
+        for plugin in self.games.values():
+            with plugin.lock:
+                plugin.remove_waiting(player_id)
+        self.tournaments.withdraw(player_id)
+
+        # Gérer les matchs en cours: suspendus le temps que le joueur les reprenne
+        with self.matches_lock:
+            actors = [actor for actor in self.matches.values()
+                      if player_id in (actor.match.player1.id, actor.match.player2.id)]
+        if not actors:
+            with self.clients_lock:
+                self.resume_tokens.pop(self.player_tokens.pop(player_id, None), None)
+        for actor in actors:
+            actor.post(self.suspend_match, player_id)
+
+    def suspend_match(self, actor, player_id):
+        """Suspend un match dont un joueur s'est déconnecté; il est annulé s'il ne revient pas à temps."""
+        match = actor.match
+        if match.is_finished:
+            return
+        with self.clients_lock:
+            self.suspended[(match.id, player_id)] = self.timers.schedule(
+                self.RESUME_GRACE, actor.post, self.expire_suspension, player_id)
+        self.games[match.game_type].pause_clocks(actor, player_id)
+        opponent = match.player2 if match.player1.id == player_id else match.player1
+        self.send_to(opponent.id, {"action": "OPPONENT_SUSPENDED", "grace": self.RESUME_GRACE}, actor)
+
+    def expire_suspension(self, actor, player_id):
+        """Annule un match suspendu que le joueur déconnecté n'a pas repris."""
+        with self.clients_lock:
+            timer = self.suspended.pop((actor.match.id, player_id), None)
+        if timer is not None:
+            self.interrupt_match(actor, player_id)
+
+    def resume_match(self, actor, player_id, last_seq):
+        """Renvoie au joueur qui reprend le match les messages qu'il a manqués, ou l'état complet du match."""
+        match = actor.match
+        with self.clients_lock:
+            timer = self.suspended.pop((match.id, player_id), None)
+        if timer is not None:
+            self.timers.cancel(timer)
+        plugin = self.games[match.game_type]
+        missed = actor.missed(player_id, last_seq)
+        if missed is None:
+            # Messages manqués perdus (tampon dépassé, ou match reconstruit après un redémarrage): état complet
+            state = plugin.end_message(match, match.result) if match.is_finished else plugin.resync_message(actor, player_id)
+            self.send_to(player_id, state, actor)
+            missed = []
+        for message in missed:
+            self.send_to(player_id, message)
+        if not match.is_finished:
+            plugin.resume_clocks(actor, player_id)
+            opponent = match.player2 if match.player1.id == player_id else match.player1
+            self.send_to(opponent.id, {"action": "OPPONENT_RESUMED"}, actor)
+
+    def interrupt_match(self, actor, player_id):
+        """Annule un match dont un joueur s'est déconnecté."""
+        match = actor.match
+        if match.is_finished:
+            return
+        leaver, opponent = (match.player1, match.player2) if match.player1.id == player_id else (match.player2, match.player1)
+        match.is_finished = True
+        match.result = "interrupted"
+        self.games[match.game_type].stop_clocks(actor)
+        self.db.update_match(match)
+        self.record_result(match)
+        self.send_to(opponent.id, {
+            "action": "MATCH_INTERRUPTED",
+            "message": f"Votre adversaire ({leaver.pseudo}) s'est déconnecté. Le match est annulé."
+        }, actor)
+        self.spectators.publish(match.id, {
+            "action": "MATCH_INTERRUPTED",
+            "message": f"{leaver.pseudo} s'est déconnecté. Le match est annulé."
+        })
+        self.finish_match(match)
+
+    def recover_matches(self):
+        """Reconstruit les matchs restés ouverts dans le journal et reprend l'écriture du journal."""
+        recovered = recover_matches(self.journal, self.db, self.games, self.pool)
+        with self.matches_lock:
+            self.matches.update(recovered)
+        if recovered:
+            print(f"{len(recovered)} match(s) reconstruit(s) à partir du journal")
+            self.timers.schedule(self.RECOVERY_GRACE, self.expire_recovered, list(recovered))
+
+    def expire_recovered(self, match_ids):
+        """Annule les matchs reconstruits dont un joueur ne s'est pas reconnecté à temps."""
+        with self.clients_lock:
+            connected = set(self.clients)
+        for match_id in match_ids:
+            actor = self.get_actor(match_id)
+            if actor is None:
+                continue
+            for player in (actor.match.player1, actor.match.player2):
+                if player.id not in connected:
+                    actor.post(self.interrupt_match, player.id)
+                    break
+
+    def matchmaking_tick(self, plugin):
+        """Forme en une passe tous les matchs possibles dans les files d'un jeu."""
+        with plugin.lock:
+            pairs = [(variant, pair) for variant, queue in plugin.queues.items() for pair in queue.drain_pairs()]
+            # Récupérer et nettoyer les données de JOIN (code secret...)
+            data = {
+                player.id: plugin.join_data.pop(player.id, None)
+                for _, pair in pairs for player, _ in pair
+            }
+        if not pairs:
+            return
+        for variant, _ in pairs:
+            self.lobby.record_matched(plugin.name, variant, 2)
+        self.start_matches(plugin, self.create_matches(plugin, pairs, data))
+
+    def create_matches(self, plugin, pairs, data) -> list:
+        """Crée les matchs de paires [(variante, ((joueur, session), (joueur, session)))] et leurs acteurs.
+
+        Retourne [(match, session1, session2)]; les joueurs ne sont prévenus que par start_matches.
+        """
+        if not pairs:
+            return []
+        created = []  # (match, game, session1, session2)
+        for variant, ((player1, session1), (player2, session2)) in pairs:
+            match, game = plugin.create_match(variant, player1, player2, data[player1.id], data[player2.id])
+            created.append((match, game, session1, session2))
+
+        # Insertion groupée en base puis enregistrement des acteurs
+        match_ids = self.db.add_matches([match for match, _, _, _ in created])
+        actors = {}
+        for (match, game, _, _), (variant, _), match_id in zip(created, pairs, match_ids):
+            match.id = match_id
+            actors[match_id] = MatchActor(match, game, self.pool)
+            # Pendules en route avant le START (l'acteur n'est pas encore visible des autres threads)
+            plugin.start_clocks(actors[match_id], variant)
+            self.journal.start(match, variant, data[match.player1.id], data[match.player2.id])
+        with self.matches_lock:
+            self.matches.update(actors)
+        return [(match, session1, session2) for match, _, session1, session2 in created]
+
+    def start_matches(self, plugin, created):
+        """Envoie les messages de début de partie, avec les limites de temps des matchs à la pendule."""
+        for match, session1, session2 in created:
+            actor = self.get_actor(match.id)
+            clock = plugin.clock_settings(actor) if actor is not None else {}
+            for session, message in zip((session1, session2), plugin.start_messages(match)):
                 try:
-                    self.clients[match.player1.pseudo].send(end_message.encode())
-                    self.clients[match.player2.pseudo].send(end_message.encode())
-                    print(f"Sent end message to {match.player1.pseudo} and {match.player2.pseudo}")
+                    session.send({**message, **clock})
                 except Exception as e:
-                    print(f"Failed to send end message: {e}")
-                
-                del self.matches[match_id]
+                    print(f"Failed to send start message for match {match.id}: {e}")
 
     def run(self):
         """Démarre le serveur et l'interface graphique."""
         threading.Thread(target=self.run_server, daemon=True).start()
         self.root.mainloop()
+        for plugin in self.games.values():
+            plugin.matchmaker.stop()
+        self.archiver.stop()
+        self.timers.stop()
+        self.lobby.stop()
+        self.spectators.stop()
+        self.pool.shutdown(wait=False)
+        self.journal.close()
         self.db.close()
         self.server.close()
 
     def run_server(self):
         """Boucle principale du serveur."""
+        for plugin in self.games.values():
+            plugin.matchmaker.start()
+        self.archiver.start()
+        self.timers.start()
+        self.lobby.start()
+        self.spectators.start()
         try:
             while True:
                 client, address = self.server.accept()
@@ -0,0 +1,61 @@
+"""Connexion d'un client côté serveur."""
+import json
+import socket
+import threading
+import time
+
+class Session:
+    """État de la connexion d'un client.
+
+    Tout ce qui est envoyé au client passe par write ou write_nowait, sous
+    le verrou d'écriture de la session: les messages des acteurs des matchs,
+    du salon, des spectateurs et des minuteurs ne s'entremêlent jamais.
+    """
+    def __init__(self, client_socket, address):
+        self.socket = client_socket
+        self.address = address
+        self.player_id = None  # attribué au CONNECT
+        self.pseudo = None     # nom affiché
+        self.last_seen = time.monotonic()  # dernier message reçu
+        self.heartbeat = None  # prochaine vérification de l'activité
+        self.write_lock = threading.Lock()
+        self.pending = b""     # fin d'un envoi sans attente que le socket n'a pas encore acceptée
+
+    def send(self, message):
+        self.write(json.dumps(message).encode())
+
+    def write(self, data):
+        """Envoie des octets, en attendant que le socket les accepte."""
+        with self.write_lock:
+            if self.pending:
+                self.socket.sendall(self.pending)
+                self.pending = b""
+            self.socket.sendall(data)
+
+    def write_nowait(self, data=b"") -> bool:
+        """Envoie sans jamais attendre: ce que le socket n'accepte pas est gardé pour l'envoi suivant.
+
+        Retourne False, sans rien envoyer, si un autre envoi est en cours, si
+        la fin d'un envoi précédent n'est pas encore partie (client lent) ou
+        si la connexion est fermée.
+        """
+        if not self.write_lock.acquire(blocking=False):
+            return False
+        try:
+            if self.pending:
+                self.pending = self.pending[self._send_nowait(self.pending):]
+                if self.pending:
+                    return False
+            if data:
+                self.pending = data[self._send_nowait(data):]
+            return True
+        except OSError:
+            return False
+        finally:
+            self.write_lock.release()
+
+    def _send_nowait(self, data) -> int:
+        try:
+            return self.socket.send(data, getattr(socket, "MSG_DONTWAIT", 0))
+        except (BlockingIOError, InterruptedError):
+            return 0  # tampon d'envoi plein
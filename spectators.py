@@ -0,0 +1,176 @@
+"""Diffusion des événements des matchs aux spectateurs (action SPECTATE).
+
+Le thread d'un match ne fait que sérialiser l'événement une seule fois et
+le déposer dans la file du diffuseur: un seul thread d'écriture, propriétaire
+des abonnements, envoie ensuite les mêmes octets à chaque spectateur, sans
+jamais attendre (Session.write_nowait). Ce qu'un socket n'accepte pas reste
+dans le retard du spectateur, renvoyé toutes les RETRY_INTERVAL secondes;
+un spectateur dont le retard dépasse BACKLOG_SIZE événements est retiré de
+la diffusion.
+
+Abonnements, désabonnements et fins de match passent par la même file que
+les événements: ils sont appliqués dans l'ordre où les matchs les ont
+demandés (état initial avant les coups suivants, END avant la fermeture).
+"""
+import collections
+import json
+import threading
+import time
+
+class Spectator:
+    """Connexion d'un spectateur: événements que son socket n'a pas encore acceptés."""
+    BACKLOG_SIZE = 256  # événements en retard avant d'abandonner le spectateur
+
+    def __init__(self, session):
+        self.session = session
+        self.backlog = collections.deque()
+        self.matches = set()  # matchs suivis
+        self.closing = None   # plus aucun match suivi: délai pour finir d'envoyer le retard
+
+    def push(self, data) -> bool:
+        """Ajoute un événement à envoyer; False si le spectateur a déjà trop de retard."""
+        if len(self.backlog) >= self.BACKLOG_SIZE:
+            return False
+        self.backlog.append(data)
+        return True
+
+    def flush(self) -> bool:
+        """Envoie sans attendre ce que le socket accepte; True s'il ne reste plus rien."""
+        while self.backlog:
+            if not self.session.write_nowait(self.backlog[0]):
+                return False
+            self.backlog.popleft()
+        return True
+
+class SpectatorHub:
+    """Spectateurs des matchs en cours et thread qui leur diffuse les événements."""
+    RETRY_INTERVAL = 0.01  # secondes entre deux reprises des envois en retard
+    CLOSE_GRACE = 1.0      # secondes pour envoyer le retard d'un spectateur qui ne suit plus rien
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.watched = set()  # matchs qui ont eu un spectateur (sous self.lock)
+        self.tasks = collections.deque()  # (méthode, arguments...) exécutées par le thread d'écriture
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+        # Tenus par le thread d'écriture seul
+        self.watchers = {}       # match_id -> spectateurs
+        self.spectators = {}     # session -> Spectator
+        self.backlogged = set()  # spectateurs avec des envois en retard
+
+    def post(self, task, *args):
+        """Confie une opération au thread d'écriture."""
+        self.tasks.append((task, *args))
+        self.wakeup.set()
+
+    def subscribe(self, session, match_id, snapshot):
+        """Abonne une session aux événements d'un match; snapshot (état actuel) lui est envoyé en premier."""
+        with self.lock:
+            self.watched.add(match_id)
+        self.post(self._subscribe, session, match_id, json.dumps(snapshot).encode())
+
+    def unsubscribe(self, session, match_id=None):
+        """Désabonne une session d'un match, ou de tous (déconnexion)."""
+        self.post(self._unsubscribe, session, match_id)
+
+    def publish(self, match_id, message):
+        """Diffuse un événement d'un match à ses spectateurs, encodé une seule fois."""
+        with self.lock:
+            if match_id not in self.watched:
+                return
+        self.post(self._publish, match_id, json.dumps({**message, "match_id": match_id}).encode())
+
+    def close_match(self, match_id):
+        """Désabonne tous les spectateurs d'un match terminé, après ses derniers événements."""
+        with self.lock:
+            if match_id not in self.watched:
+                return
+            self.watched.discard(match_id)
+        self.post(self._close_match, match_id)
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.wakeup.wait(self.RETRY_INTERVAL if self.backlogged else None)
+            self.wakeup.clear()
+            try:
+                while self.tasks:
+                    task, *args = self.tasks.popleft()
+                    task(*args)
+                self.retry()
+            except Exception as e:
+                print(f"Erreur lors de la diffusion aux spectateurs: {e}")
+
+    def stop(self):
+        self.stopped.set()
+        self.wakeup.set()
+
+    def retry(self):
+        """Reprend les envois en retard; abandonne ceux des spectateurs partis depuis CLOSE_GRACE."""
+        now = time.monotonic()
+        for spectator in list(self.backlogged):
+            if not spectator.flush() and (spectator.closing is None or now < spectator.closing):
+                continue
+            self.backlogged.discard(spectator)
+            if spectator.closing is not None and self.spectators.get(spectator.session) is spectator:
+                del self.spectators[spectator.session]
+
+    def _send(self, spectator, data):
+        """Envoie un événement à un spectateur, après son retard éventuel."""
+        if not spectator.push(data):
+            self._drop(spectator)
+        elif spectator not in self.backlogged and not spectator.flush():
+            self.backlogged.add(spectator)
+
+    def _subscribe(self, session, match_id, data):
+        spectator = self.spectators.get(session)
+        if spectator is None:
+            spectator = self.spectators[session] = Spectator(session)
+        spectator.closing = None
+        spectator.matches.add(match_id)
+        self.watchers.setdefault(match_id, set()).add(spectator)
+        self._send(spectator, data)
+
+    def _unsubscribe(self, session, match_id):
+        spectator = self.spectators.get(session)
+        if spectator is None:
+            return
+        for watched in [match_id] if match_id is not None else list(spectator.matches):
+            spectator.matches.discard(watched)
+            self._remove(watched, spectator)
+        if spectator.matches:
+            return
+        if match_id is None or spectator not in self.backlogged:
+            # Déconnexion, ou plus rien à envoyer
+            del self.spectators[session]
+            self.backlogged.discard(spectator)
+        else:
+            spectator.closing = time.monotonic() + self.CLOSE_GRACE
+
+    def _publish(self, match_id, data):
+        for spectator in list(self.watchers.get(match_id, ())):
+            self._send(spectator, data)
+
+    def _close_match(self, match_id):
+        for spectator in list(self.watchers.get(match_id, ())):
+            self._unsubscribe(spectator.session, match_id)
+
+    def _drop(self, spectator):
+        """Retire un spectateur trop lent de tous les matchs qu'il suit."""
+        if self.spectators.get(spectator.session) is not spectator:
+            return  # déjà retiré
+        del self.spectators[spectator.session]
+        self.backlogged.discard(spectator)
+        for match_id in spectator.matches:
+            self._remove(match_id, spectator)
+        spectator.matches.clear()
+        print(f"Spectateur {spectator.session.address} retiré: trop d'événements en retard")
+
+    def _remove(self, match_id, spectator):
+        watchers = self.watchers.get(match_id)
+        if watchers is not None:
+            watchers.discard(spectator)
+            if not watchers:
+                del self.watchers[match_id]
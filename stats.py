@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+
+class PlayerStats:
+    """Statistiques cumulées des joueurs, par jeu.
+
+    La table player_stats est mise à jour à la fin de chaque match (une
+    ligne par joueur, sans relire l'historique). Les statistiques des
+    joueurs consultés récemment restent en mémoire: une demande STATS ne
+    coûte alors qu'une recherche dans un dictionnaire.
+    """
+    CACHE_SIZE = 4096
+
+    def __init__(self, db):
+        self.db = db
+        self.cache = OrderedDict()  # identifiant du joueur -> {game_type: [parties, victoires, défaites, nuls, tentatives]}
+        self.lock = threading.Lock()
+
+    def _entry(self, player_id):
+        """Statistiques d'un joueur, lues en base au premier accès (appelé sous le verrou)."""
+        entry = self.cache.get(player_id)
+        if entry is None:
+            entry = {game_type: list(row) for game_type, row in self.db.get_player_stats(player_id).items()}
+            self.cache[player_id] = entry
+            if len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(player_id)
+        return entry
+
+    def get(self, player_id: int) -> dict:
+        """Statistiques d'un joueur prêtes à envoyer: game_type -> compteurs et moyenne de tentatives."""
+        with self.lock:
+            entry = self._entry(player_id)
+            return {
+                game_type: {
+                    "games": games,
+                    "wins": wins,
+                    "losses": losses,
+                    "draws": draws,
+                    "average_attempts": round(attempts / games, 2) if attempts else None
+                }
+                for game_type, (games, wins, losses, draws, attempts) in entry.items()
+            }
+
+    def record(self, match, attempts):
+        """Ajoute un match terminé aux statistiques de ses deux joueurs."""
+        rows = []
+        for player, player_attempts in zip((match.player1, match.player2), attempts):
+            win = match.result == player.id
+            draw = match.result == "draw"
+            rows.append((player.id, match.game_type, int(win), int(not win and not draw), int(draw), player_attempts))
+        with self.lock:
+            # Écriture et cache sous le même verrou: une lecture concurrente ne compte pas le match deux fois
+            self.db.add_player_stats(rows)
+            for player_id, game_type, *counts in rows:
+                entry = self.cache.get(player_id)
+                if entry is None:
+                    continue  # relu en base à la prochaine demande
+                totals = entry.setdefault(game_type, [0, 0, 0, 0, 0])
+                totals[0] += 1
+                for index, count in enumerate(counts, start=1):
+                    totals[index] += count
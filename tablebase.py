@@ -0,0 +1,176 @@
+"""Table de finales du Morpion 3×3.
+
+Usage hors ligne (annote les coups déjà joués): python tablebase.py annotate [matchmaking.db]
+"""
+import mmap
+import os
+import sqlite3
+import sys
+import threading
+from migrations import migrate
+
+class MorpionTablebase:
+    """Valeur exacte de chaque position du Morpion 3×3, précalculée une fois.
+
+    Une position est indexée en base 3 (case vide = 0, X = 1, O = 2), soit
+    3^9 index. Chaque valeur, vue du joueur au trait, tient sur 2 bits et le
+    fichier (moins de 5 Ko) est projeté en mémoire au premier accès: pas de
+    recherche pendant la partie, une simple lecture de bits.
+    """
+    SIZE = 3 ** 9
+    UNKNOWN, LOSS, DRAW, WIN = range(4)  # UNKNOWN: position inaccessible
+    OUTCOMES = {LOSS: "loss", DRAW: "draw", WIN: "win"}
+    POWERS = tuple(3 ** position for position in range(9))
+    SYMBOL_CODES = {"X": 1, "O": 2}
+    LINES = (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8),
+        (0, 3, 6), (1, 4, 7), (2, 5, 8),
+        (0, 4, 8), (2, 4, 6)
+    )
+    PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "morpion_tablebase.bin")
+
+    def __init__(self, path=PATH):
+        self.path = path
+        self.data = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Projette la table en mémoire, en la générant si le fichier n'existe pas."""
+        with self.lock:
+            if self.data is None:
+                if not os.path.exists(self.path):
+                    self.generate(self.path)
+                with open(self.path, "rb") as f:
+                    self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.data
+
+    @classmethod
+    def generate(cls, path):
+        """Résout toutes les positions accessibles et écrit la table (2 bits par position)."""
+        values = {}
+        cls._solve([0] * 9, 0, 1, values)
+        table = bytearray((cls.SIZE + 3) // 4)
+        for index, value in values.items():
+            table[index >> 2] |= value << ((index & 3) * 2)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(table)
+        os.replace(temporary, path)
+
+    @classmethod
+    def _solve(cls, board, index, to_move, values):
+        """Négamax mémoïsé: valeur de la position pour le joueur au trait."""
+        if index in values:
+            return values[index]
+        if any(board[a] and board[a] == board[b] == board[c] for a, b, c in cls.LINES):
+            value = cls.LOSS  # l'adversaire vient d'aligner trois pions
+        elif all(board):
+            value = cls.DRAW
+        else:
+            value = cls.LOSS
+            for position in range(9):
+                if board[position]:
+                    continue
+                board[position] = to_move
+                child = cls._solve(board, index + to_move * cls.POWERS[position], 3 - to_move, values)
+                board[position] = 0
+                value = max(value, cls.WIN + cls.LOSS - child)
+        values[index] = value
+        return value
+
+    @classmethod
+    def index(cls, cells) -> int:
+        """Index d'une position donnée par ses cases jouées (position -> symbole)."""
+        return sum(cls.POWERS[position] * cls.SYMBOL_CODES[symbol] for position, symbol in cells.items())
+
+    def value(self, index: int) -> int:
+        """Valeur d'une position pour le joueur au trait."""
+        data = self.data if self.data is not None else self.load()
+        return (data[index >> 2] >> ((index & 3) * 2)) & 3
+
+    def grade(self, cells, position: int, symbol: str):
+        """Qualifie un coup avant qu'il soit joué: "best", "inaccuracy", "blunder" ou None."""
+        index = self.index(cells)
+        before = self.value(index)
+        after = self.value(index + self.POWERS[position] * self.SYMBOL_CODES[symbol])
+        if before == self.UNKNOWN or after == self.UNKNOWN:
+            return None  # position hors jeu normal (coup hors tour...)
+        # La valeur après le coup est vue de l'adversaire, d'où l'inversion
+        if self.WIN + self.LOSS - after != before:
+            return "blunder"  # issue changée: gain perdu (nul ou perte) ou nul perdu
+        if before == self.WIN and not self.completes_line(cells, position, symbol) and any(
+                self.completes_line(cells, other, symbol) for other in range(9) if other not in cells):
+            return "inaccuracy"  # gain conservé, mais alignement immédiat manqué
+        return "best"
+
+    @classmethod
+    def completes_line(cls, cells, position: int, symbol: str) -> bool:
+        """Vrai si un pion posé en position aligne trois pions du joueur."""
+        return any(position in line and all(cells.get(other) == symbol for other in line if other != position)
+                   for line in cls.LINES)
+
+    def best_move(self, cells):
+        """Meilleur coup du joueur au trait et issue attendue, ou (None, None) si la partie est finie."""
+        index = self.index(cells)
+        value = self.value(index)
+        if value == self.UNKNOWN or len(cells) == 9:
+            return None, None
+        code = 1 if len(cells) % 2 == 0 else 2  # X commence
+        best = None
+        for position in range(9):
+            if position in cells:
+                continue
+            child = self.value(index + code * self.POWERS[position])
+            if child != self.UNKNOWN and (best is None or child < best[0]):
+                best = (child, position)
+        if best is None:
+            return None, None  # la partie est déjà gagnée
+        return best[1], self.OUTCOMES[value]
+
+# Table partagée par tous les matchs, chargée au premier coup de Morpion 3×3
+TABLEBASE = MorpionTablebase()
+
+def is_classic(board: str) -> bool:
+    """Vrai si un plateau stocké est un Morpion 3×3 classique (format creux ou ancien format liste)."""
+    return board.startswith("3x3:") or board.startswith("[")
+
+def annotate_turns(db_name="matchmaking.db", batch_size=1000) -> int:
+    """Note tous les coups de Morpion 3×3 de la table turns en une seule passe."""
+    conn = sqlite3.connect(db_name)
+    migrate(conn)
+    rows = conn.execute('''
+        SELECT turns.id, turns.match_id, turns.player_id, turns.move, matches.player1_id, matches.board
+        FROM turns JOIN matches ON matches.id = turns.match_id
+        WHERE matches.game_type = 'morpion'
+        ORDER BY turns.match_id, turns.id
+    ''')
+    graded = 0
+    updates = []
+    current_match, cells = None, {}
+    for turn_id, match_id, player, move, player1, board in rows:
+        if not is_classic(board):
+            continue
+        if match_id != current_match:
+            current_match, cells = match_id, {}
+        position = int(move)
+        symbol = "X" if player == player1 else "O"
+        if 0 <= position < 9 and position not in cells:
+            updates.append((TABLEBASE.grade(cells, position, symbol), turn_id))
+            cells[position] = symbol
+        if len(updates) >= batch_size:
+            conn.executemany("UPDATE turns SET grade = ? WHERE id = ?", updates)
+            graded += len(updates)
+            updates = []
+    if updates:
+        conn.executemany("UPDATE turns SET grade = ? WHERE id = ?", updates)
+        graded += len(updates)
+    conn.commit()
+    conn.close()
+    return graded
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "annotate":
+        print(__doc__)
+        sys.exit(1)
+    db_name = sys.argv[2] if len(sys.argv) > 2 else "matchmaking.db"
+    print(f"{annotate_turns(db_name)} coups notés dans {db_name}")
@@ -0,0 +1,110 @@
+"""Roue de minuteurs hiérarchique.
+
+Les minuteurs sont rangés par échéance dans des roues de 2^bits cases: la
+première roue avance d'une case par tick, chaque roue suivante d'une case
+par tour complet de la précédente. À chaque tick, seule la case courante de
+la première roue est vidée; les minuteurs lointains descendent d'une roue
+quand la roue inférieure fait un tour. Programmer ou annuler un minuteur
+coûte O(1), et un tick ne coûte que les minuteurs qui expirent, quel que
+soit le nombre de minuteurs en attente.
+"""
+import threading
+import time
+
+class WheelTimer:
+    """Minuteur programmé dans une roue (annulable avec TimerWheel.cancel)."""
+    __slots__ = ("expires", "callback", "args", "bucket", "cancelled")
+
+    def __init__(self, expires, callback, args):
+        self.expires = expires  # tick d'échéance
+        self.callback = callback
+        self.args = args
+        self.bucket = None      # case où le minuteur attend
+        self.cancelled = False
+
+class TimerWheel:
+    def __init__(self, tick=0.1, bits=6, levels=4, clock=time.monotonic):
+        self.tick = tick
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.levels = levels
+        self.wheels = [[set() for _ in range(1 << bits)] for _ in range(levels)]
+        self.clock = clock
+        self.current = int(clock() / tick)  # dernier tick traité
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def schedule(self, delay, callback, *args) -> WheelTimer:
+        """Programme callback(*args) dans delay secondes au moins (arrondi au tick suivant)."""
+        expires = -int(-(self.clock() + delay) // self.tick)
+        with self.lock:
+            timer = WheelTimer(max(self.current + 1, expires), callback, args)
+            self._insert(timer)
+        return timer
+
+    def cancel(self, timer):
+        """Annule un minuteur, même s'il est en train d'expirer."""
+        if timer is None:
+            return
+        with self.lock:
+            timer.cancelled = True
+            if timer.bucket is not None:
+                timer.bucket.discard(timer)
+                timer.bucket = None
+
+    def _insert(self, timer):
+        """Range un minuteur dans la roue de son échéance (appelé sous le verrou)."""
+        delta = max(0, timer.expires - self.current)
+        for level in range(self.levels):
+            if delta < 1 << (self.bits * (level + 1)):
+                break
+        else:
+            # Au-delà de la dernière roue: attendre dans sa dernière case, puis être rangé à nouveau
+            delta = (1 << (self.bits * self.levels)) - 1
+        index = ((self.current + delta) >> (self.bits * level)) & self.mask
+        timer.bucket = self.wheels[level][index]
+        timer.bucket.add(timer)
+
+    def advance(self, now=None) -> int:
+        """Traite les ticks écoulés jusqu'à now et exécute les minuteurs expirés; retourne leur nombre."""
+        target = int((self.clock() if now is None else now) / self.tick)
+        fired = 0
+        while self.current < target:
+            with self.lock:
+                self.current += 1
+                # Un tour complet d'une roue fait descendre la case suivante de la roue supérieure
+                level = 1
+                while level < self.levels and not self.current & ((1 << (self.bits * level)) - 1):
+                    level += 1
+                for upper in range(level - 1, 0, -1):
+                    index = (self.current >> (self.bits * upper)) & self.mask
+                    bucket, self.wheels[upper][index] = self.wheels[upper][index], set()
+                    for timer in bucket:
+                        self._insert(timer)
+                index = self.current & self.mask
+                due, self.wheels[0][index] = self.wheels[0][index], set()
+                for timer in due:
+                    timer.bucket = None
+            for timer in due:
+                if timer.cancelled:
+                    continue
+                fired += 1
+                try:
+                    timer.callback(*timer.args)
+                except Exception as e:
+                    print(f"Erreur dans un minuteur: {e}")
+        return fired
+
+    def __len__(self):
+        with self.lock:
+            return sum(len(bucket) for wheel in self.wheels for bucket in wheel)
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        while not self.stopped.wait(self.tick):
+            self.advance()
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,399 @@
+"""Tournois: rondes suisses ou élimination directe.
+
+Le Tournament ne connaît que les identifiants des joueurs: appariement des
+rondes, résultats et classement. Le classement est une liste de clés
+(points, départage, tête de série) gardée triée: un résultat ne déplace que
+les deux joueurs du match et leurs anciens adversaires (départage Buchholz,
+somme des points des adversaires), sans retrier tout le tableau. En rondes
+suisses, il donne aussi directement l'ordre d'appariement.
+
+Le TournamentHub fait jouer les tournois sur le serveur: tous les matchs
+d'une ronde sont créés d'un coup par la même machinerie que le matchmaking,
+et la ronde suivante est lancée quand le dernier résultat arrive.
+"""
+import itertools
+import threading
+import time
+from bisect import bisect_left, insort
+from models import Player
+
+WIN = 2   # points d'une victoire (ou d'une exemption)
+DRAW = 1  # points d'un nul
+DOUBLE_FORFEIT = "forfeit"  # résultat d'un match qu'aucun des deux joueurs n'a joué
+
+class Entrant:
+    """Joueur inscrit à un tournoi commencé."""
+    __slots__ = ("player_id", "seed", "points", "buchholz", "opponents", "firsts", "bye")
+
+    def __init__(self, player_id, seed):
+        self.player_id = player_id
+        self.seed = seed         # 0 pour le mieux classé à l'inscription
+        self.points = 0
+        self.buchholz = 0        # somme des points des adversaires rencontrés
+        self.opponents = []      # adversaires rencontrés, dans l'ordre des rondes
+        self.firsts = 0          # matchs joués en premier (X, joueur 1)
+        self.bye = False         # exemption déjà reçue (rondes suisses)
+
+    def key(self):
+        return (-self.points, -self.buchholz, self.seed)
+
+class Tournament:
+    FORMATS = ("swiss", "elimination")
+    ELIMINATION_REPLAYS = 2  # nuls rejoués avant de qualifier la meilleure tête de série
+
+    def __init__(self, tournament_id, game_type, variant, format, capacity, rounds, creator_id):
+        self.id = tournament_id
+        self.game_type = game_type
+        self.variant = variant
+        self.format = format
+        self.capacity = capacity
+        self.rounds = rounds       # nombre de rondes suisses (None: calculé au départ)
+        self.creator_id = creator_id
+        self.players = {}          # identifiant -> Player, dans l'ordre d'inscription
+        self.state = "open"        # open, running, finished
+        self.round = 0
+        self.closed = 0            # dernière ronde terminée
+        self.entrants = {}         # identifiant -> Entrant
+        self.seeded = []           # entrants par tête de série
+        self.table = []            # clés des entrants, triées du premier au dernier
+        self.pending = {}          # (joueur 1, joueur 2) -> nuls déjà joués, matchs de la ronde sans résultat
+        self.bracket = []          # élimination: qualifiés dans l'ordre du tableau
+        self.slots = {}            # élimination: paire -> place du vainqueur dans le tableau suivant
+        self.lock = threading.Lock()
+
+    def add(self, player) -> bool:
+        """Inscrit un joueur; False si le tournoi est complet ou déjà commencé."""
+        if self.state != "open" or len(self.players) >= self.capacity:
+            return False
+        self.players.setdefault(player.id, player)
+        return True
+
+    def remove(self, player_id) -> bool:
+        """Désinscrit un joueur avant le début du tournoi."""
+        return self.state == "open" and self.players.pop(player_id, None) is not None
+
+    def begin(self, rating_of):
+        """Fixe les têtes de série par classement Elo et prépare le tableau."""
+        ordered = sorted(self.players, key=lambda player_id: -rating_of(player_id))
+        self.seeded = [Entrant(player_id, seed) for seed, player_id in enumerate(ordered)]
+        self.entrants = {entrant.player_id: entrant for entrant in self.seeded}
+        self.table = [entrant.key() for entrant in self.seeded]
+        count = len(self.seeded)
+        if self.format == "elimination":
+            # Tableau classique: 1 contre N, les meilleures têtes de série exemptées si N n'est pas une puissance de 2
+            size = 1 << (count - 1).bit_length()
+            order = [0]
+            while len(order) < size:
+                order = [seed for top in order for seed in (top, 2 * len(order) - 1 - top)]
+            self.bracket = [self.seeded[seed].player_id if seed < count else None for seed in order]
+            self.rounds = (size - 1).bit_length()
+        elif self.rounds is None:
+            self.rounds = max(1, (count - 1).bit_length())
+        self.state = "running"
+
+    def _update(self, entrant, points=0, buchholz=0):
+        """Modifie les points d'un entrant et replace sa clé dans le classement."""
+        del self.table[bisect_left(self.table, entrant.key())]
+        entrant.points += points
+        entrant.buchholz += buchholz
+        insort(self.table, entrant.key())
+
+    def _score(self, entrant, points):
+        """Ajoute des points à un entrant et au départage de ses adversaires."""
+        if not points:
+            return
+        self._update(entrant, points)
+        for opponent_id in entrant.opponents:
+            self._update(self.entrants[opponent_id], buchholz=points)
+
+    def next_round(self) -> list:
+        """Commence la ronde suivante et retourne ses paires (joueur 1, joueur 2); les exemptions sont appliquées."""
+        self.round += 1
+        if self.format == "elimination":
+            pairings = self._pair_bracket()
+        else:
+            pairings = self._pair_swiss()
+        self.pending = dict.fromkeys(pairings, 0)
+        return pairings
+
+    def _pair_swiss(self) -> list:
+        """Apparie dans l'ordre du classement, chaque joueur avec le suivant qu'il n'a pas encore rencontré."""
+        order = [self.seeded[key[2]] for key in self.table]
+        if len(order) % 2:
+            # Exemption pour le moins bien classé qui n'en a pas encore eu
+            exempt = next((entrant for entrant in reversed(order) if not entrant.bye), order[-1])
+            order.remove(exempt)
+            exempt.bye = True
+            self._score(exempt, WIN)
+        taken = set()
+        pairings, left = [], []
+        for index, entrant in enumerate(order):
+            if entrant.player_id in taken:
+                continue
+            taken.add(entrant.player_id)
+            for opponent in itertools.islice(order, index + 1, None):
+                if opponent.player_id not in taken and opponent.player_id not in entrant.opponents:
+                    taken.add(opponent.player_id)
+                    pairings.append(self._colors(entrant, opponent))
+                    break
+            else:
+                left.append(entrant)
+        # Rares joueurs qui ont déjà rencontré tous les restants: revanche plutôt que pas de match
+        pairings.extend(self._colors(first, second) for first, second in zip(left[0::2], left[1::2]))
+        return pairings
+
+    def _colors(self, first, second):
+        """Donne le premier coup à celui des deux qui l'a eu le moins souvent."""
+        if second.firsts < first.firsts:
+            first, second = second, first
+        first.firsts += 1
+        return (first.player_id, second.player_id)
+
+    def _pair_bracket(self) -> list:
+        """Apparie les qualifiés voisins du tableau; un joueur sans adversaire passe directement."""
+        pairings = []
+        self.slots = {}
+        advanced = [None] * (len(self.bracket) // 2)
+        for slot, (first, second) in enumerate(zip(self.bracket[0::2], self.bracket[1::2])):
+            if first is None or second is None:
+                advanced[slot] = first if second is None else second
+                continue
+            pair = (first, second) if self.entrants[first].seed < self.entrants[second].seed else (second, first)
+            self.slots[pair] = slot
+            pairings.append(pair)
+        self.bracket = advanced
+        return pairings
+
+    def record(self, player1_id, player2_id, winner) -> bool:
+        """Enregistre le résultat d'un match de la ronde: identifiant du vainqueur, None (nul) ou DOUBLE_FORFEIT.
+
+        Retourne False si le match doit être rejoué (nul en élimination directe).
+        """
+        pair = (player1_id, player2_id) if (player1_id, player2_id) in self.pending else (player2_id, player1_id)
+        if pair not in self.pending:
+            return True  # résultat déjà enregistré
+        first, second = (self.entrants[player_id] for player_id in pair)
+        if self.format == "elimination":
+            if winner is None:
+                self.pending[pair] += 1
+                if self.pending[pair] <= self.ELIMINATION_REPLAYS:
+                    return False
+            if winner not in pair:
+                winner = first.player_id  # meilleure tête de série
+            self.bracket[self.slots.pop(pair)] = winner
+        del self.pending[pair]
+        first.opponents.append(second.player_id)
+        second.opponents.append(first.player_id)
+        self._update(first, buchholz=second.points)
+        self._update(second, buchholz=first.points)
+        if winner is None:
+            self._score(first, DRAW)
+            self._score(second, DRAW)
+        elif winner in pair:
+            self._score(self.entrants[winner], WIN)
+        return True
+
+    def close_round(self) -> bool:
+        """Clôt la ronde si tous ses résultats sont arrivés; False si elle est en cours ou déjà close."""
+        if self.pending or self.closed == self.round:
+            return False
+        self.closed = self.round
+        return True
+
+    def is_over(self) -> bool:
+        """Vrai quand la dernière ronde est jouée."""
+        if self.format == "elimination":
+            return len(self.bracket) <= 1
+        return self.round >= self.rounds
+
+    def winner(self):
+        """Identifiant du vainqueur (premier du classement en rondes suisses)."""
+        if self.format == "elimination":
+            return self.bracket[0]
+        return self.seeded[self.table[0][2]].player_id
+
+    def standings(self, start, count) -> list:
+        """Tranche du classement: [rang, pseudo, points, départage]."""
+        rows = []
+        for rank, key in enumerate(self.table[start:start + count], start + 1):
+            entrant = self.seeded[key[2]]
+            rows.append([rank, self.players[entrant.player_id].pseudo, entrant.points, entrant.buchholz])
+        return rows
+
+    def rank(self, player_id):
+        """Rang d'un joueur au classement, None s'il ne participe pas."""
+        entrant = self.entrants.get(player_id)
+        if entrant is None:
+            return None
+        return bisect_left(self.table, entrant.key()) + 1
+
+class TournamentHub:
+    """Tournois du serveur: inscriptions, lancement des rondes et résultats des matchs."""
+    MAX_PLAYERS = 1024
+    ROUND_DELAY = 10  # secondes entre la fin d'une ronde et le début de la suivante
+    PAGE_SIZE = 50    # lignes par page de classement
+
+    def __init__(self, server):
+        self.server = server
+        self.lock = threading.Lock()
+        self.tournaments = {}  # identifiant -> Tournament
+        self.matches = {}      # match_id -> (tournoi, joueur 1, joueur 2) des matchs en cours
+        self.ids = itertools.count(1)
+
+    def create(self, game_type, variant, format, capacity, rounds, creator_id) -> Tournament:
+        tournament = Tournament(next(self.ids), game_type, variant, format, capacity, rounds, creator_id)
+        with self.lock:
+            self.tournaments[tournament.id] = tournament
+        return tournament
+
+    def get(self, tournament_id):
+        with self.lock:
+            return self.tournaments.get(tournament_id)
+
+    def join(self, tournament, session) -> bool:
+        """Inscrit le joueur d'une session; False si le tournoi est complet ou déjà commencé."""
+        player = Player(session.player_id, session.pseudo, session.address[0], session.address[1], int(time.time()))
+        with tournament.lock:
+            return tournament.add(player)
+
+    def start_if_full(self, tournament):
+        """Lance un tournoi dès qu'il est complet."""
+        with tournament.lock:
+            full = len(tournament.players) == tournament.capacity
+        if full:
+            self.start(tournament)
+
+    def withdraw(self, player_id):
+        """Désinscrit un joueur déconnecté des tournois qui n'ont pas commencé."""
+        with self.lock:
+            tournaments = list(self.tournaments.values())
+        for tournament in tournaments:
+            with tournament.lock:
+                tournament.remove(player_id)
+
+    def start(self, tournament) -> bool:
+        """Fixe les têtes de série et lance la première ronde; False s'il manque des joueurs."""
+        ratings = self.server.ratings[tournament.game_type]
+        with tournament.lock:
+            if tournament.state != "open" or len(tournament.players) < 2:
+                return False
+            tournament.begin(ratings.get)
+        print(f"Tournoi {tournament.id} commencé: {len(tournament.players)} joueurs, {tournament.rounds} rondes")
+        self.server.pool.submit(self.start_round, tournament)
+        return True
+
+    def start_round(self, tournament):
+        """Apparie la ronde suivante, prévient les joueurs et crée tous ses matchs."""
+        with tournament.lock:
+            pairings = tournament.next_round()
+            opponents = {}
+            for player1, player2 in pairings:
+                opponents[player1], opponents[player2] = player2, player1
+            players = tournament.players
+            round_number = tournament.round
+        for player_id in players:
+            opponent = opponents.get(player_id)
+            self.server.send_to(player_id, {
+                "action": "TOURNAMENT_ROUND",
+                "tournament_id": tournament.id,
+                "round": round_number,
+                "rounds": tournament.rounds,
+                # Sans adversaire: exempté, ou éliminé en élimination directe
+                "opponent": players[opponent].pseudo if opponent is not None else None
+            })
+        self.play(tournament, pairings)
+
+    def play(self, tournament, pairings):
+        """Crée d'un coup les matchs de paires du tournoi; un joueur absent perd par forfait."""
+        plugin = self.server.games[tournament.game_type]
+        with self.server.clients_lock:
+            sessions = {player_id: self.server.clients.get(player_id) for pair in pairings for player_id in pair}
+        pairs, forfeits = [], []
+        for player1, player2 in pairings:
+            session1, session2 = sessions[player1], sessions[player2]
+            if session1 is None or session2 is None:
+                present = player1 if session1 is not None else player2 if session2 is not None else DOUBLE_FORFEIT
+                forfeits.append((player1, player2, present))
+                continue
+            players = tournament.players
+            pairs.append((tournament.variant, ((players[player1], session1), (players[player2], session2))))
+        data = {player.id: plugin.tournament_join_data(tournament.variant) for _, pair in pairs for player, _ in pair}
+        created = self.server.create_matches(plugin, pairs, data)
+        with self.lock:
+            for match, _, _ in created:
+                self.matches[match.id] = (tournament, match.player1.id, match.player2.id)
+        self.server.start_matches(plugin, created)
+        for player1, player2, winner in forfeits:
+            with tournament.lock:
+                tournament.record(player1, player2, winner)
+        self.check_round(tournament)
+
+    def match_finished(self, match, result):
+        """Enregistre le résultat d'un match de tournoi (identifiant du vainqueur, "draw" ou "interrupted")."""
+        with self.lock:
+            entry = self.matches.pop(match.id, None)
+        if entry is None:
+            return
+        tournament, player1, player2 = entry
+        if result == "draw":
+            winner = None
+        elif result == "interrupted":
+            # Le joueur resté connecté gagne le match interrompu
+            with self.server.clients_lock:
+                present = [player_id for player_id in (player1, player2) if player_id in self.server.clients]
+            winner = present[0] if len(present) == 1 else DOUBLE_FORFEIT if not present else None
+        else:
+            winner = result
+        with tournament.lock:
+            settled = tournament.record(player1, player2, winner)
+        if not settled:
+            # Nul en élimination directe: rejoué en inversant les rôles
+            self.server.pool.submit(self.play, tournament, [(player2, player1)])
+            return
+        self.check_round(tournament)
+
+    def check_round(self, tournament):
+        """Termine la ronde quand tous ses résultats sont arrivés: ronde suivante ou fin du tournoi."""
+        with tournament.lock:
+            if tournament.state != "running" or not tournament.close_round():
+                return
+            over = tournament.is_over()
+            if over:
+                tournament.state = "finished"
+            round_number = tournament.round
+            winner = tournament.players[tournament.winner()].pseudo if over else None
+            results = {player_id: (tournament.rank(player_id), entrant.points)
+                       for player_id, entrant in tournament.entrants.items()}
+        for player_id, (rank, points) in results.items():
+            self.server.send_to(player_id, {
+                "action": "TOURNAMENT_END" if over else "TOURNAMENT_ROUND_END",
+                "tournament_id": tournament.id,
+                "round": round_number,
+                "rank": rank,
+                "points": points,
+                **({"winner": winner} if over else {"next_round_in": self.ROUND_DELAY})
+            })
+        if over:
+            print(f"Tournoi {tournament.id} terminé, vainqueur: {winner}")
+        else:
+            self.server.timers.schedule(self.ROUND_DELAY, self.server.pool.submit, self.start_round, tournament)
+
+    def standings(self, tournament, page, player_id) -> dict:
+        """Page du classement d'un tournoi et rang du joueur."""
+        with tournament.lock:
+            count = len(tournament.table)
+            pages = max(1, -(-count // self.PAGE_SIZE))
+            page = page if isinstance(page, int) and 0 <= page < pages else 0
+            return {
+                "tournament_id": tournament.id,
+                "game_type": tournament.game_type,
+                "format": tournament.format,
+                "state": tournament.state,
+                "round": tournament.round,
+                "rounds": tournament.rounds,
+                "registered": len(tournament.players),
+                "page": page,
+                "pages": pages,
+                "standings": tournament.standings(page * self.PAGE_SIZE, self.PAGE_SIZE),
+                "me": tournament.rank(player_id)
+            }
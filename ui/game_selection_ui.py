@@ -36,7 +36,7 @@ def setup_game_selection_ui(client):
     
     # Bouton pour Mastermind (jeu principal)
     mastermind_frame = tk.Frame(games_frame, bg=client.bg_color, bd=2, relief=tk.GROOVE, padx=20, pady=20)
-    mastermind_frame.grid(row=0, column=0, padx=20, pady=10)
+    mastermind_frame.grid(row=0, column=0, padx=10, pady=10)
     
     mastermind_title = tk.Label(
         mastermind_frame, 
@@ -74,7 +74,7 @@ def setup_game_selection_ui(client):
     
     # Bouton pour Morpion
     morpion_frame = tk.Frame(games_frame, bg=client.bg_color, bd=2, relief=tk.GROOVE, padx=20, pady=20)
-    morpion_frame.grid(row=0, column=1, padx=20, pady=10)
+    morpion_frame.grid(row=0, column=1, padx=10, pady=10)
     
     morpion_title = tk.Label(
         morpion_frame, 
@@ -110,6 +110,44 @@ def setup_game_selection_ui(client):
     )
     morpion_button.pack(pady=10)
     
+    # Bouton pour Puissance 4
+    puissance4_frame = tk.Frame(games_frame, bg=client.bg_color, bd=2, relief=tk.GROOVE, padx=20, pady=20)
+    puissance4_frame.grid(row=0, column=2, padx=10, pady=10)
+    
+    puissance4_title = tk.Label(
+        puissance4_frame, 
+        text="PUISSANCE 4", 
+        font=("Helvetica", 18, "bold"), 
+        bg=client.bg_color, 
+        fg=client.accent_color
+    )
+    puissance4_title.pack(pady=10)
+    
+    puissance4_desc = tk.Label(
+        puissance4_frame, 
+        text="Alignez 4 pions avant\nvotre adversaire", 
+        font=("Helvetica", 12), 
+        bg=client.bg_color, 
+        fg=client.text_color,
+        justify="center"
+    )
+    puissance4_desc.pack(pady=10)
+    
+    puissance4_button = tk.Button(
+        puissance4_frame, 
+        text="Jouer au Puissance 4", 
+        font=("Helvetica", 12, "bold"), 
+        bg=client.button_color, 
+        fg="white", 
+        padx=20, 
+        pady=5, 
+        bd=0, 
+        relief=tk.FLAT, 
+        command=client.launch_puissance4,
+        activebackground=client.button_hover
+    )
+    puissance4_button.pack(pady=10)
+    
     # Bouton pour quitter
     quit_button = tk.Button(
         client.current_frame, 